@@ -0,0 +1,193 @@
+import itertools
+import json
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+
+import numpy as np
+
+TARGETS = ["api", "invocations", "sagemaker"]
+
+
+class HttpTarget:
+    """
+    POSTs texts to the prediction API or a SageMaker-compatible `/invocations` route.
+
+    Each sender thread keeps its own `requests.Session`, so connections are
+    kept alive and reused instead of opened per request.
+    """
+
+    def __init__(self, url: str, kind: str, timeout: float):
+        self.url = url.rstrip("/")
+        self.kind = kind
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            import requests
+
+            session = self._local.session = requests.Session()
+        return session
+
+    def request(self, texts: list[str]) -> tuple[str, dict]:
+        if self.kind == "invocations":
+            return f"{self.url}/invocations", {"dataframe_records": [{"text": t} for t in texts]}
+        if len(texts) == 1:
+            return f"{self.url}/predict", {"text": texts[0]}
+        return f"{self.url}/predict/batch", {"texts": texts}
+
+    def send(self, texts: list[str]) -> str:
+        """Sends one request. Returns "ok" or the kind of failure."""
+        url, payload = self.request(texts)
+        try:
+            response = self._session().post(url, json=payload, timeout=self.timeout)
+        except Exception as e:
+            return type(e).__name__
+        return "ok" if response.status_code == 200 else f"http_{response.status_code}"
+
+
+class SageMakerTarget:
+    """Invokes a deployed SageMaker endpoint through boto3, with one pooled connection per sender."""
+
+    def __init__(self, endpoint_name: str, region_name: str, concurrency: int, timeout: float):
+        import boto3
+        from botocore.config import Config
+
+        self.endpoint_name = endpoint_name
+        self.client = boto3.client(
+            "sagemaker-runtime",
+            region_name=region_name,
+            config=Config(max_pool_connections=concurrency, read_timeout=timeout, retries={"max_attempts": 0}),
+        )
+
+    def send(self, texts: list[str]) -> str:
+        try:
+            self.client.invoke_endpoint(
+                EndpointName=self.endpoint_name,
+                ContentType="application/json",
+                Body=json.dumps({"dataframe_records": [{"text": t} for t in texts]}),
+            )["Body"].read()
+        except Exception as e:
+            code = getattr(e, "response", {}).get("Error", {}).get("Code")
+            return code or type(e).__name__
+        return "ok"
+
+
+def payloads(texts: list[str], records: int) -> Iterator[list[str]]:
+    """Consecutive groups of `records` texts, cycling through the corpus."""
+    for start in itertools.count(0, records):
+        yield [texts[(start + i) % len(texts)] for i in range(records)]
+
+
+class LoadTest:
+    """
+    Replays payloads against a target and records each request's latency and outcome.
+
+    Without `rps` the test is closed-loop. `concurrency` senders each send
+    their next request as soon as the previous one returns, which finds the
+    saturation throughput. With `rps` it is open-loop. Requests are
+    scheduled at a fixed rate whether or not earlier ones have returned,
+    and sent by up to `concurrency` threads. Latency is measured from the
+    scheduled time, so a server that falls behind shows the queueing delay
+    its clients would see. Coordinated omission would hide it otherwise.
+
+    The test stops after `requests` requests, or after `duration` seconds
+    when `requests` is not given. The first `warmup` requests are sent but
+    not reported.
+    """
+
+    def __init__(self, target, payloads: Iterator[list[str]], concurrency: int, rps: float | None = None,
+                 requests: int | None = None, duration: float | None = None, warmup: int = 0):
+        if requests is None and duration is None:
+            raise ValueError("Set requests or duration")
+        self.target = target
+        self.payloads = payloads
+        self.concurrency = concurrency
+        self.rps = rps
+        self.requests = None if requests is None else requests + warmup
+        self.duration = duration
+        self.warmup = warmup
+
+        self._lock = threading.Lock()
+        self._sent = 0
+        self._deadline = None
+        # (index, start, end, outcome, records); list.append is atomic, so senders need no lock
+        self._results: list[tuple[int, float, float, str, int]] = []
+
+    def _next(self) -> tuple[int, list[str]] | None:
+        with self._lock:
+            if self.requests is not None and self._sent >= self.requests:
+                return None
+            if self.requests is None and self._sent >= self.warmup and time.perf_counter() >= self._deadline:
+                return None
+            index, self._sent = self._sent, self._sent + 1
+            return index, next(self.payloads)
+
+    def _send(self, index: int, texts: list[str], start: float):
+        outcome = self.target.send(texts)
+        self._results.append((index, start, time.perf_counter(), outcome, len(texts)))
+
+    def _closed_loop(self):
+        def sender():
+            while (item := self._next()) is not None:
+                self._send(*item, time.perf_counter())
+
+        threads = [threading.Thread(target=sender, daemon=True) for _ in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _open_loop(self):
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            start = time.perf_counter()
+            while (item := self._next()) is not None:
+                scheduled = start + item[0] / self.rps
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(self._send, *item, scheduled)
+
+    def run(self) -> dict:
+        self._deadline = time.perf_counter() + (self.duration or 0)
+        if self.rps:
+            self._open_loop()
+        else:
+            self._closed_loop()
+        return self.report()
+
+    def report(self) -> dict:
+        measured = sorted(r for r in self._results if r[0] >= self.warmup)
+        if not measured:
+            return {"requests": 0}
+        starts = np.array([r[1] for r in measured])
+        ends = np.array([r[2] for r in measured])
+        ok = np.array([r[3] == "ok" for r in measured])
+        latencies_ms = (ends - starts)[ok] * 1000
+        elapsed = float(ends.max() - starts.min())
+        records = sum(r[4] for r in measured)
+
+        report = {
+            "requests": len(measured),
+            "records": records,
+            "concurrency": self.concurrency,
+            "target_rps": self.rps,
+            "elapsed_seconds": elapsed,
+            "throughput_rps": len(measured) / elapsed if elapsed else 0.0,
+            "records_per_second": records / elapsed if elapsed else 0.0,
+            "error_rate": float(1 - ok.mean()),
+            "errors": dict(Counter(r[3] for r in measured if r[3] != "ok")),
+        }
+        if len(latencies_ms):
+            report["latency_ms"] = {
+                "mean": float(latencies_ms.mean()),
+                "p50": float(np.percentile(latencies_ms, 50)),
+                "p95": float(np.percentile(latencies_ms, 95)),
+                "p99": float(np.percentile(latencies_ms, 99)),
+                "max": float(latencies_ms.max()),
+            }
+        return report
@@ -0,0 +1,341 @@
+import json
+import os
+import platform
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.corpus import corpus_path
+
+# Cases run once per corpus scale; serving cases run once per suite against a model trained on SERVING_ROWS
+SCALED_CASES = ["etl_transform", "etl_load", "compute_hash", "training"]
+SERVING_CASES = ["predict_single", "predict_batch"]
+CASES = SCALED_CASES + SERVING_CASES
+
+# Metrics compared against the baseline: name -> smallest absolute increase that counts, so
+# sub-millisecond jitter on small inputs is not reported as a regression
+COMPARED_METRICS = {"seconds": 0.05, "peak_rss_mb": 16.0, "p50_ms": 0.5, "p99_ms": 2.0}
+
+
+def parse_scale(scale: str) -> int:
+    """'10k' -> 10000, '1M' -> 1000000."""
+    scale = scale.strip().lower()
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(scale[-1:], 1)
+    return int(float(scale.rstrip("km")) * multiplier)
+
+
+def _read_status_mb(field: str) -> float | None:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss():
+    """Resets the peak-RSS watermark (Linux), so the peak covers only the measured phase."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_mb() -> float:
+    peak = _read_status_mb("VmHWM")
+    if peak is not None:
+        return peak
+    import resource
+    import sys
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024
+
+
+def _percentiles_ms(latencies: list[float]) -> dict:
+    latencies_ms = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99])
+    return {"mean_ms": float(latencies_ms.mean()), "p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99)}
+
+
+def _measure(fn, repeat: int) -> dict:
+    """Runs `fn` `repeat` times and reports the median and best wall time and the peak RSS."""
+    setup_rss_mb = _read_status_mb("VmRSS")
+    _reset_peak_rss()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return {
+        "seconds": statistics.median(timings),
+        "seconds_min": min(timings),
+        "repeat": repeat,
+        "setup_rss_mb": setup_rss_mb,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _transformed(raw_path: str):
+    import pandas as pd
+
+    from src.pipelines.etl_pipeline import ETLPipeline
+
+    return ETLPipeline().transform(pd.read_csv(raw_path, encoding="latin-1"))
+
+
+def bench_etl_transform(workdir: str, rows: int, options: dict) -> dict:
+    import pandas as pd
+
+    from src.pipelines.etl_pipeline import ETLPipeline
+
+    df = pd.read_csv(corpus_path(workdir, rows, options["seed"]), encoding="latin-1")
+    pipeline = ETLPipeline()
+    result = _measure(lambda: pipeline.transform(df), options["repeat"])
+    return {**result, "rows_per_second": rows / result["seconds"]}
+
+
+def bench_etl_load(workdir: str, rows: int, options: dict) -> dict:
+    from src.pipelines.etl_pipeline import ETLPipeline
+    from src.utils.mlflow_manager import MLflowManager
+
+    df = _transformed(corpus_path(workdir, rows, options["seed"]))
+    pipeline = ETLPipeline()
+    with MLflowManager().start_run(run_name=f"benchmark-etl-load-{rows}"):
+        result = _measure(lambda: pipeline.load(df), options["repeat"])
+    return {**result, "rows_per_second": rows / result["seconds"]}
+
+
+def bench_compute_hash(workdir: str, rows: int, options: dict) -> dict:
+    from src.data.data_versioning import DataVersioner
+
+    df = _transformed(corpus_path(workdir, rows, options["seed"]))
+    result = _measure(lambda: DataVersioner.compute_hash(df), options["repeat"])
+    return {**result, "rows_per_second": rows / result["seconds"]}
+
+
+def bench_training(workdir: str, rows: int, options: dict) -> dict:
+    from src.pipelines.training_pipeline import TrainingPipeline
+    from src.utils.mlflow_manager import MLflowManager
+
+    data_path = Path(workdir) / "datasets" / str(rows) / "data.parquet"
+    data_path.parent.mkdir(parents=True, exist_ok=True)
+    _transformed(corpus_path(workdir, rows, options["seed"])).to_parquet(data_path, index=False)
+
+    f1_scores = []
+
+    def train():
+        with MLflowManager().start_run(run_name=f"benchmark-training-{rows}"):
+            f1_scores.append(TrainingPipeline().run(str(data_path))[0])
+
+    result = _measure(train, options["repeat"])
+    return {**result, "rows_per_second": rows / result["seconds"], "f1_score": f1_scores[-1]}
+
+
+def _serving_client(workdir: str, options: dict):
+    """Trains a model on the serving corpus, exports it as a bundle and returns a Flask test client."""
+    from src.config.settings import Settings
+    from src.models.bundle import ServingBundle
+    from src.models.pipeline import SpamHamPipeline
+
+    df = _transformed(corpus_path(workdir, options["serving_rows"], options["seed"]))
+    pipeline = SpamHamPipeline.build(Settings.RANDOM_STATE).fit(df["text"], df["label"])
+    ServingBundle.export(pipeline, Settings.SERVING_BUNDLE_DIR, Settings.MODEL_NAME, "benchmark")
+
+    from src.api.app import app
+
+    return app.test_client(), df["text"].tolist()
+
+
+def _time_requests(client, path: str, payloads: list[dict], warmup: int) -> list[float]:
+    for payload in payloads[:warmup]:
+        client.post(path, json=payload)
+    latencies = []
+    for payload in payloads:
+        start = time.perf_counter()
+        response = client.post(path, json=payload)
+        latencies.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            raise RuntimeError(f"{path} returned {response.status_code}: {response.get_data(as_text=True)}")
+    return latencies
+
+
+def bench_predict_single(workdir: str, rows: int, options: dict) -> dict:
+    client, texts = _serving_client(workdir, options)
+    payloads = [{"text": texts[i % len(texts)]} for i in range(options["requests"])]
+
+    setup_rss_mb = _read_status_mb("VmRSS")
+    _reset_peak_rss()
+    latencies = _time_requests(client, "/predict", payloads, options["warmup"])
+    seconds = sum(latencies)
+    return {
+        "seconds": seconds,
+        "requests": len(payloads),
+        "requests_per_second": len(payloads) / seconds,
+        "texts_per_second": len(payloads) / seconds,
+        "setup_rss_mb": setup_rss_mb,
+        "peak_rss_mb": _peak_rss_mb(),
+        **_percentiles_ms(latencies),
+    }
+
+
+def bench_predict_batch(workdir: str, rows: int, options: dict) -> dict:
+    client, texts = _serving_client(workdir, options)
+    size = options["batch_size"]
+    payloads = [
+        {"texts": [texts[(i * size + j) % len(texts)] for j in range(size)]}
+        for i in range(max(options["requests"] // size, 1))
+    ]
+
+    setup_rss_mb = _read_status_mb("VmRSS")
+    _reset_peak_rss()
+    latencies = _time_requests(client, "/predict/batch", payloads, options["warmup"])
+    seconds = sum(latencies)
+    return {
+        "seconds": seconds,
+        "requests": len(payloads),
+        "batch_size": size,
+        "requests_per_second": len(payloads) / seconds,
+        "texts_per_second": len(payloads) * size / seconds,
+        "setup_rss_mb": setup_rss_mb,
+        "peak_rss_mb": _peak_rss_mb(),
+        **_percentiles_ms(latencies),
+    }
+
+
+def _init_case(env: dict):
+    os.environ.update(env)
+
+
+def _run_case(case: str, workdir: str, rows: int, options: dict) -> dict:
+    from src.utils.mlflow_manager import MLflowManager
+
+    MLflowManager()
+    return globals()[f"bench_{case}"](workdir, rows, options)
+
+
+def case_environment(workdir: str) -> dict:
+    """
+    Settings for the benchmark processes: a file-based MLflow store and
+    output locations inside `workdir`, with the prediction cache, model
+    reloading, traffic monitoring and tuning off so only the measured code
+    path runs. Other settings (e.g. BATCH_MAX_WAIT_MS) come from the caller's
+    environment and are recorded with the results.
+    """
+    root = Path(workdir).resolve()
+    return {
+        "MLFLOW_TRACKING_URI": (root / "mlruns").as_uri(),
+        "EXPERIMENT_NAME": "benchmarks",
+        "MODEL_NAME": "SpamHamClassifierBenchmark",
+        "PROCESSED_DATA_BUCKET": str(root / "processed"),
+        "SERVING_BUNDLE_DIR": str(root / "bundle"),
+        "PREDICTION_CACHE_SIZE": "0",
+        "MODEL_RELOAD_INTERVAL_SECONDS": "0",
+        "MONITOR_OUTPUT_DIR": "",
+        "MLFLOW_SPOOL_DIR": str(root / "mlflow_spool"),
+        "TUNING_ENABLED": "false",
+    }
+
+
+def environment() -> dict:
+    from importlib.metadata import PackageNotFoundError, version
+
+    from src.utils.git import get_git_commit
+
+    packages = {}
+    for package in ("numpy", "pandas", "pyarrow", "scikit-learn", "mlflow", "flask"):
+        try:
+            packages[package] = version(package)
+        except PackageNotFoundError:
+            packages[package] = None
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": get_git_commit(),
+        "packages": packages,
+        "settings": {k: v for k, v in sorted(os.environ.items()) if k.startswith(("BATCH_", "ETL_", "PARQUET_", "PREDICTION_", "TRAINING_"))},
+    }
+
+
+def run_suite(workdir: str, scales: list[int], cases: list[str], options: dict, log=print) -> dict:
+    """
+    Runs every selected case at every scale (serving cases once) and returns the results.
+
+    Each measurement runs in a fresh spawned process, so imports, caches and
+    peak RSS of one case never leak into the next. Corpora are generated
+    once per scale and seed and reused across runs.
+    """
+    env = case_environment(workdir)
+    results = {}
+    spawn = get_context("spawn")
+
+    runs = [(case, rows) for case in cases if case in SCALED_CASES for rows in scales]
+    runs += [(case, options["serving_rows"]) for case in cases if case in SERVING_CASES]
+    for case, rows in runs:
+        key = f"{case}@{rows}"
+        log(f"Running {key}...")
+        # Generate the corpus up front so its cost is never measured
+        corpus_path(workdir, rows, options["seed"])
+        with ProcessPoolExecutor(max_workers=1, mp_context=spawn, initializer=_init_case, initargs=(env,)) as pool:
+            results[key] = {"case": case, "rows": rows, **pool.submit(_run_case, case, workdir, rows, options).result()}
+        log(f"  {key}: {results[key]['seconds']:.3f}s, peak RSS {results[key]['peak_rss_mb']:.0f} MB")
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": environment(),
+        "options": {**options, "scales": scales, "cases": cases},
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[dict]:
+    """
+    Lists the metrics of `current` that are more than `tolerance` (relative) worse than `baseline`.
+
+    All compared metrics are lower-is-better. A case or metric missing from
+    either side is skipped, and so is an increase smaller than the metric's
+    floor in COMPARED_METRICS.
+    """
+    regressions = []
+    for key, result in current["results"].items():
+        reference = baseline["results"].get(key)
+        if reference is None:
+            continue
+        for metric, floor in COMPARED_METRICS.items():
+            new, old = result.get(metric), reference.get(metric)
+            if new is None or old is None:
+                continue
+            if new > old * (1 + tolerance) and new - old > floor:
+                regressions.append({"case": key, "metric": metric, "baseline": old, "current": new, "ratio": new / old})
+    return regressions
+
+
+def environment_differences(current: dict, baseline: dict) -> list[str]:
+    """Fields that make results incomparable (different machine or dependency versions)."""
+    differences = []
+    for field in ("machine", "cpu_count", "python", "packages"):
+        if current["environment"].get(field) != baseline["environment"].get(field):
+            differences.append(field)
+    return differences
+
+
+def save(results: dict, path: str):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
@@ -1,5 +1,6 @@
 from mlflow.deployments import get_deploy_client
 from src.config.settings import Settings
+from src.registry.cache import model_path, resolve_stage
 from src.utils.logger import get_logger
 import os
 
@@ -10,7 +11,9 @@ def deploy():
     Deploys the latest Staging model to SageMaker using the modern mlflow.deployments API.
     """
     model_name = Settings.MODEL_NAME
-    model_uri = f"models:/{model_name}/Staging"
+    version = resolve_stage("Staging", refresh=True)
+    # Served from the local artifact cache when this version was loaded before
+    model_uri = model_path(version)
     
     # SageMaker config
     app_name = Settings.ENDPOINT_NAME
@@ -18,7 +21,7 @@ def deploy():
     execution_role_arn = Settings.SAGEMAKER_ROLE_ARN
     instance_type = Settings.INSTANCE_TYPE
     
-    logger.info(f"Deploying model {model_uri} to SageMaker endpoint {app_name} in {region_name}...")
+    logger.info(f"Deploying model {model_name} v{version} ({model_uri}) to SageMaker endpoint {app_name} in {region_name}...")
     
     try:
         # Get the SageMaker deployment client
@@ -0,0 +1,35 @@
+import mlflow
+import pandas as pd
+from src.config.settings import Settings
+from src.models.compiled import CompiledScorer
+from src.registry.cache import load_sklearn_model, resolve_stage
+from src.utils.logger import get_logger
+import sys
+
+logger = get_logger(__name__)
+
+def main(holdout_path: str, output_path: str):
+    """
+    Compiles the Staging model into a standalone NumPy scorer and saves it,
+    refusing to write it unless it reproduces every held-out prediction.
+    """
+    mlflow.set_tracking_uri(Settings.MLFLOW_TRACKING_URI)
+    version = resolve_stage("Staging", refresh=True)
+
+    logger.info(f"Loading model {Settings.MODEL_NAME} v{version}...")
+    pipeline = load_sklearn_model(version)
+    scorer = CompiledScorer.from_pipeline(pipeline)
+
+    texts = pd.read_parquet(holdout_path, columns=["text"])["text"].tolist()
+    mismatches = scorer.count_mismatches(pipeline, texts)
+    if mismatches:
+        raise ValueError(f"Compiled scorer disagrees with the pipeline on {mismatches}/{len(texts)} texts")
+
+    scorer.save(output_path)
+    logger.info(f"Compiled scorer matches {len(texts)} held-out predictions. Saved to {output_path}")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python scripts/export_compiled_model.py <holdout_data_path> <output_path>")
+        sys.exit(1)
+    main(sys.argv[1], sys.argv[2])
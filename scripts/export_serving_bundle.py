@@ -0,0 +1,57 @@
+import mlflow
+import pandas as pd
+from src.config.settings import Settings
+from src.models.bundle import ServingBundle
+from src.registry.cache import load_sklearn_model, registry
+from src.models.compiled import CompiledScorer
+from src.monitoring.drift import BASELINE_ARTIFACT
+from src.utils.logger import get_logger
+import sys
+
+logger = get_logger(__name__)
+
+def main(output_dir: str, holdout_path: str | None = None):
+    """
+    Exports the current Staging model to a local serving bundle.
+    If a held-out dataset is given, the compiled scorer must reproduce every prediction on it.
+    """
+    mlflow.set_tracking_uri(Settings.MLFLOW_TRACKING_URI)
+
+    staging = registry().latest_version("Staging", refresh=True)
+    if staging is None:
+        logger.error(f"No version of {Settings.MODEL_NAME} is in 'Staging'.")
+        sys.exit(1)
+
+    pipeline = load_sklearn_model(staging["version"])
+
+    if holdout_path:
+        texts = pd.read_parquet(holdout_path, columns=["text"])["text"].tolist()
+        try:
+            mismatches = CompiledScorer.from_pipeline(pipeline).count_mismatches(pipeline, texts)
+        except ValueError:
+            mismatches = 0  # Not compilable: the sklearn pipeline itself is bundled
+        if mismatches:
+            raise ValueError(f"Compiled scorer disagrees with the pipeline on {mismatches}/{len(texts)} texts")
+
+    try:
+        drift_baseline = mlflow.artifacts.load_dict(f"runs:/{staging['run_id']}/{BASELINE_ARTIFACT}")
+    except Exception:
+        logger.warning("The Staging run has no drift baseline; the bundle is exported without one.")
+        drift_baseline = None
+
+    metadata = ServingBundle.export(
+        pipeline,
+        output_dir,
+        model_name=Settings.MODEL_NAME,
+        model_version=staging["version"],
+        run_id=staging["run_id"],
+        drift_baseline=drift_baseline
+    )
+    logger.info(f"Bundle checksum: {metadata['checksum']}")
+    print(output_dir) # For external capture
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python scripts/export_serving_bundle.py <output_dir> [holdout_data_path]")
+        sys.exit(1)
+    main(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
@@ -0,0 +1,27 @@
+import sys
+
+from src.config.settings import Settings
+from src.data.dataset_io import read_dataset
+from src.features.store import feature_store
+from src.models.pipeline import SpamHamPipeline
+from src.pipelines.tuning_pipeline import HyperparameterSearch
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+def main(data_path: str):
+    texts = read_dataset(data_path, columns=["text"])["text"]
+
+    # The default pipeline's tokenization, plus every one the search space tries when tuning is on
+    feature_store().counts(data_path, SpamHamPipeline.build(Settings.RANDOM_STATE).named_steps["tfidf"], texts)
+    if Settings.TUNING_ENABLED:
+        search = HyperparameterSearch()
+        search.materialize_features(search.trials(), data_path, texts)
+
+    logger.info(f"Features for {data_path} are materialized.")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python scripts/materialize_features.py <s3_data_path>")
+        sys.exit(1)
+    main(sys.argv[1])
@@ -0,0 +1,27 @@
+from src.pipelines.batch_scoring_pipeline import BatchScoringPipeline
+from src.utils.mlflow_manager import MLflowManager
+from src.utils.logger import get_logger
+import sys
+
+logger = get_logger(__name__)
+
+def main(input_path: str, output_dir: str, model_version: str):
+    mlflow_manager = MLflowManager()
+
+    with mlflow_manager.start_run(run_name="batch_scoring"):
+        pipeline = BatchScoringPipeline(input_path, output_dir, model_version)
+        output_path = pipeline.run()
+        mlflow_manager.log_stage_timings()
+
+        mlflow_manager.log_param("input_path", input_path)
+        mlflow_manager.log_param("model_version", pipeline.model_version)
+        mlflow_manager.log_param("predictions_output_path", output_path)
+
+        logger.info(f"Batch scoring completed. Output: {output_path}")
+        print(output_path) # For external capture
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python scripts/run_batch_scoring.py <input_path> <output_dir> [model_version]")
+        sys.exit(1)
+    main(sys.argv[1], sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else "Staging")
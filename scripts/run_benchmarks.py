@@ -0,0 +1,69 @@
+import argparse
+import sys
+
+from benchmarks.suite import (
+    CASES, compare, environment_differences, load, parse_scale, run_suite, save
+)
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks ETL, hashing, training and prediction on synthetic SMS corpora.")
+    parser.add_argument("--scales", default="10k,100k,1M", help="Comma-separated corpus sizes, e.g. 10k,100k,1M,10M")
+    parser.add_argument("--cases", default=",".join(CASES), help=f"Comma-separated subset of: {', '.join(CASES)}")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case; the median is reported")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed")
+    parser.add_argument("--serving-rows", default="10k", help="Corpus size the prediction model is trained on")
+    parser.add_argument("--requests", type=int, default=2000, help="Texts sent per prediction case")
+    parser.add_argument("--batch-size", type=int, default=100, help="Texts per /predict/batch request")
+    parser.add_argument("--warmup", type=int, default=50, help="Untimed requests before each prediction case")
+    parser.add_argument("--workdir", default="benchmarks/.work", help="Corpora, MLflow store and outputs")
+    parser.add_argument("--output", default="benchmarks/results.json", help="Where to write the results")
+    parser.add_argument("--baseline", default="benchmarks/baseline.json", help="Results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Relative slowdown or growth reported as a regression")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    args = parser.parse_args()
+
+    cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"Unknown cases: {', '.join(sorted(unknown))}")
+
+    options = {
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "serving_rows": parse_scale(args.serving_rows),
+        "requests": args.requests,
+        "batch_size": args.batch_size,
+        "warmup": args.warmup,
+    }
+    scales = [parse_scale(s) for s in args.scales.split(",")]
+    results = run_suite(args.workdir, scales, cases, options, log=logger.info)
+    save(results, args.output)
+    logger.info(f"Results written to {args.output}")
+
+    if args.save_baseline:
+        save(results, args.baseline)
+        logger.info(f"Baseline written to {args.baseline}")
+        return
+
+    try:
+        baseline = load(args.baseline)
+    except FileNotFoundError:
+        logger.info(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return
+
+    differences = environment_differences(results, baseline)
+    if differences:
+        logger.warning(f"The baseline was recorded in a different environment ({', '.join(differences)}); comparisons may not be meaningful.")
+
+    regressions = compare(results, baseline, args.tolerance)
+    for r in regressions:
+        logger.error(f"Regression in {r['case']}: {r['metric']} {r['baseline']:.4g} -> {r['current']:.4g} ({r['ratio']:.2f}x)")
+    if regressions:
+        sys.exit(1)
+    logger.info(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+if __name__ == "__main__":
+    main()
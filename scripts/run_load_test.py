@@ -0,0 +1,82 @@
+import argparse
+import json
+
+import pandas as pd
+
+from benchmarks.corpus import corpus_path
+from benchmarks.load import TARGETS, HttpTarget, LoadTest, SageMakerTarget, payloads
+from benchmarks.suite import parse_scale
+from src.config.settings import Settings
+from src.data.dataset_io import read_dataset
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+def load_texts(args) -> list[str]:
+    if not args.corpus:
+        # Offline default: the benchmark suite's synthetic SMS corpus (raw v1/v2 layout)
+        path = corpus_path(args.workdir, parse_scale(args.corpus_rows), args.seed)
+        texts = pd.read_csv(path, encoding="latin-1", usecols=["v2"])["v2"]
+    elif args.corpus.endswith(".csv"):
+        texts = pd.read_csv(args.corpus, encoding="latin-1", usecols=[args.column])[args.column]
+    else:
+        texts = read_dataset(args.corpus, columns=[args.column])[args.column]
+    return texts.dropna().astype(str).tolist()
+
+def main():
+    parser = argparse.ArgumentParser(description="Replays a text corpus against the prediction API or a SageMaker endpoint.")
+    parser.add_argument("--target", choices=TARGETS, default="api",
+                        help="api: /predict and /predict/batch; invocations: a SageMaker-compatible /invocations route; "
+                             "sagemaker: the deployed ENDPOINT_NAME through boto3")
+    parser.add_argument("--url", default="http://localhost:5000", help="Base URL of the api and invocations targets")
+    parser.add_argument("--corpus", help="Parquet file, dataset.json manifest or CSV of texts (default: a synthetic corpus)")
+    parser.add_argument("--column", default="text", help="Text column of --corpus")
+    parser.add_argument("--corpus-rows", default="10k", help="Size of the synthetic corpus")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic corpus seed")
+    parser.add_argument("--workdir", default="benchmarks/.work", help="Where the synthetic corpus is cached")
+    parser.add_argument("--records", type=int, default=1, help="Texts per request")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent senders (pooled connections)")
+    parser.add_argument("--rps", type=float, help="Target requests per second (open loop); default: as fast as the senders go")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run")
+    parser.add_argument("--requests", type=int, help="Requests to send; overrides --duration")
+    parser.add_argument("--warmup", type=int, default=50, help="Unreported requests sent first")
+    parser.add_argument("--timeout", type=float, default=10, help="Per-request timeout in seconds")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    args = parser.parse_args()
+
+    texts = load_texts(args)
+    if args.target == "sagemaker":
+        target = SageMakerTarget(Settings.ENDPOINT_NAME, Settings.REGION_NAME, args.concurrency, args.timeout)
+        where = f"SageMaker endpoint {Settings.ENDPOINT_NAME}"
+    else:
+        target = HttpTarget(args.url, args.target, args.timeout)
+        where = args.url
+
+    mode = f"{args.rps:g} req/s" if args.rps else "closed loop"
+    logger.info(f"Sending {args.records}-text requests to {where} ({mode}, concurrency {args.concurrency}, corpus of {len(texts)} texts)")
+    report = LoadTest(
+        target,
+        payloads(texts, args.records),
+        concurrency=args.concurrency,
+        rps=args.rps,
+        requests=args.requests,
+        duration=None if args.requests else args.duration,
+        warmup=args.warmup,
+    ).run()
+    report.update({"target": args.target, "url": None if args.target == "sagemaker" else args.url, "records_per_request": args.records})
+
+    latency = report.get("latency_ms", {})
+    logger.info(
+        f"{report['requests']} requests in {report.get('elapsed_seconds', 0):.1f}s: "
+        f"{report.get('throughput_rps', 0):.1f} req/s, {report.get('records_per_second', 0):.1f} texts/s, "
+        f"p50 {latency.get('p50', float('nan')):.2f} ms, p95 {latency.get('p95', float('nan')):.2f} ms, "
+        f"p99 {latency.get('p99', float('nan')):.2f} ms, errors {report.get('error_rate', 0):.2%} {report.get('errors', {})}"
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Report written to {args.output}")
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import argparse
+import json
+
+from src.config.settings import Settings
+from src.pipelines.runner import PipelineRunner
+from src.pipelines.stages import pipeline_stages
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+def main():
+    stages = pipeline_stages()
+    names = [s.name for s in stages]
+
+    parser = argparse.ArgumentParser(description="Runs ETL -> training -> evaluation, reusing stages whose inputs are unchanged.")
+    parser.add_argument("--force", nargs="*", choices=names + ["all"], default=[],
+                        help="Stages to rerun even if a result is recorded for their inputs")
+    parser.add_argument("--state-dir", default=Settings.PIPELINE_STATE_DIR,
+                        help="Where stage results are recorded (default: PROCESSED_DATA_BUCKET/_pipeline)")
+    parser.add_argument("--max-workers", type=int, default=Settings.PIPELINE_MAX_WORKERS,
+                        help="Stages run concurrently when their inputs are ready")
+    args = parser.parse_args()
+
+    state_dir = args.state_dir or f"{Settings.PROCESSED_DATA_BUCKET.rstrip('/')}/_pipeline"
+    force = set(names) if "all" in args.force else set(args.force)
+    results = PipelineRunner(stages, state_dir, args.max_workers, force).run()
+
+    for name, result in results.items():
+        status = "reused" if result["reused"] else f"ran in {result['seconds']:.1f}s"
+        logger.info(f"{name}: {status} -> {result['outputs']}")
+    print(json.dumps({name: result["outputs"] for name, result in results.items()}, indent=2)) # For external capture
+
+if __name__ == "__main__":
+    main()
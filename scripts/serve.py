@@ -0,0 +1,46 @@
+import gc
+import multiprocessing
+import os
+from gunicorn.app.base import BaseApplication
+from src.config.settings import Settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class PreforkServer(BaseApplication):
+    """
+    Gunicorn master that imports the ASGI app (and so loads the model) once,
+    then forks uvicorn workers that share the loaded model copy-on-write.
+    """
+
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from src.api.asgi import app
+
+        # Keep refcount updates from the collector off the shared model pages
+        gc.freeze()
+        return app
+
+def main():
+    workers = Settings.API_WORKERS or multiprocessing.cpu_count()
+    port = int(os.environ.get("PORT", 5000))
+    logger.info(f"Starting {workers} workers on port {port}")
+
+    PreforkServer({
+        "bind": f"0.0.0.0:{port}",
+        "workers": workers,
+        "worker_class": "uvicorn_worker.UvicornWorker",
+        "preload_app": True,
+        "timeout": 60,
+        "graceful_timeout": 30,
+    }).run()
+
+if __name__ == "__main__":
+    main()
@@ -1,52 +1,128 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
-import mlflow.sklearn
-import pandas as pd
+from src.api.sagemaker import invocation_response, invocation_texts
+from src.api.service import PredictionService
 from src.config.settings import Settings
+from src.utils.metrics import metrics
+import atexit
 import os
+import time
 
 app = Flask(__name__)
 CORS(app)
 
 
-if Settings.MLFLOW_TRACKING_URI:
-    mlflow.set_tracking_uri(Settings.MLFLOW_TRACKING_URI)
+service = PredictionService()
+service.load()
+service.start_background()
+# Flush the traffic monitor's last window on shutdown
+atexit.register(service.stop_background)
 
-MODEL_URI = f"models:/{Settings.MODEL_NAME}/Staging"
+@app.before_request
+def start_timer():
+    g.start_time = time.perf_counter()
 
-print(f"Loading model from {MODEL_URI}...")
-try:
-    model = mlflow.sklearn.load_model(MODEL_URI)
-    print("Model loaded successfully.")
-except Exception as e:
-    print(f"Error loading model: {e}")
-    model = None
+@app.after_request
+def record_request(response):
+    endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    metrics.inc("api_requests_total", endpoint=endpoint, status=response.status_code)
+    metrics.observe("api_request_seconds", time.perf_counter() - g.start_time, endpoint=endpoint)
+    return response
 
 @app.route("/health", methods=["GET"])
 def health():
-    return jsonify({"status": "ready" if model else "model_not_loaded"})
+    return jsonify(service.health())
 
 @app.route("/predict", methods=["POST"])
 def predict():
-    if model is None:
+    serving = service.active
+    if serving is None:
         return jsonify({"error": "Model not loaded"}), 500
-    
-    data = request.get_json()
-    if not data or "text" not in data:
+
+    with metrics.timer("api_stage_seconds", stage="parse"):
+        data = request.get_json()
+    if not isinstance(data, dict) or "text" not in data:
         return jsonify({"error": "Missing 'text' in request body"}), 400
-    
+    if not isinstance(data["text"], str):
+        return jsonify({"error": "'text' must be a string"}), 400
+
     text = data["text"]
-    input_df = pd.DataFrame([text], columns=["text"])
-    
+
+    try:
+        prediction = service.predict_one(serving, text)
+        with metrics.timer("api_stage_seconds", stage="serialize"):
+            return jsonify({
+                "text": text,
+                "prediction": prediction
+            })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/predict/batch", methods=["POST"])
+def predict_batch():
+    serving = service.active
+    if serving is None:
+        return jsonify({"error": "Model not loaded"}), 500
+
+    with metrics.timer("api_stage_seconds", stage="parse"):
+        data = request.get_json()
+    if not isinstance(data, dict) or not isinstance(data.get("texts"), list):
+        return jsonify({"error": "Missing 'texts' list in request body"}), 400
+
+    texts = data["texts"]
+    if len(texts) > Settings.BATCH_REQUEST_LIMIT:
+        return jsonify({"error": f"At most {Settings.BATCH_REQUEST_LIMIT} texts per request"}), 413
+    if not all(isinstance(text, str) for text in texts):
+        return jsonify({"error": "Every item in 'texts' must be a string"}), 400
+
+    if not texts:
+        return jsonify({"predictions": []})
+
     try:
-        prediction = model.predict(input_df["text"])[0]
-        return jsonify({
-            "text": text,
-            "prediction": prediction
-        })
+        predictions = service.predict_many(serving, texts)
+        with metrics.timer("api_stage_seconds", stage="serialize"):
+            return jsonify({
+                "predictions": [
+                    {"text": text, "prediction": prediction}
+                    for text, prediction in zip(texts, predictions)
+                ]
+            })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# SageMaker container contract, so the API can stand in for the endpoint locally
+@app.route("/ping", methods=["GET"])
+def ping():
+    return Response(status=200 if service.active else 503)
+
+@app.route("/invocations", methods=["POST"])
+def invocations():
+    serving = service.active
+    if serving is None:
+        return jsonify({"error": "Model not loaded"}), 500
+
+    with metrics.timer("api_stage_seconds", stage="parse"):
+        texts = invocation_texts(request.get_json(silent=True))
+    if texts is None:
+        return jsonify({"error": "Expected dataframe_records, dataframe_split, instances or inputs with a 'text' column"}), 400
+    if len(texts) > Settings.BATCH_REQUEST_LIMIT:
+        return jsonify({"error": f"At most {Settings.BATCH_REQUEST_LIMIT} texts per request"}), 413
+
+    try:
+        predictions = service.predict_many(serving, texts) if texts else []
+        with metrics.timer("api_stage_seconds", stage="serialize"):
+            return jsonify(invocation_response(predictions))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/cache/stats", methods=["GET"])
+def cache_stats():
+    return jsonify(service.cache_stats())
+
+@app.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
     app.run(host="0.0.0.0", port=port)
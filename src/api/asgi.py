@@ -0,0 +1,228 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from src.api.sagemaker import invocation_response, invocation_texts
+from src.api.service import PredictionService
+from src.config.settings import Settings
+from src.utils.metrics import metrics
+
+
+class Overloaded(Exception):
+    pass
+
+
+class ConcurrencyLimiter:
+    """
+    Caps in-flight predictions per worker and bounds how many may wait.
+
+    Requests beyond `max_concurrency + max_queue` are rejected immediately
+    so an overloaded worker sheds load instead of growing unbounded latency.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._semaphore: asyncio.Semaphore | None = None
+        self.waiting = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            raise Overloaded()
+
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+
+class MetricsMiddleware:
+    """Counts requests by endpoint and status and records their end-to-end latency."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            endpoint = scope["path"] if scope["path"] in ENDPOINTS else "unmatched"
+            metrics.inc("api_requests_total", endpoint=endpoint, status=status)
+            metrics.observe("api_request_seconds", time.perf_counter() - start, endpoint=endpoint)
+
+
+# Loaded at import so a pre-forking launcher shares the model copy-on-write
+service = PredictionService()
+service.load()
+
+limiter = ConcurrencyLimiter(Settings.API_MAX_CONCURRENCY, Settings.API_MAX_QUEUE)
+
+
+async def _json_body(request: Request):
+    with metrics.timer("api_stage_seconds", stage="parse"):
+        try:
+            return await request.json()
+        except ValueError:
+            return None
+
+
+def _serialize(payload: dict) -> JSONResponse:
+    with metrics.timer("api_stage_seconds", stage="serialize"):
+        return JSONResponse(payload)
+
+
+async def health(request: Request):
+    return JSONResponse(service.health())
+
+
+async def predict(request: Request):
+    serving = service.active
+    if serving is None:
+        return JSONResponse({"error": "Model not loaded"}, status_code=500)
+
+    data = await _json_body(request)
+    if not isinstance(data, dict) or "text" not in data:
+        return JSONResponse({"error": "Missing 'text' in request body"}, status_code=400)
+    if not isinstance(data["text"], str):
+        return JSONResponse({"error": "'text' must be a string"}, status_code=400)
+
+    text = data["text"]
+
+    try:
+        async with limiter.slot():
+            prediction = await run_in_threadpool(service.predict_one, serving, text)
+        return _serialize({
+            "text": text,
+            "prediction": prediction
+        })
+    except Overloaded:
+        return JSONResponse({"error": "Server overloaded, retry later"}, status_code=503)
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+
+async def predict_batch(request: Request):
+    serving = service.active
+    if serving is None:
+        return JSONResponse({"error": "Model not loaded"}, status_code=500)
+
+    data = await _json_body(request)
+    if not isinstance(data, dict) or not isinstance(data.get("texts"), list):
+        return JSONResponse({"error": "Missing 'texts' list in request body"}, status_code=400)
+
+    texts = data["texts"]
+    if len(texts) > Settings.BATCH_REQUEST_LIMIT:
+        return JSONResponse({"error": f"At most {Settings.BATCH_REQUEST_LIMIT} texts per request"}, status_code=413)
+    if not all(isinstance(text, str) for text in texts):
+        return JSONResponse({"error": "Every item in 'texts' must be a string"}, status_code=400)
+
+    if not texts:
+        return JSONResponse({"predictions": []})
+
+    try:
+        async with limiter.slot():
+            predictions = await run_in_threadpool(service.predict_many, serving, texts)
+        return _serialize({
+            "predictions": [
+                {"text": text, "prediction": prediction}
+                for text, prediction in zip(texts, predictions)
+            ]
+        })
+    except Overloaded:
+        return JSONResponse({"error": "Server overloaded, retry later"}, status_code=503)
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+
+async def ping(request: Request):
+    return Response(status_code=200 if service.active else 503)
+
+
+async def invocations(request: Request):
+    """SageMaker's inference route, so a local server can stand in for the endpoint."""
+    serving = service.active
+    if serving is None:
+        return JSONResponse({"error": "Model not loaded"}, status_code=500)
+
+    texts = invocation_texts(await _json_body(request))
+    if texts is None:
+        return JSONResponse(
+            {"error": "Expected dataframe_records, dataframe_split, instances or inputs with a 'text' column"},
+            status_code=400,
+        )
+    if len(texts) > Settings.BATCH_REQUEST_LIMIT:
+        return JSONResponse({"error": f"At most {Settings.BATCH_REQUEST_LIMIT} texts per request"}, status_code=413)
+
+    if not texts:
+        return JSONResponse(invocation_response([]))
+
+    try:
+        async with limiter.slot():
+            predictions = await run_in_threadpool(service.predict_many, serving, texts)
+        return _serialize(invocation_response(predictions))
+    except Overloaded:
+        return JSONResponse({"error": "Server overloaded, retry later"}, status_code=503)
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+
+async def cache_stats(request: Request):
+    return JSONResponse(service.cache_stats())
+
+
+async def prometheus_metrics(request: Request):
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Runs in each worker after fork: background threads do not survive fork
+    service.start_background()
+    yield
+    service.stop_background()
+
+
+routes = [
+    Route("/health", health, methods=["GET"]),
+    Route("/predict", predict, methods=["POST"]),
+    Route("/predict/batch", predict_batch, methods=["POST"]),
+    Route("/ping", ping, methods=["GET"]),
+    Route("/invocations", invocations, methods=["POST"]),
+    Route("/cache/stats", cache_stats, methods=["GET"]),
+    Route("/metrics", prometheus_metrics, methods=["GET"]),
+]
+ENDPOINTS = {route.path for route in routes}
+
+app = Starlette(
+    routes=routes,
+    middleware=[Middleware(MetricsMiddleware)],
+    lifespan=lifespan,
+)
@@ -0,0 +1,102 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Sequence
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_CLOSE = object()
+
+
+class MicroBatcher:
+    """
+    Groups concurrent single-text predictions into one vectorized predict call.
+
+    A batch is flushed as soon as it holds `max_batch_size` texts or
+    `max_wait_ms` has elapsed since its first text arrived. After `close()`,
+    queued texts are still flushed and new ones are predicted inline.
+
+    The worker thread starts on first use, so a batcher created before a
+    worker process is forked runs its thread in the child that uses it.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[list[str]], Sequence],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+    ):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._worker: threading.Thread | None = None
+
+    def submit(self, text: str) -> Future:
+        future = Future()
+        with self._lock:
+            if not self._closed:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+                    self._worker.start()
+                self._queue.put((text, future))
+                return future
+
+        self._flush([(text, future)])
+        return future
+
+    def predict(self, text: str, timeout: float | None = None):
+        return self.submit(text).result(timeout=timeout)
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_CLOSE)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _CLOSE:
+                return
+
+            batch = [item]
+            closing = False
+            deadline = time.monotonic() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _CLOSE:
+                    closing = True
+                    break
+                batch.append(item)
+
+            self._flush(batch)
+            if closing:
+                return
+
+    def _flush(self, batch: list[tuple[str, Future]]):
+        texts = [text for text, _ in batch]
+        try:
+            predictions = self.predict_fn(texts)
+        except Exception as e:
+            logger.error(f"Batch prediction failed for {len(texts)} texts: {e}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), prediction in zip(batch, predictions):
+            future.set_result(prediction)
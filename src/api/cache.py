@@ -0,0 +1,128 @@
+import hashlib
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CacheBackend(ABC):
+    """Shared cache interface so API replicas can serve each other's hits."""
+
+    @abstractmethod
+    def get(self, key: str) -> str | None:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl_seconds: float):
+        ...
+
+
+class RedisCacheBackend(CacheBackend):
+    def __init__(self, url: str):
+        import redis
+
+        self.client = redis.Redis.from_url(url, socket_timeout=0.05)
+
+    def get(self, key: str) -> str | None:
+        value = self.client.get(key)
+        return value.decode() if value is not None else None
+
+    def set(self, key: str, value: str, ttl_seconds: float):
+        self.client.set(key, value, px=int(ttl_seconds * 1000))
+
+
+class PredictionCache:
+    """
+    Bounded in-process LRU + TTL cache of predictions.
+
+    Entries are keyed on (model version, normalized text), so loading a new
+    model version never serves predictions of the previous one. An optional
+    shared backend is consulted on local misses; backend failures are counted
+    and otherwise ignored so they never fail a request.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, backend: CacheBackend | None = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "backend_hits": 0,
+            "backend_errors": 0,
+        }
+
+    @staticmethod
+    def _backend_key(version: str, text: str) -> str:
+        return f"spamham:{version}:{hashlib.sha1(text.encode()).hexdigest()}"
+
+    def get(self, version: str, text: str):
+        key = (version, text)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                prediction, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return prediction
+                del self._entries[key]
+                self._stats["expirations"] += 1
+
+        if self.backend is not None:
+            try:
+                prediction = self.backend.get(self._backend_key(version, text))
+            except Exception as e:
+                logger.warning(f"Shared cache lookup failed: {e}")
+                prediction = None
+                self._count("backend_errors")
+            if prediction is not None:
+                self._store(key, prediction)
+                self._count("backend_hits")
+                self._count("hits")
+                return prediction
+
+        self._count("misses")
+        return None
+
+    def set(self, version: str, text: str, prediction: str):
+        self._store((version, text), prediction)
+
+        if self.backend is not None:
+            try:
+                self.backend.set(self._backend_key(version, text), prediction, self.ttl_seconds)
+            except Exception as e:
+                logger.warning(f"Shared cache write failed: {e}")
+                self._count("backend_errors")
+
+    def _store(self, key: tuple, prediction: str):
+        with self._lock:
+            self._entries[key] = (prediction, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["max_entries"] = self.max_entries
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
@@ -0,0 +1,85 @@
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+import numpy as np
+
+from src.data.minhash import MinHasher, band_keys, lsh_bands, similarity
+
+
+class Probe(NamedTuple):
+    """A text's signature and band keys, computed once per lookup and reused by `add`."""
+    signature: np.ndarray
+    keys: list[int]
+
+
+class CampaignIndex:
+    """
+    Verdicts of recently classified texts, looked up by near-duplicate match.
+
+    Each text the model classifies starts a cluster carrying the model's
+    verdict. A later text whose estimated Jaccard similarity to a cluster's
+    first text is at least `threshold` gets that verdict without a model
+    call. So a campaign that only varies a URL or a name is classified
+    once. A lookup is one MinHash signature plus one dict lookup per LSH
+    band, tens of microseconds. The oldest clusters (by last hit) are
+    evicted beyond `max_clusters`. ServingModel owns one index per model
+    version, so verdicts never outlive the model that produced them.
+    """
+
+    def __init__(self, threshold: float, max_clusters: int, num_perm: int = 64, shingle_size: int = 5):
+        self.threshold = threshold
+        self.max_clusters = max_clusters
+        self.hasher = MinHasher(num_perm, shingle_size)
+        self.bands, self.rows = lsh_bands(threshold, num_perm)
+
+        self._tables: list[dict[int, int]] = [{} for _ in range(self.bands)]
+        self._clusters: OrderedDict[int, tuple[Probe, str]] = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def probe(self, text: str) -> Probe:
+        signature = self.hasher.signature(text)
+        return Probe(signature, band_keys(signature[None, :], self.bands, self.rows)[0].tolist())
+
+    def lookup(self, probe: Probe) -> str | None:
+        """Verdict of the cluster the probed text belongs to, if any."""
+        with self._lock:
+            for table, key in zip(self._tables, probe.keys):
+                cluster = table.get(key)
+                if cluster is None:
+                    continue
+                representative, verdict = self._clusters[cluster]
+                if similarity(probe.signature, representative.signature) >= self.threshold:
+                    self._clusters.move_to_end(cluster)
+                    self._stats["hits"] += 1
+                    return verdict
+            self._stats["misses"] += 1
+            return None
+
+    def add(self, probe: Probe, verdict: str):
+        """Starts a cluster for a text the model classified."""
+        with self._lock:
+            cluster, self._next_id = self._next_id, self._next_id + 1
+            self._clusters[cluster] = (probe, verdict)
+            for table, key in zip(self._tables, probe.keys):
+                table.setdefault(key, cluster)
+
+            while len(self._clusters) > self.max_clusters:
+                evicted, (representative, _) = self._clusters.popitem(last=False)
+                for table, key in zip(self._tables, representative.keys):
+                    if table.get(key) == evicted:
+                        del table[key]
+                self._stats["evictions"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "clusters": len(self._clusters),
+                "max_clusters": self.max_clusters,
+                "threshold": self.threshold,
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,38 @@
+from src.config.settings import Settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def resolve_staging_version() -> str:
+    """The Staging version, from the registry metadata cache (refreshed after REGISTRY_CACHE_TTL_SECONDS)."""
+    from src.registry.cache import resolve_stage
+
+    return resolve_stage("Staging")
+
+
+def load_model(version: str | None = None):
+    """
+    Returns `(model, version)`.
+
+    Boots from `SERVING_BUNDLE_DIR` when it is set, which needs neither MLflow
+    nor a reachable tracking server; otherwise loads registry `version`
+    (default: the Staging version) through the local artifact cache. Heavy
+    modules are imported only on the path that uses them.
+    """
+    if Settings.SERVING_BUNDLE_DIR:
+        from src.models.bundle import ServingBundle
+
+        bundle = ServingBundle.load(Settings.SERVING_BUNDLE_DIR)
+        return bundle.model, bundle.version
+
+    import mlflow
+
+    from src.registry.cache import load_sklearn_model
+
+    if Settings.MLFLOW_TRACKING_URI:
+        mlflow.set_tracking_uri(Settings.MLFLOW_TRACKING_URI)
+
+    version = version or resolve_staging_version()
+    logger.info(f"Loading model {Settings.MODEL_NAME} v{version}...")
+    return load_sklearn_model(version), version
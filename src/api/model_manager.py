@@ -0,0 +1,120 @@
+import threading
+
+from src.api.batching import MicroBatcher
+from src.api.model_loader import load_model, resolve_staging_version
+from src.config.settings import Settings
+from src.utils.metrics import SIZE_BUCKETS, metrics
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+WARMUP_TEXTS = ["warm up", "free entry in a weekly competition", "see you at lunch"]
+
+
+class ServingModel:
+    """A loaded model version with the micro-batcher that feeds it and its campaign index."""
+
+    def __init__(self, model, version: str, source_id: str):
+        self.model = model
+        self.version = version
+        self.source_id = source_id
+        self._vectorize, self._classify = self._stages(model)
+        self.batcher = MicroBatcher(
+            self.predict_texts,
+            max_batch_size=Settings.BATCH_MAX_SIZE,
+            max_wait_ms=Settings.BATCH_MAX_WAIT_MS,
+        )
+        self.campaigns = None
+        if Settings.CAMPAIGN_INDEX_THRESHOLD > 0:
+            from src.api.campaigns import CampaignIndex
+
+            self.campaigns = CampaignIndex(
+                threshold=Settings.CAMPAIGN_INDEX_THRESHOLD,
+                max_clusters=Settings.CAMPAIGN_INDEX_MAX_CLUSTERS,
+                num_perm=Settings.MINHASH_NUM_PERM,
+                shingle_size=Settings.MINHASH_SHINGLE_SIZE,
+            )
+
+    @staticmethod
+    def _stages(model):
+        """Splits prediction into vectorize and classify callables so each can be timed."""
+        if hasattr(model, "named_steps"):
+            return model[:-1].transform, model[-1].predict
+        if hasattr(model, "predict_features"):
+            return model.transform, model.predict_features
+        return (lambda texts: texts), model.predict
+
+    def predict_texts(self, texts: list[str]) -> list[str]:
+        metrics.observe("model_batch_size", len(texts), buckets=SIZE_BUCKETS)
+        with metrics.timer("api_stage_seconds", stage="vectorize"):
+            features = self._vectorize(texts)
+        with metrics.timer("api_stage_seconds", stage="classify"):
+            predictions = self._classify(features)
+        return [str(p) for p in predictions]
+
+    def close(self):
+        self.batcher.close()
+
+
+class ModelManager:
+    """
+    Holds the active ServingModel and hot-swaps it when a new version appears.
+
+    Request handlers read `active` once and use that snapshot for the whole
+    request. A swap is a single reference assignment, so in-flight requests
+    finish on the model they started with. The replaced model's batcher is
+    closed only after the swap, which lets already queued texts drain.
+    """
+
+    def __init__(self):
+        self.active: ServingModel | None = None
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: threading.Thread | None = None
+
+    @staticmethod
+    def current_source_id() -> str:
+        """Cheap identifier of what the model source currently points at."""
+        if Settings.SERVING_BUNDLE_DIR:
+            from src.models.bundle import ServingBundle
+
+            return ServingBundle.read_metadata(Settings.SERVING_BUNDLE_DIR)["checksum"]
+        return resolve_staging_version()
+
+    def reload(self) -> bool:
+        """Loads the current model if it differs from the active one. Returns True on swap."""
+        with self._reload_lock:
+            source_id = self.current_source_id()
+            if self.active is not None and self.active.source_id == source_id:
+                return False
+
+            # Load the version just resolved, so a promotion in between cannot mislabel the model
+            model, version = load_model(None if Settings.SERVING_BUNDLE_DIR else source_id)
+            model.predict(WARMUP_TEXTS)
+
+            previous, self.active = self.active, ServingModel(model, version, source_id)
+            metrics.set_info("model_info", version=version)
+            if previous is not None:
+                previous.close()
+                logger.info(f"Swapped model version {previous.version} -> {version}")
+            else:
+                logger.info(f"Model version {version} is active")
+            return True
+
+    def start_watcher(self, interval_seconds: float):
+        if self._watcher is not None:
+            return
+        self._watcher = threading.Thread(
+            target=self._watch, args=(interval_seconds,), name="model-watcher", daemon=True
+        )
+        self._watcher.start()
+
+    def stop_watcher(self):
+        self._stop.set()
+
+    def _watch(self, interval_seconds: float):
+        while not self._stop.wait(interval_seconds):
+            try:
+                self.reload()
+            except Exception as e:
+                logger.warning(f"Model reload check failed: {e}")
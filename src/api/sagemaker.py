@@ -0,0 +1,33 @@
+TEXT_COLUMN = "text"
+
+
+def invocation_texts(data) -> list[str] | None:
+    """
+    Texts of a SageMaker `/invocations` request in the JSON formats the MLflow
+    scoring server accepts: `dataframe_records`, `dataframe_split`, or
+    `instances`/`inputs` holding strings or `{"text": ...}` records. Returns
+    None when the body matches none of them.
+    """
+    if not isinstance(data, dict):
+        return None
+    try:
+        if "dataframe_records" in data:
+            return [record[TEXT_COLUMN] for record in data["dataframe_records"]]
+        if "dataframe_split" in data:
+            split = data["dataframe_split"]
+            column = split["columns"].index(TEXT_COLUMN)
+            return [row[column] for row in split["data"]]
+        for key in ("instances", "inputs"):
+            if key in data:
+                values = data[key]
+                if isinstance(values, dict):
+                    return list(values[TEXT_COLUMN])
+                return [v[TEXT_COLUMN] if isinstance(v, dict) else v for v in values]
+    except (KeyError, TypeError, ValueError, IndexError):
+        return None
+    return None
+
+
+def invocation_response(predictions: list[str]) -> dict:
+    """Response body in the MLflow scoring server format."""
+    return {"predictions": predictions}
@@ -0,0 +1,138 @@
+from src.api.cache import PredictionCache, RedisCacheBackend
+from src.api.model_manager import ModelManager, ServingModel
+from src.config.settings import Settings
+from src.data.normalization import normalize_text
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+
+def _load_drift_baseline(version: str):
+    from src.monitoring.drift import DriftMonitor
+
+    if Settings.SERVING_BUNDLE_DIR:
+        from src.models.bundle import ServingBundle
+
+        state = ServingBundle.read_drift_baseline(Settings.SERVING_BUNDLE_DIR)
+        return DriftMonitor.from_state(state) if state else None
+    return DriftMonitor.from_model_version(version)
+
+
+class PredictionService:
+    """
+    Framework-independent prediction logic shared by the Flask and ASGI apps.
+
+    `load()` only loads the model and is safe to call before forking worker
+    processes. `start_background()` starts the reload watcher and the
+    traffic monitor and must run in each serving process.
+    """
+
+    def __init__(self):
+        self.manager = ModelManager()
+        self.cache = None
+        if Settings.PREDICTION_CACHE_SIZE > 0:
+            self.cache = PredictionCache(
+                max_entries=Settings.PREDICTION_CACHE_SIZE,
+                ttl_seconds=Settings.PREDICTION_CACHE_TTL_SECONDS,
+                backend=RedisCacheBackend(Settings.PREDICTION_CACHE_REDIS_URL) if Settings.PREDICTION_CACHE_REDIS_URL else None,
+            )
+        self.monitor = None
+        if Settings.MONITOR_OUTPUT_DIR:
+            from src.monitoring.traffic import TrafficMonitor
+
+            self.monitor = TrafficMonitor(
+                output_dir=Settings.MONITOR_OUTPUT_DIR,
+                buffer_size=Settings.MONITOR_BUFFER_SIZE,
+                flush_interval=Settings.MONITOR_FLUSH_INTERVAL_SECONDS,
+                sample_size=Settings.MONITOR_SAMPLE_SIZE,
+                heavy_hitters=Settings.DRIFT_HEAVY_HITTERS,
+                baseline_loader=_load_drift_baseline,
+                version_fn=lambda: self.active.version if self.active else None,
+            )
+
+    def load(self):
+        source = Settings.SERVING_BUNDLE_DIR or f"models:/{Settings.MODEL_NAME}/Staging"
+        logger.info(f"Loading model from {source}...")
+        try:
+            self.manager.reload()
+            logger.info(f"Model version {self.manager.active.version} loaded successfully.")
+        except Exception as e:
+            logger.error(f"Error loading model: {e}")
+
+    def start_background(self):
+        if Settings.MODEL_RELOAD_INTERVAL_SECONDS > 0:
+            self.manager.start_watcher(Settings.MODEL_RELOAD_INTERVAL_SECONDS)
+        if self.monitor is not None:
+            self.monitor.start()
+
+    def stop_background(self):
+        self.manager.stop_watcher()
+        if self.monitor is not None:
+            self.monitor.close()
+
+    @property
+    def active(self) -> ServingModel | None:
+        return self.manager.active
+
+    def health(self) -> dict:
+        serving = self.manager.active
+        return {
+            "status": "ready" if serving else "model_not_loaded",
+            "model_version": serving.version if serving else None
+        }
+
+    def cache_stats(self) -> dict:
+        stats = {"enabled": False} if self.cache is None else {"enabled": True, **self.cache.stats()}
+        serving = self.manager.active
+        if serving is not None and serving.campaigns is not None:
+            stats["campaigns"] = serving.campaigns.stats()
+        return stats
+
+    @staticmethod
+    def _classify(serving: ServingModel, texts: list[str], predict) -> list[str]:
+        """
+        Texts that belong to a known campaign get the cluster's verdict; `predict`
+        runs on the rest, which then start clusters of their own.
+        """
+        if serving.campaigns is None:
+            return predict(texts)
+        probes = [serving.campaigns.probe(t) for t in texts]
+        predictions = [serving.campaigns.lookup(p) for p in probes]
+        missing = [i for i, p in enumerate(predictions) if p is None]
+        metrics.inc("campaign_lookups_total", len(texts) - len(missing), result="hit")
+        metrics.inc("campaign_lookups_total", len(missing), result="miss")
+        if missing:
+            for i, prediction in zip(missing, predict([texts[i] for i in missing])):
+                predictions[i] = prediction
+                serving.campaigns.add(probes[i], prediction)
+        return predictions
+
+    def predict_one(self, serving: ServingModel, text: str) -> str:
+        normalized = normalize_text(text)
+        prediction = None if self.cache is None else self.cache.get(serving.version, normalized)
+        if prediction is None:
+            prediction = self._classify(serving, [normalized], lambda texts: [serving.batcher.predict(texts[0])])[0]
+            if self.cache is not None:
+                self.cache.set(serving.version, normalized, prediction)
+
+        if self.monitor is not None:
+            self.monitor.record(normalized, prediction)
+        return prediction
+
+    def predict_many(self, serving: ServingModel, texts: list[str]) -> list[str]:
+        normalized = [normalize_text(t) for t in texts]
+        if self.cache is None:
+            predictions = self._classify(serving, normalized, serving.predict_texts)
+        else:
+            predictions = [self.cache.get(serving.version, t) for t in normalized]
+            missing = [i for i, p in enumerate(predictions) if p is None]
+            if missing:
+                classified = self._classify(serving, [normalized[i] for i in missing], serving.predict_texts)
+                for i, prediction in zip(missing, classified):
+                    predictions[i] = prediction
+                    self.cache.set(serving.version, normalized[i], prediction)
+
+        if self.monitor is not None:
+            self.monitor.record_many(normalized, predictions)
+        return predictions
@@ -10,12 +10,123 @@ class Settings:
     EXPERIMENT_NAME: str = os.getenv("EXPERIMENT_NAME", "spam-ham-classifier")
     MODEL_NAME: str = os.getenv("MODEL_NAME", "SpamHamClassifier")
 
+    # Params, metrics and tags are buffered and sent in batches from a background thread
+    MLFLOW_ASYNC_LOGGING: bool = os.getenv("MLFLOW_ASYNC_LOGGING", "true").lower() == "true"
+    MLFLOW_LOG_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("MLFLOW_LOG_FLUSH_INTERVAL_SECONDS", "2"))
+    MLFLOW_LOG_RETRIES: int = int(os.getenv("MLFLOW_LOG_RETRIES", "5"))
+    MLFLOW_LOG_BACKOFF_SECONDS: float = float(os.getenv("MLFLOW_LOG_BACKOFF_SECONDS", "0.5"))
+    # Entries that cannot be sent are spooled here and replayed once the server is reachable
+    MLFLOW_SPOOL_DIR: str = os.getenv("MLFLOW_SPOOL_DIR", ".mlflow_spool")
+
     RAW_DATA_PATH: str = os.getenv("RAW_DATA_PATH")
     PROCESSED_DATA_BUCKET: str = os.getenv("PROCESSED_DATA_BUCKET")
 
+    # Pipeline runner: stage results are recorded under PIPELINE_STATE_DIR (default:
+    # {PROCESSED_DATA_BUCKET}/_pipeline) and reused while the stage's inputs are unchanged
+    PIPELINE_STATE_DIR: str = os.getenv("PIPELINE_STATE_DIR")
+    PIPELINE_MAX_WORKERS: int = int(os.getenv("PIPELINE_MAX_WORKERS", "2"))
+
+    # Streaming ETL: rows per CSV chunk (0 = load the whole file in memory)
+    ETL_CHUNK_SIZE: int = int(os.getenv("ETL_CHUNK_SIZE", "0"))
+    PARQUET_ROW_GROUP_SIZE: int = int(os.getenv("PARQUET_ROW_GROUP_SIZE", "100000"))
+    # Incremental ETL: only ingest rows appended since the previous run
+    ETL_INCREMENTAL: bool = os.getenv("ETL_INCREMENTAL", "false").lower() == "true"
+    # Near-duplicate collapsing: rows whose estimated Jaccard similarity to an earlier row
+    # of the same label reaches the threshold are dropped (0 = exact duplicates only)
+    ETL_NEAR_DUPLICATE_THRESHOLD: float = float(os.getenv("ETL_NEAR_DUPLICATE_THRESHOLD", "0"))
+    ETL_NEAR_DUPLICATE_N_JOBS: int = int(os.getenv("ETL_NEAR_DUPLICATE_N_JOBS", "0"))  # 0 = one per CPU
+    # MinHash signatures over character shingles, shared by the ETL and the campaign index
+    MINHASH_NUM_PERM: int = int(os.getenv("MINHASH_NUM_PERM", "64"))
+    MINHASH_SHINGLE_SIZE: int = int(os.getenv("MINHASH_SHINGLE_SIZE", "5"))
+
+    # Registry metadata is cached for REGISTRY_CACHE_TTL_SECONDS; model artifacts are cached
+    # by content under MODEL_CACHE_DIR ("" = always load from the registry)
+    REGISTRY_CACHE_TTL_SECONDS: float = float(os.getenv("REGISTRY_CACHE_TTL_SECONDS", "30"))
+    MODEL_CACHE_DIR: str = os.getenv("MODEL_CACHE_DIR", "~/.cache/spam-ham/models")
+
+    # Feature store: term counts materialized next to each dataset version and memory-mapped
+    # by training and tuning instead of re-tokenizing; FEATURE_CACHE_DIR holds local copies
+    # of entries on object storage
+    FEATURE_STORE_ENABLED: bool = os.getenv("FEATURE_STORE_ENABLED", "false").lower() == "true"
+    FEATURE_CACHE_DIR: str = os.getenv("FEATURE_CACHE_DIR", "~/.cache/spam-ham/features")
+
     RANDOM_STATE: int = int(os.getenv("RANDOM_STATE", "42"))
     F1_THRESHOLD: float = float(os.getenv("F1_THRESHOLD", "0.85"))
 
+    # Evaluation: streamed by row group, bootstrap CIs computed in parallel
+    EVALUATION_BATCH_ROWS: int = int(os.getenv("EVALUATION_BATCH_ROWS", "100000"))
+    EVALUATION_BOOTSTRAP_SAMPLES: int = int(os.getenv("EVALUATION_BOOTSTRAP_SAMPLES", "200"))
+    EVALUATION_CONFIDENCE: float = float(os.getenv("EVALUATION_CONFIDENCE", "0.95"))
+    EVALUATION_N_JOBS: int = int(os.getenv("EVALUATION_N_JOBS", "0"))  # 0 = one per CPU
+    # Gate promotion on the lower confidence bound of F1 instead of the point estimate
+    PROMOTE_ON_F1_LOWER_BOUND: bool = os.getenv("PROMOTE_ON_F1_LOWER_BOUND", "false").lower() == "true"
+
+    # Drift monitoring against the baseline profile logged at training time
+    DRIFT_HEAVY_HITTERS: int = int(os.getenv("DRIFT_HEAVY_HITTERS", "1000"))
+    DRIFT_PSI_THRESHOLD: float = float(os.getenv("DRIFT_PSI_THRESHOLD", "0.2"))
+    DRIFT_KS_THRESHOLD: float = float(os.getenv("DRIFT_KS_THRESHOLD", "0.1"))
+    DRIFT_JS_THRESHOLD: float = float(os.getenv("DRIFT_JS_THRESHOLD", "0.1"))
+    DRIFT_RATE_THRESHOLD: float = float(os.getenv("DRIFT_RATE_THRESHOLD", "0.05"))
+
+    # Training: "full" (TF-IDF + LogisticRegression in memory) or "incremental" (out-of-core)
+    TRAINING_MODE: str = os.getenv("TRAINING_MODE", "full")
+    TRAINING_BATCH_ROWS: int = int(os.getenv("TRAINING_BATCH_ROWS", "50000"))
+    TRAINING_EPOCHS: int = int(os.getenv("TRAINING_EPOCHS", "1"))
+    TRAINING_WARM_START: bool = os.getenv("TRAINING_WARM_START", "true").lower() == "true"
+    HASHING_N_FEATURES: int = int(os.getenv("HASHING_N_FEATURES", str(2 ** 20)))
+
+    # Hyperparameter search (full training mode only)
+    TUNING_ENABLED: bool = os.getenv("TUNING_ENABLED", "false").lower() == "true"
+    TUNING_SEARCH_SPACE: str = os.getenv("TUNING_SEARCH_SPACE")  # JSON; defaults to tuning_pipeline.DEFAULT_SEARCH_SPACE
+    TUNING_N_ITER: int = int(os.getenv("TUNING_N_ITER", "0"))  # 0 = full grid
+    TUNING_FOLDS: int = int(os.getenv("TUNING_FOLDS", "5"))
+    TUNING_N_JOBS: int = int(os.getenv("TUNING_N_JOBS", "0"))  # 0 = one per CPU
+    TUNING_PRUNE_MARGIN: float = float(os.getenv("TUNING_PRUNE_MARGIN", "0.05"))
+
+    # Post-training compression (full training mode only): terms below MODEL_COMPRESSION_MIN_DF
+    # training documents or MODEL_COMPRESSION_MIN_COEF x the largest |coefficient| are pruned and
+    # coefficients stored as MODEL_COMPRESSION_PRECISION. The copy is registered as
+    # COMPRESSED_MODEL_NAME only when its held-out F1 is within MODEL_COMPRESSION_F1_TOLERANCE of the full model's
+    MODEL_COMPRESSION_ENABLED: bool = os.getenv("MODEL_COMPRESSION_ENABLED", "false").lower() == "true"
+    COMPRESSED_MODEL_NAME: str = os.getenv("COMPRESSED_MODEL_NAME", f"{os.getenv('MODEL_NAME', 'SpamHamClassifier')}Compressed")
+    MODEL_COMPRESSION_MIN_DF: int = int(os.getenv("MODEL_COMPRESSION_MIN_DF", "2"))
+    MODEL_COMPRESSION_MIN_COEF: float = float(os.getenv("MODEL_COMPRESSION_MIN_COEF", "0.01"))
+    MODEL_COMPRESSION_PRECISION: str = os.getenv("MODEL_COMPRESSION_PRECISION", "float16")  # float16 or float32
+    MODEL_COMPRESSION_F1_TOLERANCE: float = float(os.getenv("MODEL_COMPRESSION_F1_TOLERANCE", "0.005"))
+    # Stratified share of the rows held out of a second fit, used only to gate the compressed copy
+    MODEL_COMPRESSION_HOLDOUT_FRACTION: float = float(os.getenv("MODEL_COMPRESSION_HOLDOUT_FRACTION", "0.1"))
+
+    # Prediction outputs: "compact" (row key, int8 labels, float32 probability) or "full" (input columns too)
+    PREDICTION_OUTPUT_MODE: str = os.getenv("PREDICTION_OUTPUT_MODE", "compact")
+    PREDICTION_COMPRESSION: str = os.getenv("PREDICTION_COMPRESSION", "zstd")
+    PREDICTION_ROW_GROUP_SIZE: int = int(os.getenv("PREDICTION_ROW_GROUP_SIZE", "100000"))
+
+    # Batch scoring: parquet inputs are sharded by row group, CSV inputs by BATCH_SCORING_SHARD_ROWS
+    BATCH_SCORING_SHARD_ROWS: int = int(os.getenv("BATCH_SCORING_SHARD_ROWS", "100000"))
+    BATCH_SCORING_N_JOBS: int = int(os.getenv("BATCH_SCORING_N_JOBS", "0"))  # 0 = one per CPU
+    BATCH_SCORING_TEXT_COLUMN: str = os.getenv("BATCH_SCORING_TEXT_COLUMN", "text")
+
+    # Prediction API Settings
+    SERVING_BUNDLE_DIR: str = os.getenv("SERVING_BUNDLE_DIR")
+    API_WORKERS: int = int(os.getenv("API_WORKERS", "0"))  # 0 = one per CPU
+    API_MAX_CONCURRENCY: int = int(os.getenv("API_MAX_CONCURRENCY", "32"))
+    API_MAX_QUEUE: int = int(os.getenv("API_MAX_QUEUE", "256"))
+    MODEL_RELOAD_INTERVAL_SECONDS: float = float(os.getenv("MODEL_RELOAD_INTERVAL_SECONDS", "60"))
+    BATCH_MAX_SIZE: int = int(os.getenv("BATCH_MAX_SIZE", "64"))
+    BATCH_MAX_WAIT_MS: float = float(os.getenv("BATCH_MAX_WAIT_MS", "5"))
+    BATCH_REQUEST_LIMIT: int = int(os.getenv("BATCH_REQUEST_LIMIT", "1000"))
+    PREDICTION_CACHE_SIZE: int = int(os.getenv("PREDICTION_CACHE_SIZE", "100000"))
+    PREDICTION_CACHE_TTL_SECONDS: float = float(os.getenv("PREDICTION_CACHE_TTL_SECONDS", "3600"))
+    PREDICTION_CACHE_REDIS_URL: str = os.getenv("PREDICTION_CACHE_REDIS_URL")
+    # Known campaigns: near-duplicates of recently classified texts reuse their verdict (0 = disabled)
+    CAMPAIGN_INDEX_THRESHOLD: float = float(os.getenv("CAMPAIGN_INDEX_THRESHOLD", "0"))
+    CAMPAIGN_INDEX_MAX_CLUSTERS: int = int(os.getenv("CAMPAIGN_INDEX_MAX_CLUSTERS", "20000"))
+    # Live traffic monitoring; disabled unless MONITOR_OUTPUT_DIR is set
+    MONITOR_OUTPUT_DIR: str = os.getenv("MONITOR_OUTPUT_DIR")
+    MONITOR_BUFFER_SIZE: int = int(os.getenv("MONITOR_BUFFER_SIZE", "65536"))
+    MONITOR_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("MONITOR_FLUSH_INTERVAL_SECONDS", "60"))
+    MONITOR_SAMPLE_SIZE: int = int(os.getenv("MONITOR_SAMPLE_SIZE", "0"))  # reservoir of raw inputs per window
+
     # SageMaker Deployment Settings
     SAGEMAKER_ROLE_ARN: str = os.getenv("SAGEMAKER_ROLE_ARN")
     REGION_NAME: str = os.getenv("REGION_NAME", "ap-southeast-2")
@@ -1,9 +1,83 @@
 import pandas as pd
+import numpy as np
 import hashlib
 
+from src.utils.hashing import mix64
+
+_MASK64 = (1 << 64) - 1
+
+
+class DatasetFingerprint:
+    """
+    Streaming dataset fingerprint, updated chunk by chunk.
+
+    Rows are hashed with pandas' vectorized non-cryptographic row hash,
+    excluding the index. In ordered mode the row hashes are folded into a
+    running digest, so row order matters. In unordered mode they are
+    summed (mod 2**64) in two independent lanes, which gives a multiset hash:
+    row order and chunking do not matter, and fingerprints of disjoint parts
+    combine with `merge`.
+    """
+
+    def __init__(self, ordered: bool = False):
+        self.ordered = ordered
+        self.rows = 0
+        self._digest = hashlib.blake2b(digest_size=16) if ordered else None
+        self._sum = 0
+        self._mix_sum = 0
+
+    def update(self, df: pd.DataFrame) -> "DatasetFingerprint":
+        return self.update_hashes(pd.util.hash_pandas_object(df, index=False).to_numpy(dtype=np.uint64))
+
+    def update_hashes(self, hashes: np.ndarray) -> "DatasetFingerprint":
+        self.rows += len(hashes)
+        if self.ordered:
+            self._digest.update(np.ascontiguousarray(hashes, dtype=np.uint64).tobytes())
+        else:
+            self._sum = (self._sum + int(hashes.sum(dtype=np.uint64))) & _MASK64
+            self._mix_sum = (self._mix_sum + int(mix64(hashes).sum(dtype=np.uint64))) & _MASK64
+        return self
+
+    def merge(self, other: "DatasetFingerprint") -> "DatasetFingerprint":
+        if self.ordered or other.ordered:
+            raise ValueError("Only unordered fingerprints can be merged")
+        merged = DatasetFingerprint(ordered=False)
+        merged.rows = self.rows + other.rows
+        merged._sum = (self._sum + other._sum) & _MASK64
+        merged._mix_sum = (self._mix_sum + other._mix_sum) & _MASK64
+        return merged
+
+    def hexdigest(self) -> str:
+        if self.ordered:
+            return self._digest.hexdigest()
+        state = f"{self.rows}:{self._sum:016x}:{self._mix_sum:016x}".encode()
+        return hashlib.blake2b(state, digest_size=16).hexdigest()
+
+    def state(self) -> dict:
+        if self.ordered:
+            raise ValueError("Only unordered fingerprints can be persisted")
+        return {"rows": self.rows, "sum": self._sum, "mix_sum": self._mix_sum}
+
+    @classmethod
+    def from_state(cls, state: dict) -> "DatasetFingerprint":
+        fingerprint = cls(ordered=False)
+        fingerprint.rows = state["rows"]
+        fingerprint._sum = state["sum"]
+        fingerprint._mix_sum = state["mix_sum"]
+        return fingerprint
+
+
 class DataVersioner:
     @staticmethod
-    def compute_hash(df: pd.DataFrame) -> str:
-        return hashlib.md5(
-            pd.util.hash_pandas_object(df, index=True).values
-        ).hexdigest()
+    def compute_hash(df: pd.DataFrame, ordered: bool = False) -> str:
+        return DatasetFingerprint(ordered).update(df).hexdigest()
+
+    @staticmethod
+    def fingerprint_dataset(path: str, ordered: bool = False, batch_rows: int = 100_000) -> str:
+        """Fingerprints a parquet file or dataset manifest one row-group batch at a time."""
+        from src.data.dataset_io import iter_dataset_batches
+
+        fingerprint = DatasetFingerprint(ordered)
+        for batch in iter_dataset_batches(path, batch_rows):
+            fingerprint.update(batch)
+        return fingerprint.hexdigest()
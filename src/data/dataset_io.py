@@ -0,0 +1,46 @@
+import json
+from typing import Iterator
+
+import pandas as pd
+
+MANIFEST_FILE = "dataset.json"
+
+
+def dataset_files(path: str) -> list[str]:
+    """
+    Resolves a dataset path to its parquet files.
+
+    A path is either a single parquet file or a `dataset.json` manifest
+    listing the parquet parts that make up an incrementally built version.
+    """
+    if not path.endswith(".json"):
+        return [path]
+
+    import fsspec
+
+    with fsspec.open(path, "r") as f:
+        return json.load(f)["parts"]
+
+
+def read_dataset(path: str, columns: list[str] | None = None) -> pd.DataFrame:
+    files = dataset_files(path)
+    if len(files) == 1:
+        return pd.read_parquet(files[0], columns=columns)
+    return pd.concat([pd.read_parquet(f, columns=columns) for f in files], ignore_index=True)
+
+
+def iter_dataset_batches(path: str, batch_rows: int, columns: list[str] | None = None) -> Iterator[pd.DataFrame]:
+    """Streams a dataset as DataFrames of at most `batch_rows` rows."""
+    import fsspec
+    import pyarrow.parquet as pq
+
+    for file in dataset_files(path):
+        with fsspec.open(file, "rb") as f:
+            for batch in pq.ParquetFile(f).iter_batches(batch_size=batch_rows, columns=columns):
+                yield batch.to_pandas()
+
+
+def predictions_path(data_path: str) -> str:
+    if data_path.endswith(".parquet"):
+        return data_path.replace(".parquet", "_with_preds.parquet")
+    return f"{data_path.rsplit('/', 1)[0]}/data_with_preds.parquet"
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+
+class HashIndex:
+    """
+    Compact set of 64-bit row hashes.
+
+    Hashes are kept in a few sorted NumPy runs (8 bytes per entry, no per-item
+    Python objects). New batches become a run; runs of similar size are merged
+    so lookups stay logarithmic in both run count and run length.
+    """
+
+    def __init__(self, hashes: np.ndarray | None = None):
+        self._runs: list[np.ndarray] = []
+        if hashes is not None and len(hashes):
+            self._runs.append(np.unique(np.asarray(hashes, dtype=np.uint64)))
+
+    def __len__(self) -> int:
+        return sum(len(run) for run in self._runs)
+
+    @staticmethod
+    def row_hashes(df: pd.DataFrame) -> np.ndarray:
+        return pd.util.hash_pandas_object(df, index=False).to_numpy(dtype=np.uint64)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self._runs:
+            positions = np.searchsorted(run, hashes)
+            positions[positions == len(run)] = 0
+            found |= run[positions] == hashes
+        return found
+
+    def add(self, hashes: np.ndarray):
+        run = np.unique(np.asarray(hashes, dtype=np.uint64))
+        if not len(run):
+            return
+        self._runs.append(run)
+        while len(self._runs) > 1 and len(self._runs[-2]) <= 2 * len(self._runs[-1]):
+            newer = self._runs.pop()
+            older = self._runs.pop()
+            self._runs.append(np.union1d(older, newer))
+
+    def to_array(self) -> np.ndarray:
+        return np.unique(np.concatenate(self._runs)) if self._runs else np.empty(0, dtype=np.uint64)
+
+    def save(self, f):
+        np.save(f, self.to_array(), allow_pickle=False)
+
+    @classmethod
+    def load(cls, f) -> "HashIndex":
+        return cls(np.load(f, allow_pickle=False))
+
+    def filter_new(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Returns a mask selecting the first occurrence of every hash not yet in
+        the index, and adds those hashes to it.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        first = np.zeros(len(hashes), dtype=bool)
+        first[np.unique(hashes, return_index=True)[1]] = True
+
+        mask = first & ~self.contains(hashes)
+        self.add(hashes[mask])
+        return mask
@@ -0,0 +1,277 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.utils.hashing import mix64
+
+EMPTY_HASH = np.uint32(0xFFFFFFFF)
+# Shingles per vectorized block; bounds the (shingles, num_perm) scratch array to ~32 MB at 64 permutations
+BLOCK_SHINGLES = 1 << 16
+# Texts per parallel task; smaller batches are not worth shipping to a worker
+MIN_PARALLEL_ROWS = 5_000
+
+
+class MinHasher:
+    """
+    MinHash signatures over character shingles.
+
+    The shingles of a text are its overlapping `shingle_size`-byte windows
+    (a shorter text is one shingle). Each one is hashed to 64 bits, and each
+    of the `num_perm` permutations is a multiply-shift hash `(a * x + b) >> 32`.
+    A signature keeps the minimum of every permutation over the text's
+    shingles. The share of positions two signatures agree on estimates the
+    Jaccard similarity of their shingle sets. All shingles of a batch are
+    hashed at once with NumPy, so there is no per-shingle Python work.
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(0, 2**64, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**64, size=num_perm, dtype=np.uint64)
+        # Polynomial hash of a window: sum(byte_i * 257^(k-1-i)) mod 2^64
+        self._powers = np.array([pow(257, i, 2**64) for i in reversed(range(shingle_size))], dtype=np.uint64)
+
+    def _window_hashes(self, buffer: np.ndarray) -> np.ndarray:
+        """Polynomial hash of every `shingle_size`-byte window of `buffer` (uint64)."""
+        k = self.shingle_size
+        windows = len(buffer) - k + 1
+        hashes = buffer[:windows] * self._powers[0]
+        for i in range(1, k):
+            hashes += buffer[i:i + windows] * self._powers[i]
+        return hashes
+
+    def _shingle_hashes(self, texts: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """64-bit hashes of all shingles, text after text, and the shingle count of each text."""
+        k = self.shingle_size
+        encoded = [t.encode("utf-8") for t in texts]
+        encoded = [e.ljust(k, b"\0") if e else e for e in encoded]
+        lengths = np.fromiter((len(e) for e in encoded), dtype=np.int64, count=len(encoded))
+        counts = np.maximum(lengths - k + 1, 0)
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.uint64), counts
+
+        buffer = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+        text_starts = np.cumsum(lengths) - lengths
+        shingle_starts = np.repeat(text_starts - (np.cumsum(counts) - counts), counts) + np.arange(total)
+        hashes = self._window_hashes(buffer)[shingle_starts]
+        return mix64(hashes), counts
+
+    def signatures(self, texts) -> np.ndarray:
+        """(len(texts), num_perm) uint32 signatures. Empty texts get EMPTY_HASH everywhere."""
+        texts = list(texts)
+        signatures = np.full((len(texts), self.num_perm), EMPTY_HASH, dtype=np.uint32)
+        hashes, counts = self._shingle_hashes(texts)
+        ends = np.cumsum(counts)
+
+        row = 0
+        while row < len(texts):
+            first = int(ends[row] - counts[row])
+            stop = max(row + 1, int(np.searchsorted(ends, first + BLOCK_SHINGLES, side="right")))
+            rows = np.arange(row, stop)
+            rows = rows[counts[rows] > 0]
+            if len(rows):
+                block = hashes[first:ends[stop - 1]]
+                permuted = ((block[:, None] * self._a + self._b) >> np.uint64(32)).astype(np.uint32)
+                signatures[rows] = np.minimum.reduceat(permuted, ends[rows] - counts[rows] - first, axis=0)
+            row = stop
+        return signatures
+
+    def signature(self, text: str) -> np.ndarray:
+        """Signature of one text; the same values `signatures` gives, with less overhead."""
+        encoded = text.encode("utf-8")
+        if not encoded:
+            return np.full(self.num_perm, EMPTY_HASH, dtype=np.uint32)
+        buffer = np.frombuffer(encoded.ljust(self.shingle_size, b"\0"), dtype=np.uint8).astype(np.uint64)
+        hashes = mix64(self._window_hashes(buffer))
+        return ((hashes[:, None] * self._a + self._b) >> np.uint64(32)).min(axis=0).astype(np.uint32)
+
+
+def lsh_bands(threshold: float, num_perm: int, recall: float = 0.99) -> tuple[int, int]:
+    """
+    LSH layout `(bands, rows)` with `bands * rows == num_perm`.
+
+    Two signatures become candidates when all rows of at least one band
+    agree, which happens with probability `1 - (1 - s**rows)**bands` at
+    Jaccard similarity `s`. Returns the most selective layout that still
+    finds pairs at `threshold` with probability `recall`. Candidates are
+    verified against the full signature, so extra candidates only cost time.
+    """
+    layout = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if bands * rows == num_perm and 1 - (1 - threshold ** rows) ** bands >= recall:
+            layout = (bands, rows)
+    return layout
+
+
+def band_keys(signatures: np.ndarray, bands: int, rows: int, groups: np.ndarray | None = None) -> np.ndarray:
+    """
+    (n, bands) uint64 keys, one hash per band of each signature.
+
+    With `groups`, each row's keys are salted with its group, so rows of
+    different groups never share a key.
+    """
+    n = len(signatures)
+    keys = np.tile(np.arange(1, bands + 1, dtype=np.uint64), (n, 1))
+    if groups is not None:
+        keys ^= mix64(np.asarray(groups, dtype=np.uint64) + np.uint64(1))[:, None]
+    grouped = signatures.astype(np.uint64).reshape(n, bands, rows)
+    for row in range(rows):
+        keys = mix64(keys ^ grouped[:, :, row])
+    return keys
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Estimated Jaccard similarity: the share of equal signature positions (along the last axis)."""
+    return np.mean(a == b, axis=-1)
+
+
+class _BandTable:
+    """
+    Band key -> first representative with that key, as sorted NumPy runs
+    merged like HashIndex's, so millions of keys cost 16 bytes each.
+    """
+
+    def __init__(self):
+        self._runs: list[tuple[np.ndarray, np.ndarray]] = []
+
+    def get(self, keys: np.ndarray) -> np.ndarray:
+        """Representative of every key, -1 where absent. Older runs win."""
+        found = np.full(len(keys), -1, dtype=np.int64)
+        for run_keys, run_values in self._runs:
+            positions = np.searchsorted(run_keys, keys)
+            positions[positions == len(run_keys)] = 0
+            hit = (run_keys[positions] == keys) & (found < 0)
+            found[hit] = run_values[positions[hit]]
+        return found
+
+    @staticmethod
+    def _first(keys: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        keys, index = np.unique(keys, return_index=True)
+        return keys, values[index]
+
+    def add(self, keys: np.ndarray, values: np.ndarray):
+        if not len(keys):
+            return
+        self._runs.append(self._first(keys, values))
+        while len(self._runs) > 1 and len(self._runs[-2][0]) <= 2 * len(self._runs[-1][0]):
+            newer_keys, newer_values = self._runs.pop()
+            older_keys, older_values = self._runs.pop()
+            self._runs.append(self._first(
+                np.concatenate([older_keys, newer_keys]), np.concatenate([older_values, newer_values])
+            ))
+
+
+class NearDuplicateIndex:
+    """
+    Streaming near-duplicate filter over MinHash signatures.
+
+    Rows that are kept become cluster representatives. Their signatures are
+    stored (4 bytes per permutation) and their LSH band keys indexed. A row
+    is a near-duplicate when one of its band keys leads to a representative
+    with estimated Jaccard similarity of at least `threshold`. That check
+    is always against the representative, so clusters do not drift through
+    chains of similar rows. A batch is first matched against earlier batches
+    with vectorized lookups, then rows without a match are checked, in
+    order, against the batch's own earlier representatives.
+    """
+
+    def __init__(self, threshold: float, num_perm: int):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = lsh_bands(threshold, num_perm)
+        self._tables = [_BandTable() for _ in range(self.bands)]
+        self._signatures = np.empty((0, num_perm), dtype=np.uint32)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _append(self, signatures: np.ndarray):
+        needed = self._count + len(signatures)
+        if needed > len(self._signatures):
+            grown = np.empty((max(needed, 2 * len(self._signatures)), self.num_perm), dtype=np.uint32)
+            grown[:self._count] = self._signatures[:self._count]
+            self._signatures = grown
+        self._signatures[self._count:needed] = signatures
+        self._count = needed
+
+    def filter_new(self, signatures: np.ndarray, groups: np.ndarray | None = None) -> np.ndarray:
+        """
+        Returns a mask selecting the rows that are not near-duplicates of a
+        representative, and adds those rows as representatives. With
+        `groups`, only rows of the same group are compared.
+        """
+        keys = band_keys(signatures, self.bands, self.rows, groups)
+        matched = np.zeros(len(signatures), dtype=bool)
+        for band, table in enumerate(self._tables):
+            candidates = table.get(keys[:, band])
+            check = np.flatnonzero(~matched & (candidates >= 0))
+            if len(check):
+                similar = similarity(signatures[check], self._signatures[candidates[check]]) >= self.threshold
+                matched[check[similar]] = True
+
+        local = [{} for _ in range(self.bands)]
+        keep = ~matched
+        for i in np.flatnonzero(keep):
+            row_keys = keys[i].tolist()
+            for band, key in enumerate(row_keys):
+                j = local[band].get(key)
+                if j is not None and similarity(signatures[i], signatures[j]) >= self.threshold:
+                    keep[i] = False
+                    break
+            else:
+                for band, key in enumerate(row_keys):
+                    local[band].setdefault(key, i)
+
+        kept = np.flatnonzero(keep)
+        ids = np.arange(self._count, self._count + len(kept), dtype=np.int64)
+        for band, table in enumerate(self._tables):
+            table.add(keys[kept, band], ids)
+        self._append(signatures[kept])
+        return keep
+
+
+class NearDuplicateFilter:
+    """
+    Collapses near-duplicate texts batch by batch (see NearDuplicateIndex).
+
+    Signatures of large batches are computed in `n_jobs` worker processes.
+    The pool is created on first use and lives until `close()`, so chunked
+    pipelines pay the start-up once.
+    """
+
+    def __init__(self, threshold: float, num_perm: int = 64, shingle_size: int = 5, n_jobs: int = 0):
+        self.hasher = MinHasher(num_perm, shingle_size)
+        self.index = NearDuplicateIndex(threshold, num_perm)
+        self.n_jobs = n_jobs or os.cpu_count()
+        self._pool: ProcessPoolExecutor | None = None
+
+    def signatures(self, texts: list[str]) -> np.ndarray:
+        tasks = min(self.n_jobs, len(texts) // MIN_PARALLEL_ROWS)
+        if tasks <= 1:
+            return self.hasher.signatures(texts)
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.n_jobs)
+        size = -(-len(texts) // tasks)
+        slices = [texts[i:i + size] for i in range(0, len(texts), size)]
+        return np.concatenate(list(self._pool.map(self.hasher.signatures, slices)))
+
+    def filter(self, texts, groups: np.ndarray | None = None) -> np.ndarray:
+        """Mask of the texts to keep: first occurrences of every near-duplicate cluster."""
+        return self.index.filter_new(self.signatures(list(texts)), groups)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
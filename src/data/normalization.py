@@ -0,0 +1,8 @@
+def normalize_text(text: str) -> str:
+    """Single-text form of the normalization ETLPipeline.transform applies."""
+    return str(text).lower().strip()
+
+
+def normalize_series(texts):
+    """Vectorized normalization for a pandas Series of texts."""
+    return texts.astype(str).str.lower().str.strip()
@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+
+from src.data.hash_index import HashIndex
+from src.data.text_length import length_buckets
+
+KEY_COLUMN = "row_key"
+# Columns hashed into the row key; a cleaned dataset row is identified by them
+KEY_SOURCE_COLUMNS = ["label", "text"]
+LABELS = ["ham", "spam"]
+
+
+def row_keys(df: pd.DataFrame) -> np.ndarray:
+    """Stable uint64 key of each dataset row, computed from its label and text."""
+    return HashIndex.row_hashes(df[KEY_SOURCE_COLUMNS])
+
+
+def _compact_schema():
+    import pyarrow as pa
+
+    label = pa.dictionary(pa.int8(), pa.string())
+    return pa.schema([
+        (KEY_COLUMN, pa.uint64()),
+        ("label", label),
+        ("prediction", label),
+        ("probability", pa.float32()),
+        ("text_length_bucket", pa.int8()),
+    ])
+
+
+def _labels(values):
+    import pyarrow as pa
+
+    codes = pd.Categorical(np.asarray(values), categories=LABELS).codes.astype(np.int8)
+    return pa.DictionaryArray.from_arrays(pa.array(codes, mask=codes < 0), pa.array(LABELS))
+
+
+class PredictionWriter:
+    """
+    Streams model predictions to a parquet file.
+
+    In "compact" mode (the default) each row is stored as its row key, the
+    true label and the prediction as int8 dictionary columns, P(spam) as
+    float32 and the text-length slice the evaluation reports on as int8,
+    which is about 15 bytes a row before compression. The text is not
+    copied; `row_key` joins a row back to the versioned dataset. In "full"
+    mode the input columns are kept and `row_key`, `prediction` and
+    `probability` are appended.
+
+    Batches are buffered and written as whole row groups of `row_group_size`
+    rows, compressed with `compression`.
+    """
+
+    def __init__(self, path: str, mode: str = "compact", compression: str = "zstd", row_group_size: int = 100_000):
+        if mode not in ("compact", "full"):
+            raise ValueError(f"Unknown prediction output mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.compression = compression
+        self.row_group_size = row_group_size
+        self.rows = 0
+        self._sink = None
+        self._writer = None
+        self._pending = []
+        self._pending_rows = 0
+
+    def __enter__(self) -> "PredictionWriter":
+        import fsspec
+
+        self._sink = fsspec.open(self.path, "wb").open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _table(self, df: pd.DataFrame, predictions, probabilities):
+        import pyarrow as pa
+
+        keys = row_keys(df)
+        probabilities = np.asarray(probabilities, dtype=np.float32)
+        if self.mode == "compact":
+            return pa.Table.from_arrays(
+                [
+                    pa.array(keys),
+                    _labels(df["label"]),
+                    _labels(predictions),
+                    pa.array(probabilities),
+                    pa.array(length_buckets(df["text"].str.len().fillna(0).to_numpy()).astype(np.int8)),
+                ],
+                schema=_compact_schema(),
+            )
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.append_column(KEY_COLUMN, pa.array(keys))
+        table = table.append_column("prediction", pa.array(np.asarray(predictions, dtype=object), pa.string()))
+        return table.append_column("probability", pa.array(probabilities))
+
+    def write(self, df: pd.DataFrame, predictions, probabilities):
+        """Adds one batch of dataset rows with their predicted labels and P(spam)."""
+        import pyarrow as pa
+
+        if not len(df):
+            return
+        self._pending.append(self._table(df, predictions, probabilities))
+        self._pending_rows += len(df)
+        self.rows += len(df)
+        if self._pending_rows >= self.row_group_size:
+            # Write whole row groups only; carry the remainder into the next one
+            table = pa.concat_tables(self._pending)
+            full_rows = self._pending_rows - self._pending_rows % self.row_group_size
+            self._write(table.slice(0, full_rows))
+            self._pending, self._pending_rows = [table.slice(full_rows)], self._pending_rows - full_rows
+
+    def _write(self, table):
+        import pyarrow.parquet as pq
+
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(
+                self._sink, table.schema, compression=self.compression, use_dictionary=True
+            )
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+
+    def close(self):
+        import pyarrow as pa
+
+        if self._sink is None:
+            return
+        if self._pending_rows:
+            self._write(pa.concat_tables(self._pending))
+        elif self._writer is None:
+            self._write(_compact_schema().empty_table())
+        self._writer.close()
+        self._sink.close()
+        self._sink = None
+
@@ -0,0 +1,15 @@
+import numpy as np
+
+# Upper bounds (characters) of the text-length slices; the last slice is open-ended
+LENGTH_BUCKETS = (50, 100, 200, 500)
+
+
+def length_buckets(lengths: np.ndarray) -> np.ndarray:
+    """Text-length slice of each row, by character count."""
+    return np.searchsorted(LENGTH_BUCKETS, lengths, side="right")
+
+
+def length_bucket_names() -> list[str]:
+    bounds = (0,) + LENGTH_BUCKETS
+    names = [f"{lo}-{hi - 1}" for lo, hi in zip(bounds, bounds[1:])]
+    return names + [f"{LENGTH_BUCKETS[-1]}+"]
@@ -0,0 +1,263 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.data.text_length import length_bucket_names, length_buckets
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Resolution of the probability histograms used for ROC-AUC / PR-AUC
+PROBABILITY_BINS = 1000
+
+# Confusion cell of a row is 2 * is_spam + predicted_spam
+TN, FP, FN, TP = range(4)
+
+
+def _is_spam(column) -> np.ndarray:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if pa.types.is_dictionary(column.type):
+        column = column.dictionary_decode()
+    return pc.fill_null(pc.equal(column, "spam"), False).to_numpy(zero_copy_only=False)
+
+
+def _auc_from_histograms(positives: np.ndarray, negatives: np.ndarray) -> tuple[float, float]:
+    """
+    ROC-AUC and average precision from per-bin class counts.
+
+    Bins are swept from the highest probability down; rows sharing a bin are
+    treated as tied, so the ROC curve is integrated with trapezoids.
+    """
+    tp = np.cumsum(positives[..., ::-1], axis=-1)
+    fp = np.cumsum(negatives[..., ::-1], axis=-1)
+    n_pos, n_neg = tp[..., -1:], fp[..., -1:]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tpr = np.concatenate([np.zeros_like(n_pos), tp], axis=-1) / n_pos
+        fpr = np.concatenate([np.zeros_like(n_neg), fp], axis=-1) / n_neg
+        roc_auc = np.sum(np.diff(fpr, axis=-1) * (tpr[..., 1:] + tpr[..., :-1]) / 2, axis=-1)
+
+        precision = np.where(tp + fp > 0, tp / (tp + fp), 1.0)
+        pr_auc = np.sum(np.diff(tpr, axis=-1) * precision, axis=-1)
+    return roc_auc, pr_auc
+
+
+def _rates(cm: np.ndarray) -> dict:
+    """Precision, recall and F1 of one confusion matrix or an array of them (last axis = TN, FP, FN, TP)."""
+    tp, fp, fn = cm[..., TP], cm[..., FP], cm[..., FN]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+        recall = np.where(tp + fn > 0, tp / (tp + fn), 0.0)
+        f1 = np.where(tp > 0, 2 * tp / (2 * tp + fp + fn), 0.0)
+    return {"precision": precision, "recall": recall, "f1": f1}
+
+
+class SliceMetrics:
+    """
+    Row counts of one slice by (label, prediction, probability bin).
+
+    The confusion matrix and the per-class probability histograms are both
+    marginals of these counts. Counts from different batches simply add.
+    """
+
+    def __init__(self, counts: np.ndarray | None = None):
+        self.counts = np.zeros((4, PROBABILITY_BINS), dtype=np.int64) if counts is None else counts
+
+    def merge(self, other: "SliceMetrics"):
+        self.counts += other.counts
+
+    def metrics(self, has_probability: bool) -> dict:
+        confusion = self.counts.sum(axis=-1)
+        rows = int(confusion.sum())
+        result = {
+            "rows": rows,
+            "tn": int(confusion[TN]),
+            "fp": int(confusion[FP]),
+            "fn": int(confusion[FN]),
+            "tp": int(confusion[TP]),
+            "accuracy": float((confusion[TN] + confusion[TP]) / rows) if rows else 0.0,
+        }
+        result.update({k: float(v) for k, v in _rates(confusion).items()})
+        if has_probability:
+            roc_auc, pr_auc = _auc_from_histograms(self.counts[FN] + self.counts[TP], self.counts[TN] + self.counts[FP])
+            result["roc_auc"] = float(roc_auc)
+            result["pr_auc"] = float(pr_auc)
+        return result
+
+
+def bootstrap_intervals(counts: np.ndarray, n_bootstrap: int, confidence: float, has_probability: bool,
+                        rng: np.random.Generator) -> dict:
+    """
+    Poisson bootstrap confidence intervals from aggregated counts.
+
+    The Poisson bootstrap weights every row by an independent Poisson(1)
+    draw. The summed weight of the rows sharing a (label, prediction,
+    probability bin) cell is then Poisson(count), so replicates are drawn
+    per cell rather than per row. The result has the same distribution, and
+    the cost depends on the number of cells instead of the number of rows.
+    """
+    replicates = rng.poisson(counts, size=(n_bootstrap,) + counts.shape)
+    values = _rates(replicates.sum(axis=-1))
+    if has_probability:
+        values["roc_auc"], values["pr_auc"] = _auc_from_histograms(
+            replicates[:, FN] + replicates[:, TP], replicates[:, TN] + replicates[:, FP]
+        )
+
+    alpha = (1 - confidence) / 2
+    intervals = {}
+    for name, samples in values.items():
+        lower, upper = np.nanquantile(samples, [alpha, 1 - alpha])
+        intervals[name] = {"lower": float(lower), "upper": float(upper)}
+    return intervals
+
+
+class EvaluationResult:
+    """
+    Mergeable evaluation state of part of a prediction file: a SliceMetrics
+    per slice, keyed by `(dimension, value)`, with the whole file under
+    `("all", "all")`.
+    """
+
+    def __init__(self):
+        self.slices: dict[tuple[str, str], SliceMetrics] = {}
+        self.has_probability = False
+
+    def update(self, is_spam: np.ndarray, predicted_spam: np.ndarray, probability: np.ndarray | None,
+               slices: dict[str, tuple[np.ndarray, list[str]]]):
+        """
+        Adds one batch.
+
+        `slices` maps a dimension name to per-row integer codes plus the
+        name of each code. Each dimension takes one bincount over
+        (code, confusion cell, probability bin).
+        """
+        cell = 2 * is_spam.astype(np.int64) + predicted_spam
+        index = cell * PROBABILITY_BINS
+        if probability is not None:
+            self.has_probability = True
+            index += np.clip((probability * PROBABILITY_BINS).astype(np.int64), 0, PROBABILITY_BINS - 1)
+
+        all_slices = {"all": (np.zeros(len(cell), dtype=np.int64), ["all"])}
+        all_slices.update(slices)
+        cells = 4 * PROBABILITY_BINS
+        for dimension, (codes, names) in all_slices.items():
+            counts = np.bincount(codes * cells + index, minlength=len(names) * cells)
+            counts = counts.reshape(len(names), 4, PROBABILITY_BINS)
+            for code, name in enumerate(names):
+                if counts[code].any():
+                    self.slices.setdefault((dimension, name), SliceMetrics()).merge(SliceMetrics(counts[code]))
+
+    def merge(self, other: "EvaluationResult"):
+        for key, acc in other.slices.items():
+            self.slices.setdefault(key, SliceMetrics()).merge(acc)
+        self.has_probability |= other.has_probability
+
+    def report(self, n_bootstrap: int, confidence: float, rng: np.random.Generator) -> dict:
+        overall = self.slices.get(("all", "all"), SliceMetrics())
+        slices: dict[str, dict] = {}
+        length_order = {name: i for i, name in enumerate(length_bucket_names())}
+        for dimension, name in sorted(self.slices, key=lambda k: (k[0], length_order.get(k[1], 0), k[1])):
+            if dimension != "all":
+                slices.setdefault(dimension, {})[name] = self.slices[dimension, name].metrics(self.has_probability)
+
+        intervals = {}
+        if n_bootstrap:
+            intervals = bootstrap_intervals(overall.counts, n_bootstrap, confidence, self.has_probability, rng)
+
+        return {
+            "overall": overall.metrics(self.has_probability),
+            "slices": slices,
+            "confidence_intervals": intervals,
+            "confidence": confidence,
+        }
+
+
+def _evaluate_row_group(path: str, row_group: int, batch_rows: int) -> EvaluationResult:
+    import fsspec
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    result = EvaluationResult()
+    length_names = length_bucket_names()
+
+    with fsspec.open(path, "rb") as f:
+        parquet = pq.ParquetFile(f)
+        available = set(parquet.schema_arrow.names)
+        columns = [c for c in ("label", "prediction", "probability", "text", "text_length_bucket") if c in available]
+
+        for batch in parquet.iter_batches(batch_size=batch_rows, row_groups=[row_group], columns=columns):
+            is_spam = _is_spam(batch.column("label"))
+            predicted_spam = _is_spam(batch.column("prediction"))
+            probability = None
+            if "probability" in available:
+                probability = pc.fill_null(batch.column("probability"), 0.0).to_numpy(zero_copy_only=False)
+
+            slices = {}
+            if "text_length_bucket" in available:
+                # Compact prediction files carry the slice instead of the text
+                buckets = batch.column("text_length_bucket").to_numpy(zero_copy_only=False).astype(np.int64)
+                slices["text_length"] = (buckets, length_names)
+            elif "text" in available:
+                lengths = pc.fill_null(pc.utf8_length(batch.column("text")), 0).to_numpy(zero_copy_only=False)
+                slices["text_length"] = (length_buckets(lengths), length_names)
+
+            result.update(is_spam, predicted_spam, probability, slices)
+    return result
+
+
+class EvaluationEngine:
+    """
+    Streams prediction parquet files (a single file or a `dataset.json`
+    manifest) and computes classification metrics in one pass.
+
+    The work unit is one parquet row group, read in batches of at most
+    `batch_rows` rows, so memory does not depend on the file size. Row groups
+    are evaluated in a process pool. Each returns a small EvaluationResult of
+    per-slice counts, and the results are merged. Bootstrap confidence
+    intervals are then drawn from the merged counts.
+
+    Input columns: `label` and `prediction` are required. With a
+    `probability` column (P(spam)) the report includes ROC-AUC and PR-AUC.
+    With `text`, or the `text_length_bucket` column of compact prediction
+    files, it is sliced by text length.
+    """
+
+    def __init__(self, n_bootstrap: int, confidence: float, n_jobs: int = 0,
+                 batch_rows: int = 100_000, random_state: int = 0):
+        self.n_bootstrap = n_bootstrap
+        self.confidence = confidence
+        self.n_jobs = n_jobs or os.cpu_count()
+        self.batch_rows = batch_rows
+        self.random_state = random_state
+
+    def row_groups(self, path: str) -> list[tuple[str, int]]:
+        import fsspec
+        import pyarrow.parquet as pq
+
+        from src.data.dataset_io import dataset_files
+
+        tasks = []
+        for file in dataset_files(path):
+            with fsspec.open(file, "rb") as f:
+                tasks.extend((file, rg) for rg in range(pq.ParquetFile(f).num_row_groups))
+        return tasks
+
+    def evaluate(self, path: str) -> dict:
+        tasks = self.row_groups(path)
+        logger.info(f"Evaluating {len(tasks)} row groups from {path}")
+
+        files, row_groups = zip(*tasks) if tasks else ((), ())
+        batch_rows = [self.batch_rows] * len(tasks)
+        result = EvaluationResult()
+        if self.n_jobs == 1 or len(tasks) <= 1:
+            for partial in map(_evaluate_row_group, files, row_groups, batch_rows):
+                result.merge(partial)
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.n_jobs, len(tasks))) as pool:
+                for partial in pool.map(_evaluate_row_group, files, row_groups, batch_rows):
+                    result.merge(partial)
+
+        return result.report(self.n_bootstrap, self.confidence, np.random.default_rng(self.random_state))
@@ -0,0 +1,229 @@
+import hashlib
+import json
+import posixpath
+import shutil
+import uuid
+from numbers import Integral
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer, TfidfVectorizer
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# TfidfVectorizer parameters that decide which terms are counted. Everything
+# else (min_df, max_df, max_features, binary, norm, idf weighting, dtype) is
+# applied to stored counts at fit time, so one materialization serves them all.
+COUNT_PARAMS = (
+    "input", "encoding", "decode_error", "strip_accents", "lowercase",
+    "preprocessor", "tokenizer", "analyzer", "stop_words", "token_pattern", "ngram_range",
+)
+ARRAYS = ("data", "indices", "indptr")
+META_FILE = "meta.json"
+
+
+def count_params(vectorizer: TfidfVectorizer) -> dict | None:
+    """
+    The vectorizer's counting parameters, or None when it cannot use stored
+    counts: custom callables cannot be keyed, and a fixed vocabulary is not fitted.
+    """
+    params = vectorizer.get_params()
+    if vectorizer.vocabulary is not None or callable(params["analyzer"]):
+        return None
+    if params["preprocessor"] is not None or params["tokenizer"] is not None:
+        return None
+    if params["stop_words"] is not None and not isinstance(params["stop_words"], str):
+        params["stop_words"] = sorted(params["stop_words"])
+    return {name: params[name] for name in COUNT_PARAMS}
+
+
+def config_key(params: dict) -> str:
+    return hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+class TermCounts:
+    """
+    Term-count matrix of a dataset (one row per row, in dataset order) and its
+    alphabetically sorted terms, as CountVectorizer produces them.
+
+    `fit` fits a TfidfVectorizer from the counts instead of the texts. Its
+    vocabulary, idf and output are the same as `vectorizer.fit_transform`
+    on the texts of `rows`. The result is an ordinary fitted vectorizer that
+    can be pickled into a model and applied to new texts.
+    """
+
+    def __init__(self, matrix: sparse.csr_matrix, terms: np.ndarray):
+        self.matrix = matrix
+        self.terms = terms
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def _rows(self, rows, vectorizer: TfidfVectorizer) -> sparse.csr_matrix:
+        """Counts of `rows` as `vectorizer.dtype`; only the values are copied, the structure stays mapped."""
+        counts = self.matrix if rows is None else self.matrix[rows]
+        data = np.ones_like(counts.data, dtype=vectorizer.dtype) if vectorizer.binary else counts.data.astype(vectorizer.dtype)
+        return sparse.csr_matrix((data, counts.indices, counts.indptr), shape=counts.shape, copy=False)
+
+    def fit(self, vectorizer: TfidfVectorizer, rows=None) -> tuple[sparse.csr_matrix, np.ndarray]:
+        """
+        Fits `vectorizer` on `rows` (default: all). Returns their TF-IDF matrix
+        and the stored columns the vocabulary kept, for `transform`.
+        """
+        counts = self._rows(rows, vectorizer)
+
+        # Same pruning as CountVectorizer._limit_features, over the terms present in `rows`
+        n_docs = counts.shape[0]
+        dfs = np.bincount(counts.indices, minlength=counts.shape[1])
+        max_df, min_df = vectorizer.max_df, vectorizer.min_df
+        max_doc_count = max_df if isinstance(max_df, Integral) else max_df * n_docs
+        min_doc_count = min_df if isinstance(min_df, Integral) else min_df * n_docs
+        if max_doc_count < min_doc_count:
+            raise ValueError("max_df corresponds to < documents than min_df")
+        present = np.flatnonzero(dfs > 0)
+        mask = (dfs[present] <= max_doc_count) & (dfs[present] >= min_doc_count)
+        limit = vectorizer.max_features
+        if limit is not None and mask.sum() > limit:
+            tfs = np.asarray(counts[:, present].sum(axis=0)).ravel()
+            mask_inds = (-tfs[mask]).argsort()[:limit]
+            new_mask = np.zeros(len(present), dtype=bool)
+            new_mask[np.flatnonzero(mask)[mask_inds]] = True
+            mask = new_mask
+        columns = present[mask]
+        if not len(columns):
+            raise ValueError("After pruning, no terms remain. Try a lower min_df or a higher max_df.")
+
+        vectorizer.fixed_vocabulary_ = False
+        vectorizer.vocabulary_ = {term: i for i, term in enumerate(self.terms[columns].tolist())}
+        vectorizer.stop_words_ = set(self.terms[present[~mask]].tolist())
+        # As in TfidfVectorizer.fit_transform, which keeps the transformer in `_tfidf`
+        vectorizer._tfidf = TfidfTransformer(
+            norm=vectorizer.norm,
+            use_idf=vectorizer.use_idf,
+            smooth_idf=vectorizer.smooth_idf,
+            sublinear_tf=vectorizer.sublinear_tf,
+        )
+        counts = counts if len(columns) == counts.shape[1] else counts[:, columns]
+        vectorizer._tfidf.fit(counts)
+        return vectorizer._tfidf.transform(counts, copy=False), columns
+
+    def transform(self, vectorizer: TfidfVectorizer, columns: np.ndarray, rows=None) -> sparse.csr_matrix:
+        """Same as `vectorizer.transform` on the texts of `rows`, for a vectorizer `fit` returned `columns` for."""
+        counts = self._rows(rows, vectorizer)[:, columns]
+        return vectorizer._tfidf.transform(counts, copy=False)
+
+
+class FeatureStore:
+    """
+    Term counts materialized next to each dataset version.
+
+    For a dataset at `{dir}/{name}.parquet` or `{dir}/{name}.json`, the
+    counts of every distinct counting configuration live in
+    `{dir}/features/{name}-{config_key}/`. The CSR components are stored as
+    raw `.npy` arrays, next to `terms.json` and `meta.json`. `meta.json` is
+    written last and marks the entry complete. Dataset versions are
+    content-addressed and never rewritten, so an entry stays valid.
+
+    Loading memory-maps the arrays. The matrix shares their pages with the
+    OS cache and with every other process that maps them, such as tuning
+    workers. Entries on object storage are first copied to `cache_dir`.
+    """
+
+    def __init__(self, cache_dir: str | None = None):
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else None
+
+    @staticmethod
+    def location(data_path: str, params: dict) -> str:
+        directory, name = posixpath.split(data_path.rstrip("/"))
+        return f"{directory}/features/{posixpath.splitext(name)[0]}-{config_key(params)}"
+
+    def _local_dir(self, location: str) -> Path:
+        """Local directory holding the entry, copying it from object storage on first use."""
+        import fsspec
+
+        fs, path = fsspec.core.url_to_fs(location)
+        if "file" in fs.protocol or "local" in fs.protocol:
+            return Path(path)
+        if self.cache_dir is None:
+            raise ValueError(f"Memory-mapping {location} needs a local FEATURE_CACHE_DIR")
+
+        local = self.cache_dir / hashlib.sha256(location.encode()).hexdigest()[:24]
+        if not (local / META_FILE).exists():
+            tmp = local.with_name(f"{local.name}.{uuid.uuid4().hex}.tmp")
+            tmp.mkdir(parents=True)
+            for name in (*(f"{a}.npy" for a in ARRAYS), "terms.json", META_FILE):
+                fs.get(f"{path}/{name}", str(tmp / name))
+            try:
+                tmp.rename(local)
+            except OSError:
+                shutil.rmtree(tmp, ignore_errors=True)  # Another process finished the same copy first
+        return local
+
+    def load(self, data_path: str, params: dict, rows: int | None = None) -> TermCounts | None:
+        """The stored counts, memory-mapped, or None when not materialized (or stale)."""
+        import fsspec
+
+        location = self.location(data_path, params)
+        fs, path = fsspec.core.url_to_fs(location)
+        if not fs.exists(f"{path}/{META_FILE}"):
+            return None
+        local = self._local_dir(location)
+        with open(local / META_FILE) as f:
+            meta = json.load(f)
+        if rows is not None and meta["rows"] != rows:
+            logger.warning(f"Ignoring features at {location}: {meta['rows']} rows, the dataset has {rows}")
+            return None
+
+        data, indices, indptr = (np.load(local / f"{a}.npy", mmap_mode="r") for a in ARRAYS)
+        matrix = sparse.csr_matrix((data, indices, indptr), shape=tuple(meta["shape"]), copy=False)
+        with open(local / "terms.json") as f:
+            terms = np.array(json.load(f), dtype=object)
+        logger.info(f"Loaded features {matrix.shape} from {location}")
+        return TermCounts(matrix, terms)
+
+    def materialize(self, data_path: str, params: dict, texts) -> TermCounts:
+        """Counts `texts` (the dataset's texts, in order) and stores the result."""
+        import fsspec
+
+        location = self.location(data_path, params)
+        vectorizer = CountVectorizer(**params, dtype=np.int32)
+        matrix = vectorizer.fit_transform(texts)
+        matrix.sort_indices()
+        terms = vectorizer.get_feature_names_out()
+
+        fs, path = fsspec.core.url_to_fs(location)
+        fs.makedirs(path, exist_ok=True)
+        for name in ARRAYS:
+            with fs.open(f"{path}/{name}.npy", "wb") as f:
+                np.save(f, getattr(matrix, name), allow_pickle=False)
+        with fs.open(f"{path}/terms.json", "w") as f:
+            json.dump(terms.tolist(), f)
+        with fs.open(f"{path}/{META_FILE}", "w") as f:
+            json.dump({
+                "data_path": data_path,
+                "params": params,
+                "rows": matrix.shape[0],
+                "shape": list(matrix.shape),
+                "nnz": int(matrix.nnz),
+            }, f, indent=2, default=str)
+        logger.info(f"Materialized features {matrix.shape} ({matrix.nnz} non-zeros) to {location}")
+        return self.load(data_path, params) or TermCounts(matrix, np.asarray(terms, dtype=object))
+
+    def counts(self, data_path: str, vectorizer: TfidfVectorizer, texts) -> TermCounts | None:
+        """
+        Stored counts for `vectorizer`'s configuration, materialized from
+        `texts` on first use. None when the vectorizer cannot use stored counts.
+        """
+        params = count_params(vectorizer)
+        if params is None:
+            return None
+        return self.load(data_path, params, rows=len(texts)) or self.materialize(data_path, params, texts)
+
+
+def feature_store() -> FeatureStore:
+    from src.config.settings import Settings
+
+    return FeatureStore(Settings.FEATURE_CACHE_DIR)
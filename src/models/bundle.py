@@ -0,0 +1,107 @@
+import hashlib
+import json
+import pickle
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.models.compiled import CompiledScorer
+from src.utils.hashing import sha256_file
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+METADATA_FILE = "metadata.json"
+COMPILED_MODEL_FILE = "model.npz"
+SKLEARN_MODEL_FILE = "model.pkl"
+DRIFT_BASELINE_FILE = "drift_baseline.json"
+FORMAT_VERSION = 1
+
+
+class ServingBundle:
+    """
+    Self-describing local model directory the API can boot from without MLflow.
+
+    Layout: `metadata.json` (model name, version, run id, format, per-file
+    SHA-256 and an overall checksum) next to either a compiled scorer
+    (`model.npz`) or, for pipelines that cannot be compiled, a pickled
+    sklearn pipeline (`model.pkl`). The training run's drift baseline
+    (`drift_baseline.json`) is included when there is one.
+    """
+
+    def __init__(self, model, metadata: dict):
+        self.model = model
+        self.metadata = metadata
+
+    @property
+    def version(self) -> str:
+        return str(self.metadata["model_version"])
+
+    @staticmethod
+    def export(pipeline, output_dir: str, model_name: str, model_version: str, run_id: str | None = None,
+               drift_baseline: dict | None = None) -> dict:
+        out = Path(output_dir)
+        out.mkdir(parents=True, exist_ok=True)
+
+        try:
+            CompiledScorer.from_pipeline(pipeline).save(str(out / COMPILED_MODEL_FILE))
+            model_format, model_file = "compiled", COMPILED_MODEL_FILE
+        except ValueError as e:
+            logger.warning(f"Pipeline cannot be compiled ({e}). Bundling the sklearn pipeline instead.")
+            with open(out / SKLEARN_MODEL_FILE, "wb") as f:
+                pickle.dump(pipeline, f, protocol=pickle.HIGHEST_PROTOCOL)
+            model_format, model_file = "sklearn", SKLEARN_MODEL_FILE
+
+        files = {model_file: sha256_file(out / model_file)}
+        if drift_baseline is not None:
+            with open(out / DRIFT_BASELINE_FILE, "w") as f:
+                json.dump(drift_baseline, f)
+            files[DRIFT_BASELINE_FILE] = sha256_file(out / DRIFT_BASELINE_FILE)
+        metadata = {
+            "format_version": FORMAT_VERSION,
+            "model_name": model_name,
+            "model_version": str(model_version),
+            "run_id": run_id,
+            "model_format": model_format,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "files": files,
+            "checksum": hashlib.sha256(json.dumps(files, sort_keys=True).encode()).hexdigest(),
+        }
+        with open(out / METADATA_FILE, "w") as f:
+            json.dump(metadata, f, indent=2)
+
+        logger.info(f"Exported {model_name} v{model_version} ({model_format}) to {out}")
+        return metadata
+
+    @staticmethod
+    def read_metadata(bundle_dir: str) -> dict:
+        with open(Path(bundle_dir) / METADATA_FILE) as f:
+            return json.load(f)
+
+    @staticmethod
+    def read_drift_baseline(bundle_dir: str) -> dict | None:
+        path = Path(bundle_dir) / DRIFT_BASELINE_FILE
+        if not path.exists():
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    @classmethod
+    def load(cls, bundle_dir: str) -> "ServingBundle":
+        root = Path(bundle_dir)
+        metadata = cls.read_metadata(bundle_dir)
+
+        if metadata.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported bundle format version: {metadata.get('format_version')}")
+        for name, expected in metadata["files"].items():
+            if sha256_file(root / name) != expected:
+                raise ValueError(f"Checksum mismatch for {root / name}")
+
+        if metadata["model_format"] == "compiled":
+            model = CompiledScorer.load(str(root / COMPILED_MODEL_FILE))
+        else:
+            # Unpickling imports sklearn on demand
+            with open(root / SKLEARN_MODEL_FILE, "rb") as f:
+                model = pickle.load(f)
+
+        logger.info(f"Loaded bundle {metadata['model_name']} v{metadata['model_version']} from {root}")
+        return cls(model, metadata)
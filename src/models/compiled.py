@@ -0,0 +1,194 @@
+import json
+import re
+import unicodedata
+from typing import Iterable
+
+import numpy as np
+
+
+def _strip_accents_unicode(text: str) -> str:
+    normalized = unicodedata.normalize("NFKD", text)
+    if normalized == text:
+        return text
+    return "".join(c for c in normalized if not unicodedata.combining(c))
+
+
+def _strip_accents_ascii(text: str) -> str:
+    return unicodedata.normalize("NFKD", text).encode("ASCII", "ignore").decode("ASCII")
+
+
+_ACCENT_FUNCTIONS = {
+    None: None,
+    "unicode": _strip_accents_unicode,
+    "ascii": _strip_accents_ascii,
+}
+
+
+class CompiledScorer:
+    """
+    Standalone scorer for a fitted TfidfVectorizer -> LogisticRegression pipeline.
+
+    Scoring is tokenize -> vocabulary lookup -> dot product against per-term
+    weights, using only the standard library and NumPy. The tokenizer
+    reproduces TfidfVectorizer's word analyzer, so predictions match the
+    source pipeline.
+    """
+
+    def __init__(
+        self,
+        terms: np.ndarray,
+        idf: np.ndarray,
+        coef: np.ndarray,
+        intercept: float,
+        classes: np.ndarray,
+        config: dict,
+    ):
+        self.terms = terms
+        self.idf = np.asarray(idf, dtype=np.float64)
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.classes = np.asarray(classes)
+        self.config = config
+
+        self._vocabulary = {str(term): i for i, term in enumerate(terms)}
+        self._token_re = re.compile(config["token_pattern"])
+        self._strip_accents = _ACCENT_FUNCTIONS[config["strip_accents"]]
+        self._stop_words = frozenset(config["stop_words"]) if config["stop_words"] else None
+        self._min_n, self._max_n = config["ngram_range"]
+
+    @classmethod
+    def from_pipeline(cls, pipeline) -> "CompiledScorer":
+        vectorizer = pipeline.steps[0][1]
+        classifier = pipeline.steps[-1][1]
+
+        if len(pipeline.steps) != 2 or not hasattr(vectorizer, "idf_"):
+            raise ValueError("Only TfidfVectorizer -> linear classifier pipelines can be compiled")
+        if vectorizer.analyzer != "word" or vectorizer.tokenizer is not None or vectorizer.preprocessor is not None:
+            raise ValueError("Only the built-in word analyzer can be compiled")
+        if vectorizer.strip_accents not in _ACCENT_FUNCTIONS:
+            raise ValueError(f"Unsupported strip_accents: {vectorizer.strip_accents!r}")
+        if classifier.coef_.shape[0] != 1:
+            raise ValueError("Only binary classifiers can be compiled")
+
+        terms = np.empty(len(vectorizer.vocabulary_), dtype=object)
+        for term, index in vectorizer.vocabulary_.items():
+            terms[index] = term
+
+        stop_words = vectorizer.get_stop_words()
+        config = {
+            "lowercase": bool(vectorizer.lowercase),
+            "strip_accents": vectorizer.strip_accents,
+            "token_pattern": vectorizer.token_pattern,
+            "stop_words": sorted(stop_words) if stop_words else [],
+            "ngram_range": list(vectorizer.ngram_range),
+            "binary": bool(vectorizer.binary),
+            "sublinear_tf": bool(vectorizer.sublinear_tf),
+            "use_idf": bool(vectorizer.use_idf),
+            "norm": vectorizer.norm,
+        }
+
+        return cls(
+            terms=terms.astype(str),
+            idf=vectorizer.idf_ if vectorizer.use_idf else np.ones(len(terms)),
+            coef=classifier.coef_[0],
+            intercept=classifier.intercept_[0],
+            classes=classifier.classes_,
+            config=config,
+        )
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                terms=self.terms,
+                idf=self.idf,
+                coef=self.coef,
+                intercept=np.array([self.intercept]),
+                classes=self.classes.astype(str),
+                config=np.array(json.dumps(self.config)),
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "CompiledScorer":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                terms=data["terms"],
+                idf=data["idf"],
+                coef=data["coef"],
+                intercept=data["intercept"][0],
+                classes=data["classes"],
+                config=json.loads(str(data["config"])),
+            )
+
+    def analyze(self, text: str) -> list[str]:
+        """Splits text into terms exactly like TfidfVectorizer's word analyzer."""
+        if self.config["lowercase"]:
+            text = text.lower()
+        if self._strip_accents is not None:
+            text = self._strip_accents(text)
+
+        tokens = self._token_re.findall(text)
+        if self._stop_words is not None:
+            tokens = [t for t in tokens if t not in self._stop_words]
+
+        if self._max_n == 1:
+            return tokens
+
+        min_n = self._min_n
+        terms = list(tokens) if min_n == 1 else []
+        if min_n == 1:
+            min_n += 1
+        for n in range(min_n, min(self._max_n + 1, len(tokens) + 1)):
+            for i in range(len(tokens) - n + 1):
+                terms.append(" ".join(tokens[i:i + n]))
+        return terms
+
+    def _features(self, text: str) -> tuple[np.ndarray, np.ndarray] | None:
+        """Term indices and normalized TF-IDF values of one text, or None if no term is known."""
+        lookup = self._vocabulary.get
+        indices = [i for i in map(lookup, self.analyze(text)) if i is not None]
+        if not indices:
+            return None
+
+        indices, counts = np.unique(np.asarray(indices, dtype=np.int64), return_counts=True)
+        tf = counts.astype(np.float64)
+        if self.config["binary"]:
+            tf[:] = 1.0
+        if self.config["sublinear_tf"]:
+            tf = np.log(tf) + 1.0
+
+        values = tf * self.idf[indices]
+        norm = self.config["norm"]
+        if norm == "l2":
+            values /= np.sqrt(np.dot(values, values))
+        elif norm == "l1":
+            values /= np.abs(values).sum()
+        return indices, values
+
+    def _score(self, features: tuple[np.ndarray, np.ndarray] | None) -> float:
+        if features is None:
+            return self.intercept
+        indices, values = features
+        return float(np.dot(values, self.coef[indices])) + self.intercept
+
+    def transform(self, texts: Iterable[str]) -> list:
+        """Sparse TF-IDF rows; the vectorize half of `predict`, for callers that time it separately."""
+        return [self._features(text) for text in texts]
+
+    def predict_features(self, features: list) -> np.ndarray:
+        decision = np.array([self._score(f) for f in features], dtype=np.float64)
+        return self.classes[(decision > 0).astype(int)]
+
+    def decision_function(self, texts: Iterable[str]) -> np.ndarray:
+        return np.array([self._score(self._features(text)) for text in texts], dtype=np.float64)
+
+    def predict_proba(self, texts: Iterable[str]) -> np.ndarray:
+        positive = 1.0 / (1.0 + np.exp(-self.decision_function(texts)))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, texts: Iterable[str]) -> np.ndarray:
+        return self.classes[(self.decision_function(texts) > 0).astype(int)]
+
+    def count_mismatches(self, pipeline, texts: list[str]) -> int:
+        """Returns how many texts get a different label than the source pipeline."""
+        return int((self.predict(texts) != pipeline.predict(texts)).sum())
@@ -0,0 +1,113 @@
+import copy
+import pickle
+
+import numpy as np
+from scipy import sparse
+from sklearn.base import clone
+from sklearn.metrics import f1_score
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import normalize
+
+PRECISIONS = {"float32": np.float32, "float16": np.float16}
+
+
+def model_size(pipeline: Pipeline) -> int:
+    """Pickled size in bytes, what a worker reads and unpickles on load."""
+    return len(pickle.dumps(pipeline, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class ModelCompressor:
+    """
+    Shrinks a fitted TfidfVectorizer -> linear classifier pipeline for serving.
+
+    Terms seen in fewer than `min_df` training documents, or whose largest
+    |coefficient| is below `min_coef` times the largest in the model, are
+    dropped from the vocabulary, the idf and the coefficients. Coefficients
+    are stored as `precision` and idf values are rounded to float16. The
+    vectorizer is rebuilt with the kept terms as its fixed vocabulary, through
+    sklearn's public `vocabulary` and `idf_`, so `stop_words_`, which sklearn
+    keeps only for introspection, is dropped.
+
+    The result is a stock sklearn Pipeline, so MLflow, the API, batch
+    scoring, SageMaker and `CompiledScorer` load it like the full model.
+    Dropping terms changes the norm of the TF-IDF vectors, so predictions
+    can change; `evaluate` measures by how much on rows held out of a
+    second fit.
+    """
+
+    def __init__(self, min_df: int = 2, min_coef: float = 0.01, precision: str = "float16"):
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision {precision!r}; expected one of {list(PRECISIONS)}")
+        self.min_df = min_df
+        self.min_coef = min_coef
+        self.dtype = PRECISIONS[precision]
+
+    def columns(self, pipeline: Pipeline, X: sparse.csr_matrix) -> np.ndarray:
+        """Columns of the full model to keep, given its TF-IDF matrix `X` of the training texts."""
+        dfs = np.bincount(X.indices, minlength=X.shape[1])
+        weights = np.abs(pipeline.steps[-1][1].coef_).max(axis=0)
+        keep = (dfs >= self.min_df) & (weights >= self.min_coef * weights.max())
+        if not keep.any():
+            raise ValueError("Compression would drop every term; lower the minimum df or coefficient")
+        return np.flatnonzero(keep)
+
+    def compress(self, pipeline: Pipeline, columns: np.ndarray) -> Pipeline:
+        (name, full_vectorizer), (classifier_name, classifier) = pipeline.steps
+        classifier = copy.deepcopy(classifier)
+
+        # An unfitted copy with the kept terms as a fixed vocabulary. Fitting on
+        # the terms themselves only sets it up; the idf is then replaced.
+        terms = full_vectorizer.get_feature_names_out()[columns].tolist()
+        vectorizer = clone(full_vectorizer).set_params(vocabulary=terms).fit(terms)
+        if vectorizer.use_idf:
+            vectorizer.idf_ = full_vectorizer.idf_[columns].astype(np.float16)
+
+        classifier.coef_ = classifier.coef_[:, columns].astype(self.dtype)
+        classifier.n_features_in_ = len(columns)
+        return Pipeline([(name, vectorizer), (classifier_name, classifier)])
+
+    @staticmethod
+    def transform(full: Pipeline, compressed: Pipeline, X: sparse.csr_matrix, columns: np.ndarray) -> sparse.csr_matrix:
+        """
+        The compressed model's features from the full model's `X`, without
+        re-tokenizing. TF-IDF values of the kept terms only differ by the
+        rounded idf and the row norm, which are both reapplied here.
+        """
+        vectorizer = compressed.steps[0][1]
+        X = X[:, columns]
+        if vectorizer.use_idf:
+            X = X @ sparse.diags(vectorizer.idf_ / full.steps[0][1].idf_[columns])
+        return normalize(X, norm=vectorizer.norm, copy=False) if vectorizer.norm else X
+
+    def evaluate(self, pipeline: Pipeline, X: sparse.csr_matrix, holdout_pipeline: Pipeline,
+                 X_fit: sparse.csr_matrix, X_holdout: sparse.csr_matrix, y_holdout) -> tuple[Pipeline, dict]:
+        """
+        Compresses `pipeline`, pruning by the document frequencies of `X`
+        (its TF-IDF matrix of the rows it was fitted on).
+
+        The F1 cost is measured on `holdout_pipeline`, the same model fitted
+        on fewer rows (`X_fit`, its TF-IDF matrix of them): it is compressed
+        the same way and both versions are scored on `X_holdout`, its TF-IDF
+        matrix of the held-out texts labelled `y_holdout`.
+        """
+        holdout_columns = self.columns(holdout_pipeline, X_fit)
+        holdout_compressed = self.compress(holdout_pipeline, holdout_columns)
+        classes = holdout_pipeline.classes_
+        full_preds = classes[holdout_pipeline.steps[-1][1].predict_proba(X_holdout).argmax(axis=1)]
+        X_compressed = self.transform(holdout_pipeline, holdout_compressed, X_holdout, holdout_columns)
+        preds = classes[holdout_compressed.steps[-1][1].predict_proba(X_compressed).argmax(axis=1)]
+
+        columns = self.columns(pipeline, X)
+        compressed = self.compress(pipeline, columns)
+        full_size, size = model_size(pipeline), model_size(compressed)
+        return compressed, {
+            "terms": len(columns),
+            "full_terms": X.shape[1],
+            "holdout_rows": X_holdout.shape[0],
+            "f1_score": f1_score(y_holdout, preds, pos_label="spam"),
+            "full_f1_score": f1_score(y_holdout, full_preds, pos_label="spam"),
+            "agreement": float((preds == full_preds).mean()),
+            "size_bytes": size,
+            "full_size_bytes": full_size,
+            "size_ratio": size / full_size,
+        }
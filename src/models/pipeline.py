@@ -1,11 +1,22 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.pipeline import Pipeline
 
 class SpamHamPipeline:
     @staticmethod
-    def build(random_state: int) -> Pipeline:
-        return Pipeline([
+    def build(random_state: int, params: dict | None = None) -> Pipeline:
+        pipeline = Pipeline([
             ("tfidf", TfidfVectorizer()),
             ("classifier", LogisticRegression(random_state=random_state))
         ])
+        if params:
+            pipeline.set_params(**params)
+        return pipeline
+
+    @staticmethod
+    def build_incremental(random_state: int, n_features: int) -> Pipeline:
+        """Stateless hashing features + a linear model that supports partial_fit."""
+        return Pipeline([
+            ("hashing", HashingVectorizer(n_features=n_features, alternate_sign=False)),
+            ("classifier", SGDClassifier(loss="log_loss", random_state=random_state))
+        ])
@@ -1,4 +1,6 @@
 import numpy as np
+from src.config.settings import Settings
+from src.monitoring.sketches import DriftProfile, js_divergence, ks_statistic, psi, token_histograms
 from src.utils.logger import get_logger
 
 logger = get_logger("DRIFT")
@@ -9,7 +11,9 @@ class DataDriftMonitor:
         self.threshold = threshold
 
     def check_text_length_drift(self, texts: list[str]) -> bool:
-        current_mean = np.mean([len(t) for t in texts])
+        return self.check_mean_length(np.mean([len(t) for t in texts]))
+
+    def check_mean_length(self, current_mean: float) -> bool:
         drift = abs(self.baseline_mean - current_mean)
 
         logger.info(f"Baseline mean={self.baseline_mean}")
@@ -20,3 +24,102 @@ class DataDriftMonitor:
             return True
 
         return False
+
+
+BASELINE_ARTIFACT = "drift_baseline.json"
+
+
+class DriftMonitor:
+    """
+    Compares a DriftProfile of new data against the training baseline.
+
+    The baseline is a DriftProfile of the training texts and predictions. It
+    is logged next to the model as `drift_baseline.json`, together with the
+    vectorizer's unigram vocabulary. The checks are:
+    - PSI, KS and JS divergence of the length histograms
+    - JS divergence of the token heavy hitters
+    - absolute change in OOV rate and spam rate
+    """
+
+    def __init__(self, baseline: DriftProfile):
+        self.baseline = baseline
+
+    @staticmethod
+    def vocabulary_of(pipeline) -> set[str] | None:
+        """Unigram vocabulary of a fitted TF-IDF pipeline, or None for hashing pipelines."""
+        tfidf = getattr(pipeline, "named_steps", {}).get("tfidf")
+        if tfidf is None:
+            return None
+        return {term for term in tfidf.vocabulary_ if " " not in term}
+
+    @staticmethod
+    def log_baseline(profile: DriftProfile):
+        import mlflow
+
+        vocabulary = sorted(profile.vocabulary) if profile.vocabulary is not None else None
+        mlflow.log_dict({"profile": profile.to_dict(), "vocabulary": vocabulary}, BASELINE_ARTIFACT)
+
+    @classmethod
+    def from_state(cls, state: dict) -> "DriftMonitor":
+        vocabulary = set(state["vocabulary"]) if state["vocabulary"] is not None else None
+        return cls(DriftProfile.from_dict(state["profile"], vocabulary))
+
+    @classmethod
+    def from_model_version(cls, version: str) -> "DriftMonitor | None":
+        """Loads the baseline logged with a registered model version, or None if there is none."""
+        import mlflow
+
+        from src.registry.cache import registry
+
+        try:
+            run_id = registry().get_version(version)["run_id"]
+            state = mlflow.artifacts.load_dict(f"runs:/{run_id}/{BASELINE_ARTIFACT}")
+        except Exception as e:
+            logger.warning(f"No drift baseline available for version {version}: {e}")
+            return None
+        return cls.from_state(state)
+
+    @classmethod
+    def from_registry(cls) -> "DriftMonitor | None":
+        """Loads the baseline logged with the Staging model, or None if there is none."""
+        from src.registry.cache import registry
+
+        try:
+            staging = registry().latest_version("Staging")
+        except Exception as e:
+            logger.warning(f"No drift baseline available: {e}")
+            return None
+        return cls.from_model_version(staging["version"]) if staging else None
+
+    def new_profile(self) -> DriftProfile:
+        """An empty profile measured against the baseline's vocabulary."""
+        return DriftProfile(self.baseline.vocabulary, Settings.DRIFT_HEAVY_HITTERS)
+
+    def check(self, current: DriftProfile) -> tuple[dict, bool]:
+        expected, actual = self.baseline.lengths.counts, current.lengths.counts
+        tokens_expected, tokens_actual = token_histograms(self.baseline.tokens, current.tokens)
+        report = {
+            "length_psi": psi(expected, actual),
+            "length_ks": ks_statistic(expected, actual),
+            "length_js": js_divergence(expected, actual),
+            "token_js": js_divergence(tokens_expected, tokens_actual),
+            "spam_rate_delta": abs(current.spam_rate() - self.baseline.spam_rate()),
+        }
+        if current.oov_rate() is not None and self.baseline.oov_rate() is not None:
+            report["oov_rate_delta"] = abs(current.oov_rate() - self.baseline.oov_rate())
+
+        alerts = [
+            name for name, threshold in (
+                ("length_psi", Settings.DRIFT_PSI_THRESHOLD),
+                ("length_ks", Settings.DRIFT_KS_THRESHOLD),
+                ("length_js", Settings.DRIFT_JS_THRESHOLD),
+                ("token_js", Settings.DRIFT_JS_THRESHOLD),
+                ("spam_rate_delta", Settings.DRIFT_RATE_THRESHOLD),
+                ("oov_rate_delta", Settings.DRIFT_RATE_THRESHOLD),
+            )
+            if report.get(name, 0.0) > threshold
+        ]
+        logger.info(f"Drift vs baseline: {report}")
+        if alerts:
+            logger.warning(f"⚠️ Drift detected: {', '.join(alerts)}")
+        return report, bool(alerts)
@@ -0,0 +1,222 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# TfidfVectorizer's default token pattern; OOV is measured on these unigrams
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+# Length buckets are quarter-octaves: bucket b >= 1 holds lengths in [2**((b-1)/4), 2**(b/4))
+LENGTH_BUCKETS_PER_OCTAVE = 4
+LENGTH_BUCKETS = LENGTH_BUCKETS_PER_OCTAVE * 16 + 2
+
+
+class LengthHistogram:
+    """
+    Fixed log-bucket histogram of text lengths.
+
+    Memory is constant (LENGTH_BUCKETS counters), relative bucket width is
+    about 19%, and histograms merge by adding counts. The exact sum is kept
+    alongside, so the mean is exact.
+    """
+
+    def __init__(self):
+        self.counts = np.zeros(LENGTH_BUCKETS, dtype=np.int64)
+        self.total = 0
+
+    @staticmethod
+    def buckets(lengths: np.ndarray) -> np.ndarray:
+        lengths = np.asarray(lengths, dtype=np.float64)
+        with np.errstate(divide="ignore"):
+            buckets = np.floor(LENGTH_BUCKETS_PER_OCTAVE * np.log2(lengths)) + 1
+        buckets[lengths <= 0] = 0
+        return np.clip(buckets, 0, LENGTH_BUCKETS - 1).astype(np.int64)
+
+    def update(self, lengths: np.ndarray):
+        self.counts += np.bincount(self.buckets(lengths), minlength=LENGTH_BUCKETS)
+        self.total += int(np.sum(lengths))
+
+    def merge(self, other: "LengthHistogram"):
+        self.counts += other.counts
+        self.total += other.total
+
+    @property
+    def rows(self) -> int:
+        return int(self.counts.sum())
+
+    def mean(self) -> float:
+        return self.total / self.rows if self.rows else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile: the lower edge of the bucket holding it."""
+        if not self.rows:
+            return 0.0
+        bucket = int(np.searchsorted(np.cumsum(self.counts), q * self.rows, side="left"))
+        return 0.0 if bucket == 0 else float(2 ** ((bucket - 1) / LENGTH_BUCKETS_PER_OCTAVE))
+
+    def to_dict(self) -> dict:
+        return {"counts": self.counts.tolist(), "total": self.total}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "LengthHistogram":
+        histogram = cls()
+        histogram.counts = np.asarray(state["counts"], dtype=np.int64)
+        histogram.total = state["total"]
+        return histogram
+
+
+class HeavyHitters:
+    """
+    Misra-Gries frequent-items summary with at most `capacity` counters.
+
+    Counts are underestimated by at most total / (capacity + 1). Batches and
+    other summaries are folded in the same way: add the counters, and if
+    more than `capacity` remain, subtract the (capacity + 1)-th largest from
+    all of them and drop those that reach zero. That keeps the error bound
+    under merging.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype=np.int64)
+        self.total = 0
+
+    def update(self, counts: pd.Series):
+        """Folds in a batch of item counts (index = item)."""
+        self.total += int(counts.sum())
+        combined = self.counts.add(counts, fill_value=0).astype(np.int64)
+        if len(combined) > self.capacity:
+            combined = combined - combined.nlargest(self.capacity + 1).iloc[-1]
+            combined = combined[combined > 0]
+        self.counts = combined
+
+    def merge(self, other: "HeavyHitters"):
+        total = self.total + other.total
+        self.update(other.counts)
+        self.total = total
+
+    def top(self, n: int) -> dict[str, int]:
+        return {str(k): int(v) for k, v in self.counts.nlargest(n).items()}
+
+    def to_dict(self) -> dict:
+        return {"capacity": self.capacity, "total": self.total, "counts": self.top(len(self.counts))}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "HeavyHitters":
+        sketch = cls(state["capacity"])
+        sketch.counts = pd.Series(state["counts"], dtype=np.int64)
+        sketch.total = state["total"]
+        return sketch
+
+
+class DriftProfile:
+    """
+    Mergeable summary of a stream of texts and their spam flags.
+
+    It holds a length histogram, token heavy hitters, the share of tokens
+    outside `vocabulary` (the served vectorizer's unigrams, when known) and
+    the spam rate. Memory does not grow with the number of rows, and
+    profiles of separate batches, chunks or processes combine with `merge`.
+    """
+
+    def __init__(self, vocabulary: set[str] | None = None, capacity: int = 1000):
+        self.vocabulary = vocabulary
+        self.lengths = LengthHistogram()
+        self.tokens = HeavyHitters(capacity)
+        self.oov_tokens = 0
+        self.spam = 0
+
+    @property
+    def rows(self) -> int:
+        return self.lengths.rows
+
+    def update(self, texts: pd.Series, spam=None):
+        """Adds a batch of texts and, optionally, a boolean array of which are spam."""
+        texts = pd.Series(texts, dtype=object).fillna("")
+        self.lengths.update(texts.str.len().to_numpy())
+
+        counts = texts.str.lower().str.findall(TOKEN_PATTERN).explode().dropna().value_counts()
+        self.tokens.update(counts)
+        if self.vocabulary is not None:
+            self.oov_tokens += int(counts[~counts.index.isin(self.vocabulary)].sum())
+        if spam is not None:
+            self.spam += int(np.sum(spam))
+
+    def merge(self, other: "DriftProfile"):
+        self.lengths.merge(other.lengths)
+        self.tokens.merge(other.tokens)
+        self.oov_tokens += other.oov_tokens
+        self.spam += other.spam
+
+    def oov_rate(self) -> float | None:
+        if self.vocabulary is None or not self.tokens.total:
+            return None
+        return self.oov_tokens / self.tokens.total
+
+    def spam_rate(self) -> float:
+        return self.spam / self.rows if self.rows else 0.0
+
+    def summary(self) -> dict:
+        summary = {
+            "rows": self.rows,
+            "length_mean": self.lengths.mean(),
+            "length_p50": self.lengths.quantile(0.5),
+            "length_p90": self.lengths.quantile(0.9),
+            "length_p99": self.lengths.quantile(0.99),
+            "spam_rate": self.spam_rate(),
+        }
+        if self.oov_rate() is not None:
+            summary["oov_rate"] = self.oov_rate()
+        return summary
+
+    def to_dict(self) -> dict:
+        """Serializable state; the vocabulary is stored separately (see drift.DriftMonitor)."""
+        return {
+            "lengths": self.lengths.to_dict(),
+            "tokens": self.tokens.to_dict(),
+            "oov_tokens": self.oov_tokens,
+            "spam": self.spam,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict, vocabulary: set[str] | None = None) -> "DriftProfile":
+        profile = cls(vocabulary, state["tokens"]["capacity"])
+        profile.lengths = LengthHistogram.from_dict(state["lengths"])
+        profile.tokens = HeavyHitters.from_dict(state["tokens"])
+        profile.oov_tokens = state["oov_tokens"]
+        profile.spam = state["spam"]
+        return profile
+
+
+def _normalize(counts: np.ndarray, eps: float = 1e-6) -> np.ndarray:
+    counts = np.asarray(counts, dtype=np.float64) + eps
+    return counts / counts.sum()
+
+
+def psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Population stability index between two histograms over the same bins."""
+    p, q = _normalize(expected), _normalize(actual)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def js_divergence(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Jensen-Shannon divergence (base 2, so in [0, 1]) between two histograms."""
+    p, q = _normalize(expected), _normalize(actual)
+    m = (p + q) / 2
+    return float((np.sum(p * np.log2(p / m)) + np.sum(q * np.log2(q / m))) / 2)
+
+
+def ks_statistic(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Kolmogorov-Smirnov distance between two histograms over ordered bins."""
+    p = np.cumsum(expected) / max(np.sum(expected), 1)
+    q = np.cumsum(actual) / max(np.sum(actual), 1)
+    return float(np.max(np.abs(p - q)))
+
+
+def token_histograms(baseline: HeavyHitters, current: HeavyHitters) -> tuple[np.ndarray, np.ndarray]:
+    """Aligns two heavy-hitter summaries on their union of items plus an 'other' bin for the rest."""
+    items = baseline.counts.index.union(current.counts.index)
+    expected = baseline.counts.reindex(items, fill_value=0).to_numpy(dtype=np.float64)
+    actual = current.counts.reindex(items, fill_value=0).to_numpy(dtype=np.float64)
+    expected = np.append(expected, max(baseline.total - expected.sum(), 0))
+    actual = np.append(actual, max(current.total - actual.sum(), 0))
+    return expected, actual
@@ -0,0 +1,184 @@
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from src.monitoring.drift import DriftMonitor
+from src.monitoring.sketches import DriftProfile
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# How often the background thread empties the ring buffer
+DRAIN_INTERVAL_SECONDS = 0.5
+
+
+class TrafficMonitor:
+    """
+    Off-the-hot-path drift monitoring of live API traffic.
+
+    Request threads call `record` / `record_many`. These only append
+    `(text, prediction)` tuples to a bounded `collections.deque`, which is
+    atomic under the GIL and needs no lock. When the buffer is full, the
+    oldest entries are overwritten rather than blocking a request. A daemon
+    thread drains the buffer every DRAIN_INTERVAL_SECONDS into a DriftProfile
+    and an optional reservoir sample of raw inputs. Every `flush_interval`
+    seconds it writes the window to parquet files under `output_dir`:
+    - `aggregates/`: one row per window with the profile summary, drift
+      against the serving model's baseline, and the profile state as JSON so
+      windows can be merged later
+    - `samples/`: up to `sample_size` uniformly sampled inputs with their
+      predictions, for relabeling
+    """
+
+    def __init__(self, output_dir: str, buffer_size: int, flush_interval: float, sample_size: int,
+                 heavy_hitters: int, baseline_loader: Callable[[str], DriftMonitor | None],
+                 version_fn: Callable[[], str | None]):
+        self.output_dir = output_dir.rstrip("/")
+        self.flush_interval = flush_interval
+        self.sample_size = sample_size
+        self.heavy_hitters = heavy_hitters
+        self.baseline_loader = baseline_loader
+        self.version_fn = version_fn
+
+        self._buffer = deque(maxlen=buffer_size)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._baselines: dict[str, DriftMonitor | None] = {}
+        self._rng = random.Random()
+        self._reset_window()
+
+    def record(self, text: str, prediction: str):
+        self._buffer.append((text, prediction))
+
+    def record_many(self, texts: list[str], predictions: list[str]):
+        self._buffer.extend(zip(texts, predictions))
+
+    def _reset_window(self):
+        self.window_start = datetime.now(timezone.utc)
+        self.profile: DriftProfile | None = None
+        self.sample: list[tuple[str, str]] = []
+        self.seen = 0
+        self.saturated = 0
+
+    def start(self):
+        """Starts the drain thread; call it in each serving process, after any fork."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="traffic-monitor", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Stops the drain thread and flushes what it has collected."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        next_flush = time.monotonic() + self.flush_interval
+        while not self._stop.wait(DRAIN_INTERVAL_SECONDS):
+            self._drain_safely()
+            if time.monotonic() >= next_flush:
+                self._flush_safely()
+                next_flush = time.monotonic() + self.flush_interval
+        self._drain_safely()
+        self._flush_safely()
+
+    def _drain_safely(self):
+        try:
+            self.drain()
+        except Exception as e:
+            logger.error(f"Traffic monitor drain failed: {e}")
+
+    def _flush_safely(self):
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Traffic monitor flush failed: {e}")
+
+    def _baseline(self, version: str | None) -> DriftMonitor | None:
+        if version not in self._baselines:
+            self._baselines[version] = self.baseline_loader(version) if version else None
+        return self._baselines[version]
+
+    def drain(self) -> int:
+        if len(self._buffer) == self._buffer.maxlen:
+            # Entries may have been overwritten since the last drain
+            self.saturated += 1
+
+        items = []
+        popleft = self._buffer.popleft
+        try:
+            while True:
+                items.append(popleft())
+        except IndexError:
+            pass
+        if not items:
+            return 0
+
+        if self.profile is None:
+            baseline = self._baseline(self.version_fn())
+            self.profile = baseline.new_profile() if baseline else DriftProfile(capacity=self.heavy_hitters)
+        texts, predictions = zip(*items)
+        self.profile.update(pd.Series(texts, dtype=object), np.asarray(predictions) == "spam")
+
+        # Reservoir sampling (Algorithm R): every item seen in the window is kept with equal probability
+        for item in items:
+            self.seen += 1
+            if len(self.sample) < self.sample_size:
+                self.sample.append(item)
+            elif self.sample_size:
+                j = self._rng.randrange(self.seen)
+                if j < self.sample_size:
+                    self.sample[j] = item
+        return len(items)
+
+    def flush(self):
+        if self.profile is None:
+            self._reset_window()
+            return
+
+        import fsspec
+
+        version = self.version_fn()
+        window_end = datetime.now(timezone.utc)
+        stamp = f"{window_end:%Y%m%dT%H%M%S}-{os.getpid()}"
+        fs, _ = fsspec.core.url_to_fs(self.output_dir)
+
+        row = {
+            "window_start": self.window_start,
+            "window_end": window_end,
+            "pid": os.getpid(),
+            "model_version": version,
+            "buffer_saturated": self.saturated,
+            **self.profile.summary(),
+        }
+        baseline = self._baseline(version)
+        if baseline is not None:
+            report, drifted = baseline.check(self.profile)
+            row.update({f"drift_{k}": v for k, v in report.items()})
+            row["drift_detected"] = drifted
+        row["profile"] = json.dumps(self.profile.to_dict())
+
+        fs.makedirs(f"{self.output_dir}/aggregates", exist_ok=True)
+        with fs.open(f"{self.output_dir}/aggregates/{stamp}.parquet", "wb") as f:
+            pd.DataFrame([row]).to_parquet(f, index=False)
+
+        if self.sample:
+            fs.makedirs(f"{self.output_dir}/samples", exist_ok=True)
+            sample = pd.DataFrame(self.sample, columns=["text", "prediction"])
+            sample["model_version"] = version
+            with fs.open(f"{self.output_dir}/samples/{stamp}.parquet", "wb") as f:
+                sample.to_parquet(f, index=False)
+
+        logger.info(f"Flushed traffic window of {row['rows']} requests ({len(self.sample)} sampled)")
+        self._reset_window()
@@ -0,0 +1,194 @@
+import json
+import os
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, timezone
+
+import fsspec
+import numpy as np
+import pandas as pd
+
+from src.config.settings import Settings
+from src.data.dataset_io import MANIFEST_FILE
+from src.data.normalization import normalize_series
+from src.utils.logger import get_logger
+from src.utils.metrics import stage
+
+logger = get_logger(__name__)
+
+PROGRESS_FILE = "_progress.json"
+
+_model = None
+_spam_index = None
+
+
+def _init_worker(model):
+    global _model, _spam_index
+    _model = model
+    _spam_index = list(model.classes_).index("spam")
+
+
+def _score_shard(shard: int, output_dir: str, text_column: str, start_row: int,
+                 file: str | None = None, row_group: int | None = None, frame: pd.DataFrame | None = None) -> int:
+    """
+    Scores one shard and writes it to `part-{shard}.parquet`.
+
+    The shard is either a parquet row group, read here so the data never
+    passes through the parent, or a CSV chunk the parent already read. The
+    part is written under a temporary name and then moved, so a part that
+    exists is always complete.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if frame is None:
+        with fsspec.open(file, "rb") as f:
+            frame = pq.ParquetFile(f).read_row_group(row_group).to_pandas()
+
+    texts = normalize_series(frame[text_column].fillna("").astype(str))
+    probabilities = _model.predict_proba(texts)
+    # Same decision rule as training: the most probable class
+    predictions = _model.classes_[probabilities.argmax(axis=1)]
+    proba = probabilities[:, _spam_index]
+
+    out = frame.drop(columns=[text_column])
+    out.insert(0, "row_index", np.arange(start_row, start_row + len(frame), dtype=np.int64))
+    out["prediction"] = pd.Categorical(predictions, categories=["ham", "spam"])
+    out["probability"] = proba.astype(np.float32)
+
+    fs, _ = fsspec.core.url_to_fs(output_dir)
+    part = f"{output_dir}/part-{shard:05d}.parquet"
+    with fs.open(f"{part}.tmp", "wb") as f:
+        pq.write_table(pa.Table.from_pandas(out, preserve_index=False), f, compression=Settings.PREDICTION_COMPRESSION)
+    fs.mv(f"{part}.tmp", part)
+    return len(frame)
+
+
+class BatchScoringPipeline:
+    """
+    Offline scoring of a parquet or CSV input with one registered model version.
+
+    The input is split into shards: one per parquet row group, or one per
+    `BATCH_SCORING_SHARD_ROWS` rows of CSV. Shards are scored in a process
+    pool whose workers receive the model once, at start-up. Each shard
+    becomes one `part-NNNNN.parquet` in the output directory. A part keeps
+    the input columns except the text and adds `row_index` (the row's
+    position in the input), `prediction` and float32 `probability`.
+
+    `_progress.json` in the output directory records every finished shard.
+    Re-running with the same input and model skips those shards, so an
+    interrupted job resumes where it stopped. When all shards are done, a
+    `dataset.json` manifest lists the parts, so the output can be read with
+    `read_dataset` or evaluated directly when the input had labels.
+    """
+
+    def __init__(self, input_path: str, output_dir: str, model_version: str = "Staging"):
+        self.input_path = input_path
+        self.output_dir = output_dir.rstrip("/")
+        self.model_version = str(model_version)
+        self.fs, _ = fsspec.core.url_to_fs(self.output_dir)
+        self.progress_path = f"{self.output_dir}/{PROGRESS_FILE}"
+
+    def load_model(self):
+        from src.registry.cache import load_sklearn_model
+
+        logger.info(f"Loading model {Settings.MODEL_NAME} v{self.model_version}...")
+        return load_sklearn_model(self.model_version)
+
+    def load_progress(self) -> dict:
+        if not self.fs.exists(self.progress_path):
+            return {"input_path": self.input_path, "model_version": self.model_version, "shards": {}}
+
+        with self.fs.open(self.progress_path, "r") as f:
+            progress = json.load(f)
+        if (progress["input_path"], progress["model_version"]) != (self.input_path, self.model_version):
+            raise ValueError(
+                f"{self.output_dir} holds a job for {progress['input_path']} with model "
+                f"{progress['model_version']}. Use another output directory."
+            )
+        return progress
+
+    def _save_progress(self, progress: dict):
+        tmp_path = f"{self.progress_path}.tmp"
+        with self.fs.open(tmp_path, "w") as f:
+            json.dump(progress, f, indent=2)
+        self.fs.mv(tmp_path, self.progress_path)
+
+    def parquet_shards(self):
+        """Yields `(shard, start_row, kwargs)` with one shard per parquet row group."""
+        import pyarrow.parquet as pq
+
+        from src.data.dataset_io import dataset_files
+
+        shard, start_row = 0, 0
+        for file in dataset_files(self.input_path):
+            with fsspec.open(file, "rb") as f:
+                metadata = pq.ParquetFile(f).metadata
+            for row_group in range(metadata.num_row_groups):
+                yield shard, start_row, {"file": file, "row_group": row_group}
+                shard += 1
+                start_row += metadata.row_group(row_group).num_rows
+
+    def csv_shards(self):
+        """Yields `(shard, start_row, kwargs)` with one shard per CSV chunk."""
+        start_row = 0
+        chunks = pd.read_csv(self.input_path, encoding="latin-1", chunksize=Settings.BATCH_SCORING_SHARD_ROWS)
+        for shard, chunk in enumerate(chunks):
+            yield shard, start_row, {"frame": chunk}
+            start_row += len(chunk)
+
+    def run(self) -> str:
+        if self.model_version == "Staging":
+            from src.registry.cache import resolve_stage
+
+            # Pin the version so a resumed job never mixes two models
+            self.model_version = resolve_stage("Staging")
+
+        self.fs.makedirs(self.output_dir, exist_ok=True)
+        progress = self.load_progress()
+        done = {int(shard) for shard in progress["shards"]}
+
+        is_csv = self.input_path.endswith((".csv", ".csv.gz"))
+        shards = self.csv_shards() if is_csv else self.parquet_shards()
+        text_column = Settings.BATCH_SCORING_TEXT_COLUMN
+        workers = Settings.BATCH_SCORING_N_JOBS or os.cpu_count()
+        if done:
+            logger.info(f"Resuming: {len(done)} shards already scored")
+
+        with stage("load_model"):
+            model = self.load_model()
+        total = len(done)
+        with stage("score"), ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model,)) as pool:
+            pending = {}
+            for shard, start_row, kwargs in shards:
+                if shard in done:
+                    continue
+                future = pool.submit(_score_shard, shard, self.output_dir, text_column, start_row, **kwargs)
+                pending[future] = shard
+                # Bound the shards held in memory (CSV chunks travel with the task)
+                if len(pending) >= 2 * workers:
+                    total += self._collect(pending, progress, FIRST_COMPLETED)
+            total += self._collect(pending, progress)
+
+        parts = [f"{self.output_dir}/part-{int(shard):05d}.parquet" for shard in sorted(progress["shards"], key=int)]
+        rows = sum(progress["shards"].values())
+        manifest_path = f"{self.output_dir}/{MANIFEST_FILE}"
+        with self.fs.open(manifest_path, "w") as f:
+            json.dump({
+                "version": self.model_version,
+                "parent": self.input_path,
+                "parts": parts,
+                "rows": rows,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            }, f, indent=2)
+
+        logger.info(f"Scored {rows} rows in {total} shards. Output: {manifest_path}")
+        return manifest_path
+
+    def _collect(self, pending: dict, progress: dict, return_when: str = ALL_COMPLETED) -> int:
+        """Waits for scored shards, records them in the progress file and returns how many finished."""
+        finished, _ = wait(pending, return_when=return_when)
+        for future in finished:
+            shard = pending.pop(future)
+            progress["shards"][str(shard)] = future.result()
+        self._save_progress(progress)
+        return len(finished)
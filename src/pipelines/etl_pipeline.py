@@ -1,12 +1,24 @@
 import pandas as pd
-import mlflow
+import uuid
+from contextlib import nullcontext
 from pathlib import Path
-from src.data.data_versioning import DataVersioner
+from typing import Iterator
+from src.data.data_versioning import DataVersioner, DatasetFingerprint
+from src.data.hash_index import HashIndex
+from src.data.minhash import NearDuplicateFilter
+from src.data.normalization import normalize_series
+from src.monitoring.drift import DataDriftMonitor, DriftMonitor
+from src.monitoring.sketches import DriftProfile
 from src.config.settings import Settings
 from src.utils.logger import get_logger
+from src.utils.metrics import stage, timed_iter
+from src.utils.mlflow_manager import MLflowManager
 
 logger = get_logger(__name__)
 
+REQUIRED_COLUMNS = ['label', 'text']
+VALID_LABELS = {'ham', 'spam'}
+
 class ETLPipeline:
     def extract(self) -> pd.DataFrame:
         """extracts data from the source S3 bucket."""
@@ -20,63 +32,101 @@ class ETLPipeline:
             logger.error(f"Failed to extract data: {e}")
             raise
 
-    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Cleans and transforms the raw data."""
-        logger.info("Transforming data...")
-        
+    def extract_chunks(self, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """Streams the source CSV in chunks of `chunk_size` rows."""
+        logger.info(f"Streaming data from {Settings.RAW_DATA_PATH} in chunks of {chunk_size} rows")
+        return pd.read_csv(Settings.RAW_DATA_PATH, encoding='latin-1', chunksize=chunk_size)
+
+    @staticmethod
+    def _select_columns(df: pd.DataFrame) -> pd.DataFrame:
         # Standardize column names
         df = df.rename(columns={'v1': 'label', 'v2': 'text'})
-        
+
         # Check required columns
-        required_cols = ['label', 'text']
-        if not all(col in df.columns for col in required_cols):
-            missing = [c for c in required_cols if c not in df.columns]
+        if not all(col in df.columns for col in REQUIRED_COLUMNS):
+            missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
             raise ValueError(f"Data missing required columns: {missing}. Available: {df.columns}")
 
+        return df[REQUIRED_COLUMNS]
+
+    @staticmethod
+    def _normalize_and_validate(df: pd.DataFrame) -> pd.DataFrame:
+        # Text normalization
+        df['text'] = normalize_series(df['text'])
+
+        # Validate labels
+        invalid_mask = ~df['label'].isin(VALID_LABELS)
+        if invalid_mask.any():
+            logger.warning(f"Found {invalid_mask.sum()} rows with invalid labels. Dropping them.")
+            df = df[~invalid_mask]
+        return df
+
+    @staticmethod
+    def near_duplicate_filter() -> NearDuplicateFilter | None:
+        """A filter for one ETL run, or None when ETL_NEAR_DUPLICATE_THRESHOLD is 0."""
+        if Settings.ETL_NEAR_DUPLICATE_THRESHOLD <= 0:
+            return None
+        return NearDuplicateFilter(
+            threshold=Settings.ETL_NEAR_DUPLICATE_THRESHOLD,
+            num_perm=Settings.MINHASH_NUM_PERM,
+            shingle_size=Settings.MINHASH_SHINGLE_SIZE,
+            n_jobs=Settings.ETL_NEAR_DUPLICATE_N_JOBS,
+        )
+
+    @staticmethod
+    def _drop_near_duplicates(df: pd.DataFrame, near_duplicates: NearDuplicateFilter) -> pd.DataFrame:
+        # Only rows of the same label collapse; a near-duplicate with the other label is kept for training
+        return df[near_duplicates.filter(df['text'].tolist(), (df['label'] == 'spam').to_numpy())]
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Cleans and transforms the raw data."""
+        logger.info("Transforming data...")
+
         # Basic Cleaning
-        df = df[required_cols]
-        
+        df = self._select_columns(df)
+
         initial_count = len(df)
         df = df.dropna().drop_duplicates()
         dropped_count = initial_count - len(df)
         if dropped_count > 0:
             logger.info(f"Dropped {dropped_count} rows (duplicates/NaNs).")
 
-        # Text normalization
-        df['text'] = df['text'].astype(str).str.lower().str.strip()
-        
-        # Validate labels
-        valid_labels = {'ham', 'spam'}
-        invalid_mask = ~df['label'].isin(valid_labels)
-        if invalid_mask.any():
-            logger.warning(f"Found {invalid_mask.sum()} rows with invalid labels. Dropping them.")
-            df = df[~invalid_mask]
-        
+        df = self._normalize_and_validate(df)
+
+        near_duplicates = self.near_duplicate_filter()
+        if near_duplicates is not None:
+            with near_duplicates:
+                initial_count = len(df)
+                df = self._drop_near_duplicates(df, near_duplicates)
+            logger.info(f"Dropped {initial_count - len(df)} near-duplicate rows (Jaccard >= {near_duplicates.index.threshold}).")
+
         logger.info(f"Transformed data shape: {df.shape}")
         return df
 
     def load(self, df: pd.DataFrame) -> str:
         """Loads processed data to the destination S3 bucket (or path)."""
-        dataset_hash = DataVersioner.compute_hash(df)
-        
+        with stage("hash"):
+            dataset_hash = DataVersioner.compute_hash(df)
+
         # Construct output path with versioning
         base_path = Settings.PROCESSED_DATA_BUCKET.rstrip('/')
         output_dir = f"{base_path}/{dataset_hash}"
         output_path = f"{output_dir}/data.parquet"
-        
+
         logger.info(f"Loading data to {output_path}")
         try:
             # Ensure directory exists if it's local (not s3://)
             if not output_path.startswith("s3://"):
                 Path(output_dir).mkdir(parents=True, exist_ok=True)
 
-            df.to_parquet(output_path, index=False)
-            
+            with stage("load"):
+                df.to_parquet(output_path, index=False)
+
             # Log to MLflow
-            mlflow.log_param("dataset_version", dataset_hash)
-            mlflow.log_param("processed_rows", len(df))
-            mlflow.log_param("output_path", output_path)
-            
+            MLflowManager.log_param("dataset_version", dataset_hash)
+            MLflowManager.log_param("processed_rows", len(df))
+            MLflowManager.log_param("output_path", output_path)
+
             return output_path
         except Exception as e:
             logger.error(f"Failed to load data: {e}")
@@ -85,21 +135,152 @@ class ETLPipeline:
     def run(self) -> str:
         """Orchestrates the ETL pipeline."""
         logger.info("Starting ETL Pipeline")
-        df = self.extract()
-        df = self.transform(df)
+        with stage("extract"):
+            df = self.extract()
+        with stage("transform"):
+            df = self.transform(df)
 
-        # Monitoring: Check for text length drift
-        from src.monitoring.drift import DataDriftMonitor
-        # Baseline: 80 characters (arbitrary for ham/spam dataset)
-        monitor = DataDriftMonitor(baseline_mean=80.0)
-        has_drift = monitor.check_text_length_drift(df['text'].tolist())
-        
-        mlflow.log_metric("text_length_drift_detected", int(has_drift))
+        # Monitoring: Check for drift against the training baseline
+        monitor = DriftMonitor.from_registry()
+        profile = self.new_drift_profile(monitor)
+        with stage("drift"):
+            profile.update(df['text'], df['label'] == 'spam')
+        self.log_drift(profile, monitor)
 
         output_path = self.load(df)
         logger.info(f"ETL Pipeline completed. Output: {output_path}")
         return output_path
 
+    @staticmethod
+    def new_drift_profile(monitor: DriftMonitor | None) -> DriftProfile:
+        if monitor is not None:
+            return monitor.new_profile()
+        return DriftProfile(capacity=Settings.DRIFT_HEAVY_HITTERS)
+
+    @staticmethod
+    def log_drift(profile: DriftProfile, monitor: DriftMonitor | None):
+        """Logs the profile summary and, when a training baseline exists, the drift checks against it."""
+        MLflowManager.log_metrics({f"data_{k}": v for k, v in profile.summary().items()})
+
+        if monitor is None:
+            return
+        # Mean-length check against the training baseline's mean
+        has_drift = DataDriftMonitor(baseline_mean=monitor.baseline.lengths.mean()).check_mean_length(profile.lengths.mean())
+        MLflowManager.log_metric("text_length_drift_detected", int(has_drift))
+        report, drifted = monitor.check(profile)
+        MLflowManager.log_metrics({f"drift_{k}": v for k, v in report.items()})
+        MLflowManager.log_metric("drift_detected", int(drifted))
+
+    def write_clean_chunks(self, chunks, seen: HashIndex, fs, path: str, row_group_size: int,
+                           profile: DriftProfile | None = None) -> dict:
+        """
+        Cleans raw chunks and streams the new, unseen rows to one parquet file.
+
+        Rows already in `seen` are dropped and the written rows are added to it.
+        With ETL_NEAR_DUPLICATE_THRESHOLD set, near-duplicates of rows written
+        earlier in this call are dropped too. Written rows are also added to
+        `profile`, if given.
+        Returns row counts and a fingerprint of the written rows.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([('label', pa.string()), ('text', pa.string())])
+        fingerprint = DatasetFingerprint()
+        raw_rows, rows, near_duplicate_rows = 0, 0, 0
+        pending, pending_rows = [], 0
+        near_duplicates = self.near_duplicate_filter()
+
+        with fs.open(path, 'wb') as sink, pq.ParquetWriter(sink, schema) as writer, near_duplicates or nullcontext():
+            for chunk in timed_iter(chunks, "extract"):
+                raw_rows += len(chunk)
+                with stage("transform"):
+                    chunk = self._select_columns(chunk).dropna()
+                    chunk = chunk[seen.filter_new(HashIndex.row_hashes(chunk))]
+                    chunk = self._normalize_and_validate(chunk)
+                if near_duplicates is not None and not chunk.empty:
+                    with stage("near_duplicates"):
+                        kept = self._drop_near_duplicates(chunk, near_duplicates)
+                    near_duplicate_rows += len(chunk) - len(kept)
+                    chunk = kept
+                if chunk.empty:
+                    continue
+
+                with stage("hash"):
+                    fingerprint.update(chunk)
+                if profile is not None:
+                    with stage("drift"):
+                        profile.update(chunk['text'], chunk['label'] == 'spam')
+                rows += len(chunk)
+
+                pending.append(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                pending_rows += len(chunk)
+                if pending_rows >= row_group_size:
+                    # Write whole row groups only; carry the remainder into the next one
+                    table = pa.concat_tables(pending)
+                    full_rows = pending_rows - pending_rows % row_group_size
+                    with stage("load"):
+                        writer.write_table(table.slice(0, full_rows), row_group_size=row_group_size)
+                    pending, pending_rows = [table.slice(full_rows)], pending_rows - full_rows
+
+            if pending_rows:
+                with stage("load"):
+                    writer.write_table(pa.concat_tables(pending), row_group_size=row_group_size)
+
+        logger.info(f"Processed {raw_rows} raw rows into {rows} rows ({raw_rows - rows} dropped, {near_duplicate_rows} as near-duplicates).")
+        return {
+            "raw_rows": raw_rows,
+            "rows": rows,
+            "near_duplicate_rows": near_duplicate_rows,
+            "fingerprint": fingerprint,
+        }
+
+    def run_streaming(self, chunk_size: int | None = None, row_group_size: int | None = None) -> str:
+        """
+        Chunked variant of `run` for raw data larger than memory.
+
+        Applies the same cleaning per chunk, deduplicates across chunks with a
+        HashIndex of raw row hashes, and streams row groups to a parquet writer,
+        so peak memory is bounded by the chunk and row group sizes.
+        """
+        import fsspec
+
+        chunk_size = chunk_size or Settings.ETL_CHUNK_SIZE
+        row_group_size = row_group_size or Settings.PARQUET_ROW_GROUP_SIZE
+        logger.info("Starting streaming ETL Pipeline")
+
+        base_path = Settings.PROCESSED_DATA_BUCKET.rstrip('/')
+        fs, _ = fsspec.core.url_to_fs(base_path)
+        tmp_dir = f"{base_path}/_tmp/{uuid.uuid4().hex}"
+        tmp_path = f"{tmp_dir}/data.parquet"
+        fs.makedirs(tmp_dir, exist_ok=True)
+
+        monitor = DriftMonitor.from_registry()
+        profile = self.new_drift_profile(monitor)
+        stats = self.write_clean_chunks(
+            self.extract_chunks(chunk_size), HashIndex(), fs, tmp_path, row_group_size, profile
+        )
+        rows = stats["rows"]
+        self.log_drift(profile, monitor)
+
+        # Same fingerprint DataVersioner.compute_hash gives the in-memory ETL
+        dataset_hash = stats["fingerprint"].hexdigest()
+        output_dir = f"{base_path}/{dataset_hash}"
+        output_path = f"{output_dir}/data.parquet"
+        fs.makedirs(output_dir, exist_ok=True)
+        fs.mv(tmp_path, output_path)
+        try:
+            fs.rm(tmp_dir, recursive=True)
+        except FileNotFoundError:
+            pass  # Object stores have no empty directories to remove
+
+        MLflowManager.log_param("dataset_version", dataset_hash)
+        MLflowManager.log_param("processed_rows", rows)
+        MLflowManager.log_param("output_path", output_path)
+
+        logger.info(f"Streaming ETL Pipeline completed. Output: {output_path}")
+        return output_path
+
 if __name__ == "__main__":
     pipeline = ETLPipeline()
     pipeline.run()
@@ -1,19 +1,38 @@
-from sklearn.metrics import f1_score
 from src.config.settings import Settings
+from src.evaluation.engine import EvaluationEngine
 from src.registry.model_registry import ModelPromoter
 from src.utils.logger import get_logger
+from src.utils.metrics import stage
 
 logger = get_logger(__name__)
 
 class EvaluationPipeline:
     def __init__(self):
         self.promoter = ModelPromoter()
+        self.engine = EvaluationEngine(
+            n_bootstrap=Settings.EVALUATION_BOOTSTRAP_SAMPLES,
+            confidence=Settings.EVALUATION_CONFIDENCE,
+            n_jobs=Settings.EVALUATION_N_JOBS,
+            batch_rows=Settings.EVALUATION_BATCH_ROWS,
+            random_state=Settings.RANDOM_STATE,
+        )
 
-    def evaluate_and_promote(self, y_true, y_pred):
-        f1 = f1_score(y_true, y_pred, pos_label='spam')
+    def evaluate_and_promote(self, predictions_path: str) -> dict:
+        with stage("evaluate"):
+            report = self.engine.evaluate(predictions_path)
+        f1 = report["overall"]["f1"]
         logger.info(f"Evaluation F1 score: {f1}")
+        if "text_length" not in report["slices"]:
+            logger.warning(f"{predictions_path} has neither a text nor a text_length_bucket column; no per-length slices reported")
 
-        self.promoter.promote_if_valid(f1)
+        score = f1
+        interval = report["confidence_intervals"].get("f1")
+        if interval:
+            logger.info(f"F1 {report['confidence']:.0%} CI: [{interval['lower']:.4f}, {interval['upper']:.4f}]")
+            if Settings.PROMOTE_ON_F1_LOWER_BOUND:
+                score = interval["lower"]
+
+        self.promoter.promote_if_valid(score)
         logger.info("Model promoted to STAGING")
 
-        return f1
+        return report
@@ -0,0 +1,247 @@
+import csv
+import hashlib
+import io
+import json
+import uuid
+from datetime import datetime, timezone
+
+import fsspec
+import pandas as pd
+
+from src.config.settings import Settings
+from src.data.data_versioning import DatasetFingerprint
+from src.data.dataset_io import MANIFEST_FILE
+from src.data.hash_index import HashIndex
+from src.pipelines.etl_pipeline import ETLPipeline
+from src.utils.logger import get_logger
+from src.utils.mlflow_manager import MLflowManager
+
+logger = get_logger(__name__)
+
+# Bytes before the last ingested offset used to check a source was appended to, not rewritten
+TAIL_BYTES = 64 * 1024
+
+
+class _BoundedReader(io.RawIOBase):
+    """Reads at most `limit` bytes, so rows appended mid-run wait for the next run."""
+
+    def __init__(self, f, limit: int):
+        self.f = f
+        self.remaining = limit
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self.remaining <= 0:
+            return 0
+        data = self.f.read(min(len(buffer), self.remaining))
+        buffer[:len(data)] = data
+        self.remaining -= len(data)
+        return len(data)
+
+
+class IncrementalETLPipeline(ETLPipeline):
+    """
+    ETL that only processes raw rows appended since the previous run.
+
+    `{PROCESSED_DATA_BUCKET}/_incremental/state.json` records, per source
+    file, the byte offset already ingested and a hash of the bytes just
+    before it. It also records the latest dataset version and the persisted
+    hash index of every row seen so far. A run cleans the new rows, drops
+    any already in the index, and writes them as one delta part under
+    `parts/`. The new version is a `dataset.json` manifest listing the
+    previous version's parts plus the delta, so existing data is never
+    rewritten. Its id merges the delta's fingerprint into the persisted
+    fingerprint, which matches what a full ETL of the same rows produces.
+    """
+
+    def __init__(self):
+        self.base_path = Settings.PROCESSED_DATA_BUCKET.rstrip('/')
+        self.state_dir = f"{self.base_path}/_incremental"
+        self.state_path = f"{self.state_dir}/state.json"
+        self.fs, _ = fsspec.core.url_to_fs(self.base_path)
+
+    def load_state(self) -> dict:
+        if not self.fs.exists(self.state_path):
+            return {
+                "sources": {},
+                "latest_version": None,
+                "parts": [],
+                "rows": 0,
+                "fingerprint": DatasetFingerprint().state(),
+                "hash_index_path": None,
+            }
+        with self.fs.open(self.state_path, 'r') as f:
+            return json.load(f)
+
+    def load_hash_index(self, state: dict) -> HashIndex:
+        if not state["hash_index_path"]:
+            return HashIndex()
+        with self.fs.open(state["hash_index_path"], 'rb') as f:
+            return HashIndex.load(f)
+
+    @staticmethod
+    def source_paths() -> list[str]:
+        raw_path = Settings.RAW_DATA_PATH
+        if "*" not in raw_path:
+            return [raw_path]
+        fs, _ = fsspec.core.url_to_fs(raw_path)
+        protocol = raw_path.split("://", 1)[0] + "://" if "://" in raw_path else ""
+        return sorted(f"{protocol}{p}" for p in fs.glob(raw_path))
+
+    @staticmethod
+    def _tail_hash(f, offset: int) -> str:
+        start = max(0, offset - TAIL_BYTES)
+        f.seek(start)
+        return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+    @staticmethod
+    def _complete_end(f, offset: int, size: int) -> int:
+        """
+        Position just after the last complete CSV record in `[offset, size)`,
+        or `offset` if there is none. A quoted field can span lines, so the
+        records are parsed rather than cut at the last newline.
+        """
+        f.seek(offset)
+        # latin-1 maps each byte to one character, so line lengths are byte counts
+        lines = io.TextIOWrapper(
+            io.BufferedReader(_BoundedReader(f, size - offset)), encoding='latin-1', newline=''
+        )
+        position, line_ended, exhausted = offset, False, False
+
+        def tracked():
+            nonlocal position, line_ended, exhausted
+            for line in lines:
+                position += len(line)
+                line_ended = line.endswith(("\n", "\r"))
+                yield line
+            exhausted = True
+
+        end = offset
+        # The reader yields a record as soon as the line that closes it is read;
+        # one yielded at end of input is still being written
+        for _ in csv.reader(tracked()):
+            if not exhausted and line_ended:
+                end = position
+        return end
+
+    def extract_new_chunks(self, sources: dict, chunk_size: int):
+        """
+        Yields raw chunks of rows appended to each source since its recorded offset.
+
+        Reading stops after the last complete record. A row the producer is
+        still writing, including a quoted text with line breaks in it, is
+        left for the next run, which reads it whole.
+        """
+        for path in self.source_paths():
+            fs, _ = fsspec.core.url_to_fs(path)
+            size = fs.size(path)
+            known = sources.get(path)
+
+            with fs.open(path, 'rb') as f:
+                if known is None:
+                    header_line = f.readline()
+                    header = list(pd.read_csv(io.BytesIO(header_line), encoding='latin-1', nrows=0).columns)
+                    offset = len(header_line)
+                else:
+                    header, offset = known["header"], known["offset"]
+                    if size < offset or self._tail_hash(f, offset) != known["tail_sha256"]:
+                        raise ValueError(f"{path} was rewritten since the last incremental run. Run a full ETL.")
+
+                end = self._complete_end(f, offset, size)
+                if end < size:
+                    logger.info(f"Leaving {size - end} bytes of an incomplete last record in {path} for the next run")
+                if end > offset:
+                    logger.info(f"Reading {end - offset} new bytes from {path}")
+                    f.seek(offset)
+                    reader = io.BufferedReader(_BoundedReader(f, end - offset))
+                    yield from pd.read_csv(
+                        reader, encoding='latin-1', header=None, names=header, chunksize=chunk_size
+                    )
+
+                sources[path] = {"header": header, "offset": end, "tail_sha256": self._tail_hash(f, end)}
+
+    def run(self) -> str:
+        from src.monitoring.drift import DriftMonitor
+
+        logger.info("Starting incremental ETL Pipeline")
+        state = self.load_state()
+        seen = self.load_hash_index(state)
+
+        self.fs.makedirs(f"{self.base_path}/parts", exist_ok=True)
+        self.fs.makedirs(self.state_dir, exist_ok=True)
+        tmp_path = f"{self.base_path}/parts/_tmp-{uuid.uuid4().hex}.parquet"
+        monitor = DriftMonitor.from_registry()
+        profile = self.new_drift_profile(monitor)
+        stats = self.write_clean_chunks(
+            self.extract_new_chunks(state["sources"], Settings.ETL_CHUNK_SIZE or 100_000),
+            seen,
+            self.fs,
+            tmp_path,
+            Settings.PARQUET_ROW_GROUP_SIZE,
+            profile,
+        )
+
+        parent = state["latest_version"]
+        if stats["rows"] == 0:
+            self.fs.rm(tmp_path)
+            self._save_state(state)
+            logger.info("No new rows since the last run.")
+            if parent is None:
+                raise ValueError("No rows have been ingested yet.")
+            return f"{self.base_path}/{parent}/{MANIFEST_FILE}"
+
+        # Only the delta is checked: that is the traffic that changed since the last run
+        self.log_drift(profile, monitor)
+
+        part_path = f"{self.base_path}/parts/{stats['fingerprint'].hexdigest()}.parquet"
+        self.fs.mv(tmp_path, part_path)
+
+        fingerprint = DatasetFingerprint.from_state(state["fingerprint"]).merge(stats["fingerprint"])
+        version = fingerprint.hexdigest()
+        parts = state["parts"] + [part_path]
+        rows = state["rows"] + stats["rows"]
+        manifest_path = f"{self.base_path}/{version}/{MANIFEST_FILE}"
+        self.fs.makedirs(f"{self.base_path}/{version}", exist_ok=True)
+        with self.fs.open(manifest_path, 'w') as f:
+            json.dump({
+                "version": version,
+                "parent": parent,
+                "parts": parts,
+                "rows": rows,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            }, f, indent=2)
+
+        # The index is stored per version and state.json is written last, so a
+        # failed run never records rows as seen without also recording their part
+        previous_index = state["hash_index_path"]
+        index_path = f"{self.state_dir}/hash_index-{version}.npy"
+        with self.fs.open(index_path, 'wb') as f:
+            seen.save(f)
+
+        state.update(
+            latest_version=version,
+            parts=parts,
+            rows=rows,
+            fingerprint=fingerprint.state(),
+            hash_index_path=index_path,
+        )
+        self._save_state(state)
+        if previous_index:
+            self.fs.rm(previous_index)
+
+        MLflowManager.log_param("dataset_version", version)
+        MLflowManager.log_param("parent_dataset_version", parent)
+        MLflowManager.log_param("processed_rows", rows)
+        MLflowManager.log_param("delta_rows", stats["rows"])
+        MLflowManager.log_param("output_path", manifest_path)
+
+        logger.info(f"Incremental ETL added {stats['rows']} rows. Output: {manifest_path}")
+        return manifest_path
+
+    def _save_state(self, state: dict):
+        tmp_path = f"{self.state_path}.tmp"
+        with self.fs.open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        self.fs.mv(tmp_path, self.state_path)
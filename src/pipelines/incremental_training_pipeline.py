@@ -0,0 +1,130 @@
+import numpy as np
+import mlflow
+import mlflow.sklearn
+from mlflow.models.signature import infer_signature
+
+from src.data.dataset_io import iter_dataset_batches, predictions_path
+from src.data.prediction_io import PredictionWriter
+from src.models.pipeline import SpamHamPipeline
+from src.monitoring.drift import DriftMonitor
+from src.monitoring.sketches import DriftProfile
+from src.registry.cache import load_sklearn_model, registry
+from src.config.settings import Settings
+from src.utils.metrics import stage, timed_iter
+from src.utils.logger import get_logger
+from src.utils.mlflow_manager import MLflowManager
+
+logger = get_logger(__name__)
+
+CLASSES = np.array(["ham", "spam"])
+
+
+def f1_from_counts(tp: int, fp: int, fn: int) -> float:
+    return 2 * tp / (2 * tp + fp + fn) if tp else 0.0
+
+
+class IncrementalTrainingPipeline:
+    """
+    Out-of-core alternative to TrainingPipeline.
+
+    Streams the dataset by row-group batches through a stateless
+    HashingVectorizer into an SGDClassifier's `partial_fit`, so memory is
+    bounded by the batch size rather than the corpus. When warm starting, it
+    continues from the current Staging model if that model is a compatible
+    hashing pipeline.
+    """
+
+    def load_warm_start(self):
+        if not Settings.TRAINING_WARM_START:
+            return None, None
+
+        try:
+            staging = registry().latest_version("Staging")
+        except Exception as e:
+            logger.warning(f"Could not query the registry for a warm start: {e}")
+            return None, None
+        if staging is None:
+            return None, None
+
+        version = staging["version"]
+        model = load_sklearn_model(version)
+        hashing = getattr(model, "named_steps", {}).get("hashing")
+        if hashing is None or hashing.n_features != Settings.HASHING_N_FEATURES:
+            logger.info(f"Staging version {version} is not a compatible hashing pipeline. Training from scratch.")
+            return None, None
+
+        logger.info(f"Warm starting from Staging version {version}")
+        return model, version
+
+    def run(self, data_path: str) -> tuple[float, str]:
+        pipeline, warm_start_version = self.load_warm_start()
+        if pipeline is None:
+            pipeline = SpamHamPipeline.build_incremental(Settings.RANDOM_STATE, Settings.HASHING_N_FEATURES)
+        vectorizer = pipeline.named_steps["hashing"]
+        classifier = pipeline.named_steps["classifier"]
+
+        columns = ["label", "text"]
+        batch_rows = Settings.TRAINING_BATCH_ROWS
+        input_example = None
+
+        for epoch in range(Settings.TRAINING_EPOCHS):
+            rows = 0
+            for batch in timed_iter(iter_dataset_batches(data_path, batch_rows, columns=columns), "extract"):
+                with stage("fit"):
+                    classifier.partial_fit(vectorizer.transform(batch["text"]), batch["label"], classes=CLASSES)
+                rows += len(batch)
+                if input_example is None:
+                    input_example = batch[["text"]].iloc[:5]
+            logger.info(f"Epoch {epoch + 1}/{Settings.TRAINING_EPOCHS}: trained on {rows} rows")
+
+        # Second pass: stream predictions to disk and accumulate F1 counts
+        output_path = predictions_path(data_path)
+        tp = fp = fn = 0
+        profile = DriftProfile(capacity=Settings.DRIFT_HEAVY_HITTERS)
+        with PredictionWriter(
+            output_path,
+            mode=Settings.PREDICTION_OUTPUT_MODE,
+            compression=Settings.PREDICTION_COMPRESSION,
+            row_group_size=Settings.PREDICTION_ROW_GROUP_SIZE,
+        ) as writer:
+            for batch in timed_iter(iter_dataset_batches(data_path, batch_rows, columns=columns), "extract"):
+                with stage("predict"):
+                    features = vectorizer.transform(batch["text"])
+                    preds = classifier.predict(features)
+                    proba = classifier.predict_proba(features)[:, 1]
+                is_spam, predicted_spam = batch["label"].to_numpy() == "spam", preds == "spam"
+                tp += int(np.sum(is_spam & predicted_spam))
+                fp += int(np.sum(~is_spam & predicted_spam))
+                fn += int(np.sum(is_spam & ~predicted_spam))
+                with stage("load"):
+                    writer.write(batch, preds, proba)
+                with stage("drift"):
+                    profile.update(batch["text"], predicted_spam)
+
+        if input_example is None:
+            raise ValueError(f"No rows found in {data_path}")
+
+        f1 = f1_from_counts(tp, fp, fn)
+
+        signature = infer_signature(
+            model_input=input_example,
+            model_output=pipeline.predict(input_example["text"])
+        )
+
+        DriftMonitor.log_baseline(profile)
+        MLflowManager.log_metric("f1_score", f1)
+        MLflowManager.log_param("model_type", "hashing_sgd")
+        MLflowManager.log_param("hashing_n_features", Settings.HASHING_N_FEATURES)
+        MLflowManager.log_param("warm_start_version", warm_start_version)
+        MLflowManager.log_param("predictions_output_path", output_path)
+
+        with stage("log_model"):
+            mlflow.sklearn.log_model(
+                sk_model=pipeline,
+                artifact_path="model",
+                registered_model_name=Settings.MODEL_NAME,
+                signature=signature,
+                input_example=input_example
+            )
+
+        return f1, output_path
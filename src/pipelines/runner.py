@@ -0,0 +1,170 @@
+import hashlib
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from typing import Callable
+
+from src.config.settings import Settings
+from src.utils.git import get_git_commit, get_git_diff_hash
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    One step of a pipeline.
+
+    `target` is a module-level function returning a JSON-serializable dict
+    of outputs. It is called with keyword arguments taken from upstream
+    outputs, as `inputs` maps them: argument -> (stage, output key).
+    `settings` lists the Settings fields (names or prefixes) its result
+    depends on. `fingerprint_inputs` returns anything else it depends on,
+    such as the hash of the files it reads. `paths` names outputs that
+    must still exist for a recorded result to be reused.
+    """
+    name: str
+    target: Callable[..., dict]
+    inputs: dict[str, tuple[str, str]] = field(default_factory=dict)
+    settings: tuple[str, ...] = ()
+    fingerprint_inputs: Callable[[], dict] | None = None
+    paths: tuple[str, ...] = ()
+
+    @property
+    def needs(self) -> set[str]:
+        return {upstream for upstream, _ in self.inputs.values()}
+
+
+def code_version() -> str | None:
+    """The checked-out commit plus a hash of uncommitted changes; None outside git."""
+    commit = get_git_commit()
+    if commit == "unknown":
+        return None
+    diff = get_git_diff_hash()
+    return f"{commit}+{diff}" if diff else commit
+
+
+def settings_subset(prefixes: tuple[str, ...]) -> dict:
+    return {f.name: getattr(Settings, f.name) for f in fields(Settings) if f.name.startswith(prefixes)}
+
+
+class PipelineRunner:
+    """
+    Runs stages in dependency order and reuses results whose inputs are unchanged.
+
+    A stage's fingerprint hashes its name, the code version, its settings,
+    its fingerprint inputs and the outputs of the stages it reads from.
+    Each completed stage is recorded under
+    `{state_dir}/{stage}/{fingerprint}.json`. On the next run a stage with
+    a recorded fingerprint is skipped and its recorded outputs passed on.
+    Dataset versions are content-addressed, so when a stage reruns and
+    produces the same dataset, stages downstream of it are still reused.
+    Nothing is reused outside a git checkout, where code changes cannot
+    be detected.
+
+    Stages whose upstreams are done run concurrently, up to `max_workers`,
+    each in its own spawned process with its own MLflow run and stage
+    timings.
+    """
+
+    def __init__(self, stages: list[Stage], state_dir: str, max_workers: int = 2, force: set[str] | None = None):
+        names = [s.name for s in stages]
+        for stage in stages:
+            unknown = stage.needs - set(names[:names.index(stage.name)])
+            if unknown:
+                raise ValueError(f"Stage {stage.name} reads from {sorted(unknown)}, which do not run before it")
+        self.stages = stages
+        self.state_dir = state_dir.rstrip("/")
+        self.max_workers = max_workers
+        self.force = force or set()
+        self.code_version = code_version()
+        if self.code_version is None:
+            logger.warning("No git commit found; every stage will run")
+
+    def fingerprint(self, stage: Stage, upstream: dict[str, dict]) -> str:
+        payload = {
+            "stage": stage.name,
+            "code": self.code_version,
+            "settings": settings_subset(stage.settings),
+            "inputs": stage.fingerprint_inputs() if stage.fingerprint_inputs else {},
+            "upstream": {name: upstream[name]["outputs"] for name in sorted(stage.needs)},
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:24]
+
+    def _record_path(self, stage: Stage, fingerprint: str) -> str:
+        return f"{self.state_dir}/{stage.name}/{fingerprint}.json"
+
+    def recorded(self, stage: Stage, fingerprint: str) -> dict | None:
+        """The recorded result for `fingerprint`, if its output paths still exist."""
+        import fsspec
+
+        if self.code_version is None or stage.name in self.force:
+            return None
+        fs, path = fsspec.core.url_to_fs(self._record_path(stage, fingerprint))
+        if not fs.exists(path):
+            return None
+        with fs.open(path, "r") as f:
+            record = json.load(f)
+        for key in stage.paths:
+            output_fs, output_path = fsspec.core.url_to_fs(record["outputs"][key])
+            if not output_fs.exists(output_path):
+                logger.info(f"Rerunning {stage.name}: its output {record['outputs'][key]} is gone")
+                return None
+        return record
+
+    def _save(self, stage: Stage, record: dict):
+        import fsspec
+
+        fs, path = fsspec.core.url_to_fs(self._record_path(stage, record["fingerprint"]))
+        fs.makedirs(path.rsplit("/", 1)[0], exist_ok=True)
+        with fs.open(path, "w") as f:
+            json.dump(record, f, indent=2)
+
+    def run(self) -> dict[str, dict]:
+        """Runs the pipeline. Returns each stage's record: fingerprint, outputs, and whether it was reused."""
+        results: dict[str, dict] = {}
+        pending = list(self.stages)
+        running = {}
+
+        with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=get_context("spawn")) as pool:
+            while pending or running:
+                ready = [s for s in pending if s.needs <= results.keys()]
+                for stage in ready:
+                    pending.remove(stage)
+                    fingerprint = self.fingerprint(stage, results)
+                    record = self.recorded(stage, fingerprint)
+                    if record is not None:
+                        logger.info(f"Reusing {stage.name} ({fingerprint}) from {record['completed_at']}")
+                        results[stage.name] = {**record, "reused": True}
+                        continue
+                    kwargs = {arg: results[name]["outputs"][key] for arg, (name, key) in stage.inputs.items()}
+                    logger.info(f"Running {stage.name} ({fingerprint})")
+                    running[pool.submit(stage.target, **kwargs)] = (stage, fingerprint, time.perf_counter())
+                if ready:
+                    continue  # Reused stages may have unblocked others
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, fingerprint, started = running.pop(future)
+                    try:
+                        outputs = future.result()
+                    except Exception:
+                        logger.error(f"Stage {stage.name} failed")
+                        for other in running:
+                            other.cancel()
+                        raise
+                    record = {
+                        "stage": stage.name,
+                        "fingerprint": fingerprint,
+                        "outputs": outputs,
+                        "seconds": time.perf_counter() - started,
+                        "completed_at": datetime.now(timezone.utc).isoformat(),
+                    }
+                    self._save(stage, record)
+                    results[stage.name] = {**record, "reused": False}
+                    logger.info(f"Finished {stage.name} in {record['seconds']:.1f}s")
+        return results
@@ -0,0 +1,120 @@
+from src.config.settings import Settings
+from src.pipelines.runner import Stage
+from src.utils.git import get_git_commit
+from src.utils.hashing import sha256_file
+from src.utils.mlflow_manager import MLflowManager
+
+# Settings each stage's result depends on, by field name or prefix
+ETL_SETTINGS = ("RAW_DATA_PATH", "PROCESSED_DATA_BUCKET", "ETL_", "PARQUET_", "MINHASH_")
+TRAINING_SETTINGS = (
+    "MLFLOW_TRACKING_URI", "EXPERIMENT_NAME", "MODEL_NAME", "RANDOM_STATE", "TRAINING_", "HASHING_", "TUNING_",
+    "PREDICTION_OUTPUT_MODE", "PREDICTION_COMPRESSION", "PREDICTION_ROW_GROUP_SIZE",
+    "MODEL_COMPRESSION_", "COMPRESSED_MODEL_NAME", "DRIFT_HEAVY_HITTERS",
+)
+EVALUATION_SETTINGS = (
+    "MLFLOW_TRACKING_URI", "EXPERIMENT_NAME", "MODEL_NAME", "RANDOM_STATE",
+    "F1_THRESHOLD", "EVALUATION_", "PROMOTE_ON_F1_LOWER_BOUND",
+)
+
+
+def _file_hash(path: str) -> str:
+    """The object store's ETag when it has one, otherwise a SHA-256 of the contents."""
+    import fsspec
+
+    fs, fs_path = fsspec.core.url_to_fs(path)
+    info = fs.info(fs_path)
+    etag = info.get("ETag") or info.get("etag")
+    if etag:
+        return f"etag:{etag.strip(chr(34))}:{info['size']}"
+    with fs.open(fs_path, "rb") as f:
+        return sha256_file(f)
+
+
+def raw_data_inputs() -> dict:
+    """Hashes of the raw files the ETL reads."""
+    from src.pipelines.incremental_etl_pipeline import IncrementalETLPipeline
+
+    return {"raw_data": {path: _file_hash(path) for path in IncrementalETLPipeline.source_paths()}}
+
+
+def training_inputs() -> dict:
+    """Incremental training with warm start continues from the Staging model, so that is an input too."""
+    if Settings.TRAINING_MODE != "incremental" or not Settings.TRAINING_WARM_START:
+        return {}
+    from src.registry.cache import registry
+
+    MLflowManager()
+    staging = registry().latest_version("Staging", refresh=True)
+    return {"warm_start_version": staging["version"] if staging else None}
+
+
+def run_etl() -> dict:
+    """Runs the ETL configured by Settings in its own MLflow run."""
+    from src.pipelines.etl_pipeline import ETLPipeline
+    from src.pipelines.incremental_etl_pipeline import IncrementalETLPipeline
+
+    mlflow_manager = MLflowManager()
+    with mlflow_manager.start_run(run_name="etl"):
+        if Settings.ETL_INCREMENTAL:
+            output_path = IncrementalETLPipeline().run()
+        elif Settings.ETL_CHUNK_SIZE > 0:
+            output_path = ETLPipeline().run_streaming()
+        else:
+            output_path = ETLPipeline().run()
+        mlflow_manager.log_stage_timings()
+    # Only the content-addressed path, so training is reused when a rerun produces the same dataset
+    return {"data_path": output_path}
+
+
+def run_training(data_path: str) -> dict:
+    """Trains and registers a model on `data_path` in its own MLflow run."""
+    from src.pipelines.incremental_training_pipeline import IncrementalTrainingPipeline
+    from src.pipelines.training_pipeline import TrainingPipeline
+
+    mlflow_manager = MLflowManager()
+    with mlflow_manager.start_run(run_name="training") as run:
+        mlflow_manager.log_param("git_commit", get_git_commit())
+
+        if Settings.TRAINING_MODE == "incremental":
+            pipeline = IncrementalTrainingPipeline()
+        else:
+            pipeline = TrainingPipeline()
+        f1, output_path = pipeline.run(data_path)
+        mlflow_manager.log_stage_timings()
+    return {"predictions_path": output_path, "f1": float(f1), "run_id": run.info.run_id}
+
+
+def run_evaluation(predictions_path: str) -> dict:
+    """Evaluates `predictions_path` and promotes the latest model if it passes, in its own MLflow run."""
+    import mlflow
+    from src.pipelines.evaluation_pipeline import EvaluationPipeline
+
+    mlflow_manager = MLflowManager()
+    with mlflow_manager.start_run(run_name="evaluation") as run:
+        report = EvaluationPipeline().evaluate_and_promote(predictions_path)
+
+        overall = report["overall"]
+        metrics = {f"evaluation_{k}": v for k, v in overall.items() if k != "rows"}
+        for name, interval in report["confidence_intervals"].items():
+            metrics[f"evaluation_{name}_ci_lower"] = interval["lower"]
+            metrics[f"evaluation_{name}_ci_upper"] = interval["upper"]
+        mlflow_manager.log_metrics(metrics)
+        mlflow_manager.log_param("evaluation_rows", overall["rows"])
+        mlflow.log_dict(report, "evaluation_report.json")
+        mlflow_manager.log_stage_timings()
+    return {"f1": float(overall["f1"]), "rows": int(overall["rows"]), "run_id": run.info.run_id}
+
+
+def pipeline_stages() -> list[Stage]:
+    """ETL -> training -> evaluation and promotion, each passing its output paths to the next."""
+    return [
+        Stage("etl", run_etl, settings=ETL_SETTINGS, fingerprint_inputs=raw_data_inputs, paths=("data_path",)),
+        Stage(
+            "training", run_training,
+            inputs={"data_path": ("etl", "data_path")},
+            settings=TRAINING_SETTINGS,
+            fingerprint_inputs=training_inputs,
+            paths=("predictions_path",),
+        ),
+        Stage("evaluation", run_evaluation, inputs={"predictions_path": ("training", "predictions_path")}, settings=EVALUATION_SETTINGS),
+    ]
@@ -1,30 +1,71 @@
+import numpy as np
 import pandas as pd
 import mlflow
 import mlflow.sklearn
+from sklearn.base import clone
 from sklearn.metrics import f1_score
+from sklearn.model_selection import train_test_split
 from mlflow.models.signature import infer_signature
 
+from src.data.dataset_io import predictions_path, read_dataset
+from src.data.prediction_io import PredictionWriter
+from src.features.store import feature_store
+from src.models.compression import ModelCompressor
 from src.models.pipeline import SpamHamPipeline
+from src.monitoring.drift import DriftMonitor
+from src.monitoring.sketches import DriftProfile
 from src.config.settings import Settings
+from src.utils.logger import get_logger
+from src.utils.metrics import stage
+from src.utils.mlflow_manager import MLflowManager
+
+logger = get_logger(__name__)
 
 class TrainingPipeline:
     def run(self, data_path: str) -> tuple[float, str]:
-        df = pd.read_parquet(data_path)
+        with stage("extract"):
+            df = read_dataset(data_path)
 
         X_text = df["text"]         
         y = df["label"]
 
-        pipeline = SpamHamPipeline.build(Settings.RANDOM_STATE)
-        pipeline.fit(X_text, y)
+        params = None
+        if Settings.TUNING_ENABLED:
+            from src.pipelines.tuning_pipeline import HyperparameterSearch
+
+            with stage("tune"):
+                params, cv_f1 = HyperparameterSearch().run(X_text, y, data_path)
+            MLflowManager.log_metric("cv_f1_score", cv_f1)
+            MLflowManager.log_params({f"best_{k}": v for k, v in params.items()})
+
+        pipeline = SpamHamPipeline.build(Settings.RANDOM_STATE, params)
+        counts = None
+        if Settings.FEATURE_STORE_ENABLED:
+            # Stored term counts replace tokenizing the texts for both fit and predict
+            with stage("features"):
+                counts = feature_store().counts(data_path, pipeline.named_steps["tfidf"], X_text)
+        with stage("fit"):
+            if counts is None:
+                pipeline.fit(X_text, y)
+            else:
+                X, _ = counts.fit(pipeline.named_steps["tfidf"])
+                pipeline.named_steps["classifier"].fit(X, y)
 
-        preds = pipeline.predict(X_text)
-        df["prediction"] = preds
+        with stage("predict"):
+            proba = pipeline.predict_proba(X_text) if counts is None else pipeline[-1].predict_proba(X)
+        preds = pipeline.classes_[proba.argmax(axis=1)]
         
         f1 = f1_score(y, preds, pos_label='spam')
         
         # Save predictions
-        output_path = data_path.replace(".parquet", "_with_preds.parquet")
-        df.to_parquet(output_path)
+        output_path = predictions_path(data_path)
+        with stage("load"), PredictionWriter(
+            output_path,
+            mode=Settings.PREDICTION_OUTPUT_MODE,
+            compression=Settings.PREDICTION_COMPRESSION,
+            row_group_size=Settings.PREDICTION_ROW_GROUP_SIZE,
+        ) as writer:
+            writer.write(df, preds, proba[:, list(pipeline.classes_).index("spam")])
 
 
         signature = infer_signature(
@@ -34,16 +75,95 @@ class TrainingPipeline:
 
         input_example = X_text.iloc[:5].to_frame(name="text")
 
-        mlflow.log_metric("f1_score", f1)
-        mlflow.log_param("model_type", "tfidf_logreg")
-        mlflow.log_param("predictions_output_path", output_path)
+        # Drift baseline, logged next to the model so monitors can compare against it
+        profile = DriftProfile(DriftMonitor.vocabulary_of(pipeline), Settings.DRIFT_HEAVY_HITTERS)
+        with stage("drift"):
+            profile.update(X_text, preds == "spam")
+        DriftMonitor.log_baseline(profile)
+
+        MLflowManager.log_metric("f1_score", f1)
+        MLflowManager.log_param("model_type", "tfidf_logreg")
+        MLflowManager.log_param("predictions_output_path", output_path)
+
+        with stage("log_model"):
+            mlflow.sklearn.log_model(
+                sk_model=pipeline,
+                artifact_path="model",
+                registered_model_name=Settings.MODEL_NAME,
+                signature=signature,
+                input_example=input_example
+            )
+
+        if Settings.MODEL_COMPRESSION_ENABLED:
+            with stage("compress"):
+                features = X if counts is not None else pipeline.named_steps["tfidf"].transform(X_text)
+                self.log_compressed(pipeline, features, counts, X_text, y, signature, input_example)
+
+        return f1, output_path
+
+    @staticmethod
+    def fit_holdout(pipeline, counts, X_text: pd.Series, y: pd.Series):
+        """
+        Fits a copy of `pipeline` with a stratified MODEL_COMPRESSION_HOLDOUT_FRACTION
+        of the rows held out. Returns the copy, its TF-IDF matrices of the rows it
+        was fitted on and of the held-out rows, and the held-out labels.
+        """
+        fit_rows, holdout_rows = train_test_split(
+            np.arange(len(y)),
+            test_size=Settings.MODEL_COMPRESSION_HOLDOUT_FRACTION,
+            stratify=y,
+            random_state=Settings.RANDOM_STATE,
+        )
+        fit_rows, holdout_rows = np.sort(fit_rows), np.sort(holdout_rows)
+        MLflowManager.log_param("compression_holdout_rows", len(holdout_rows))
+
+        holdout_pipeline = clone(pipeline)
+        vectorizer = holdout_pipeline.named_steps["tfidf"]
+        if counts is None:
+            X_fit = vectorizer.fit_transform(X_text.iloc[fit_rows])
+            X_holdout = vectorizer.transform(X_text.iloc[holdout_rows])
+        else:
+            X_fit, columns = counts.fit(vectorizer, rows=fit_rows)
+            X_holdout = counts.transform(vectorizer, columns, rows=holdout_rows)
+        holdout_pipeline.named_steps["classifier"].fit(X_fit, y.iloc[fit_rows])
+        return holdout_pipeline, X_fit, X_holdout, y.iloc[holdout_rows]
+
+    @classmethod
+    def log_compressed(cls, pipeline, X, counts, X_text, y, signature, input_example) -> bool:
+        """
+        Registers a pruned, low-precision copy of `pipeline` (TF-IDF matrix `X`
+        of its training texts) as a separate model, if compression costs at most
+        the F1 tolerance on held-out rows. `pipeline` itself is fitted on every
+        row, so that is measured on a copy fitted without them.
+        """
+        compressor = ModelCompressor(
+            Settings.MODEL_COMPRESSION_MIN_DF,
+            Settings.MODEL_COMPRESSION_MIN_COEF,
+            Settings.MODEL_COMPRESSION_PRECISION,
+        )
+        holdout_pipeline, X_fit, X_holdout, y_holdout = cls.fit_holdout(pipeline, counts, X_text, y)
+        compressed, report = compressor.evaluate(pipeline, X, holdout_pipeline, X_fit, X_holdout, y_holdout)
+        accepted = report["full_f1_score"] - report["f1_score"] <= Settings.MODEL_COMPRESSION_F1_TOLERANCE
+
+        MLflowManager.log_metrics({
+            "holdout_f1_score": report["full_f1_score"],
+            **{f"compressed_{key}": report[key] for key in ("f1_score", "terms", "size_bytes", "size_ratio", "agreement")},
+        })
+        MLflowManager.log_param("compressed_model_registered", accepted)
+        logger.info(
+            f"Compressed model: {report['terms']}/{report['full_terms']} terms, "
+            f"{report['size_bytes']}/{report['full_size_bytes']} bytes, "
+            f"held-out F1 {report['f1_score']:.4f} vs {report['full_f1_score']:.4f} on {report['holdout_rows']} rows"
+        )
+        if not accepted:
+            logger.warning(f"Compressed model not registered: F1 drop exceeds {Settings.MODEL_COMPRESSION_F1_TOLERANCE}")
+            return False
 
         mlflow.sklearn.log_model(
-            sk_model=pipeline,
-            artifact_path="model",
-            registered_model_name=Settings.MODEL_NAME,
+            sk_model=compressed,
+            artifact_path="model_compressed",
+            registered_model_name=Settings.COMPRESSED_MODEL_NAME,
             signature=signature,
             input_example=input_example
         )
-
-        return f1, output_path
+        return True
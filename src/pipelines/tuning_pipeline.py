@@ -0,0 +1,180 @@
+import itertools
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import f1_score
+from sklearn.model_selection import StratifiedKFold
+
+from src.config.settings import Settings
+from src.features.store import FeatureStore, TermCounts, config_key, count_params, feature_store
+from src.models.pipeline import SpamHamPipeline
+from src.utils.logger import get_logger
+from src.utils.mlflow_manager import MLflowManager
+
+logger = get_logger(__name__)
+
+# Keys follow SpamHamPipeline's step names so a result can be passed to Pipeline.set_params
+DEFAULT_SEARCH_SPACE = {
+    "tfidf__ngram_range": [(1, 1), (1, 2)],
+    "tfidf__min_df": [1, 2, 5],
+    "classifier__C": [0.1, 1.0, 10.0],
+    "classifier__class_weight": [None, "balanced"],
+}
+
+_texts = None
+_labels = None
+_data_path = None
+_feature_keys: set[str] = set()
+_term_counts: dict[str, TermCounts] = {}
+
+
+def _init_worker(texts: np.ndarray | None, labels: np.ndarray, data_path: str | None = None, feature_keys: set[str] = frozenset()):
+    global _texts, _labels, _data_path, _feature_keys
+    _texts, _labels, _data_path, _feature_keys = texts, labels, data_path, set(feature_keys)
+    _term_counts.clear()
+
+
+def _stored_counts(vectorizer: TfidfVectorizer) -> TermCounts | None:
+    """Memory-mapped term counts for the vectorizer's configuration, when the search materialized them."""
+    params = count_params(vectorizer)
+    if params is None or config_key(params) not in _feature_keys:
+        return None
+    key = config_key(params)
+    if key not in _term_counts:
+        _term_counts[key] = FeatureStore(Settings.FEATURE_CACHE_DIR).load(_data_path, params)
+    return _term_counts[key]
+
+
+def _step_params(params: dict, step: str) -> dict:
+    prefix = f"{step}__"
+    return {k[len(prefix):]: v for k, v in params.items() if k.startswith(prefix)}
+
+
+def _evaluate_fold(vectorizer_params: dict, classifier_params: list[dict], train_idx, val_idx, random_state: int) -> list[float]:
+    """Fits TF-IDF once for this fold and scores every classifier setting on it."""
+    vectorizer = SpamHamPipeline.build(random_state, vectorizer_params).named_steps["tfidf"]
+    counts = _stored_counts(vectorizer)
+    if counts is None:
+        X_train = vectorizer.fit_transform(_texts[train_idx])
+        X_val = vectorizer.transform(_texts[val_idx])
+    else:
+        X_train, columns = counts.fit(vectorizer, train_idx)
+        X_val = counts.transform(vectorizer, columns, val_idx)
+    y_train, y_val = _labels[train_idx], _labels[val_idx]
+
+    scores = []
+    for params in classifier_params:
+        classifier = SpamHamPipeline.build(random_state, params).named_steps["classifier"]
+        classifier.fit(X_train, y_train)
+        scores.append(f1_score(y_val, classifier.predict(X_val), pos_label="spam"))
+    return scores
+
+
+def load_search_space() -> dict:
+    if not Settings.TUNING_SEARCH_SPACE:
+        return DEFAULT_SEARCH_SPACE
+    space = json.loads(Settings.TUNING_SEARCH_SPACE)
+    # JSON has no tuples; sklearn expects them for ranges
+    return {k: [tuple(v) if isinstance(v, list) else v for v in values] for k, values in space.items()}
+
+
+class HyperparameterSearch:
+    """
+    K-fold cross-validated search over TF-IDF and LogisticRegression settings.
+
+    Trials are grouped by vectorizer settings, so each (vectorizer, fold)
+    matrix is fitted once on a process-pool worker and reused for every
+    classifier setting. Folds run in rounds. After each round, trials whose
+    mean F1 so far trails the best by more than TUNING_PRUNE_MARGIN are
+    dropped. Every trial is logged as a nested MLflow run.
+
+    Given the dataset's path, each distinct tokenization is counted once
+    through the feature store. Workers then derive every fold's TF-IDF
+    matrix from the memory-mapped counts instead of re-tokenizing the texts.
+    """
+
+    def __init__(self, search_space: dict | None = None):
+        self.search_space = search_space or load_search_space()
+
+    def trials(self) -> list[dict]:
+        keys = sorted(self.search_space)
+        grid = [dict(zip(keys, values)) for values in itertools.product(*(self.search_space[k] for k in keys))]
+        if 0 < Settings.TUNING_N_ITER < len(grid):
+            grid = random.Random(Settings.RANDOM_STATE).sample(grid, Settings.TUNING_N_ITER)
+        return grid
+
+    @staticmethod
+    def materialize_features(trials: list[dict], data_path: str, texts: np.ndarray) -> tuple[set[str], bool]:
+        """Counts every tokenization the trials use. Returns their keys and whether all trials are covered."""
+        keys, covered = set(), True
+        for trial in trials:
+            vectorizer = SpamHamPipeline.build(Settings.RANDOM_STATE, trial).named_steps["tfidf"]
+            params = count_params(vectorizer)
+            if params is None:
+                covered = False
+            elif config_key(params) not in keys:
+                feature_store().counts(data_path, vectorizer, texts)
+                keys.add(config_key(params))
+        return keys, covered
+
+    def run(self, texts, labels, data_path: str | None = None) -> tuple[dict, float]:
+        texts, labels = np.asarray(texts, dtype=object), np.asarray(labels, dtype=object)
+        trials = self.trials()
+        feature_keys, covered = set(), False
+        if data_path and Settings.FEATURE_STORE_ENABLED:
+            feature_keys, covered = self.materialize_features(trials, data_path, texts)
+        folds = list(StratifiedKFold(
+            n_splits=Settings.TUNING_FOLDS, shuffle=True, random_state=Settings.RANDOM_STATE
+        ).split(texts, labels))
+        scores = {i: [] for i in range(len(trials))}
+        active = set(scores)
+
+        logger.info(f"Searching {len(trials)} trials with {len(folds)}-fold CV")
+        workers = Settings.TUNING_N_JOBS or os.cpu_count()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(None if covered else texts, labels, data_path, feature_keys)) as pool:
+            for fold, (train_idx, val_idx) in enumerate(folds):
+                groups: dict[str, list[int]] = {}
+                for i in sorted(active):
+                    key = json.dumps(_step_params(trials[i], "tfidf"), sort_keys=True, default=str)
+                    groups.setdefault(key, []).append(i)
+
+                futures = {
+                    pool.submit(
+                        _evaluate_fold,
+                        {k: v for k, v in trials[members[0]].items() if k.startswith("tfidf__")},
+                        [trials[i] for i in members],
+                        train_idx,
+                        val_idx,
+                        Settings.RANDOM_STATE,
+                    ): members
+                    for members in groups.values()
+                }
+                for future, members in futures.items():
+                    for i, score in zip(members, future.result()):
+                        scores[i].append(score)
+
+                if fold + 1 < len(folds):
+                    best_mean = max(np.mean(scores[i]) for i in active)
+                    pruned = {i for i in active if np.mean(scores[i]) < best_mean - Settings.TUNING_PRUNE_MARGIN}
+                    active -= pruned
+                    logger.info(f"Fold {fold + 1}: best mean F1 {best_mean:.4f}, pruned {len(pruned)} trials")
+
+        mlflow_manager = MLflowManager()
+        for i, params in enumerate(trials):
+            with mlflow_manager.start_run(run_name=f"trial-{i}", nested=True):
+                MLflowManager.log_params(params)
+                for step, score in enumerate(scores[i]):
+                    MLflowManager.log_metric("fold_f1", score, step=step)
+                MLflowManager.log_metric("cv_f1_mean", float(np.mean(scores[i])))
+                MLflowManager.log_metric("cv_f1_std", float(np.std(scores[i])))
+                MLflowManager.set_tag("pruned", str(i not in active))
+
+        best = max(active, key=lambda i: np.mean(scores[i]))
+        best_score = float(np.mean(scores[best]))
+        logger.info(f"Best trial {best}: {trials[best]} (CV F1 {best_score:.4f})")
+        return trials[best], best_score
@@ -0,0 +1,257 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from src.config.settings import Settings
+from src.utils.hashing import sha256_file
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Model version fields kept in the metadata cache
+VERSION_FIELDS = ("version", "current_stage", "run_id", "source", "status", "creation_timestamp", "last_updated_timestamp")
+
+
+@contextmanager
+def _file_lock(path: Path):
+    """Exclusive advisory lock shared by all processes on the host (POSIX)."""
+    import fcntl
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _tree_digest(root: Path) -> tuple[str, dict[str, str]]:
+    """sha256 of every file under `root` and one digest over all of them (relative path + hash)."""
+    files = {}
+    for path in sorted(p for p in root.rglob("*") if p.is_file()):
+        files[path.relative_to(root).as_posix()] = sha256_file(path)
+    digest = hashlib.sha256(json.dumps(files, sort_keys=True).encode()).hexdigest()
+    return digest, files
+
+
+class RegistryCache:
+    """
+    Cached view of one registered model's versions and stages.
+
+    All versions are fetched with a single `search_model_versions` call and
+    kept for `ttl` seconds, in memory and in `{cache_dir}/registry/` (per
+    tracking server), so short-lived processes on the same host share the
+    result. When the TTL runs out, the refresh is conditional. One
+    `get_registered_model` call reads the model's `last_updated_timestamp`,
+    which MLflow bumps on every new version and stage transition, and the
+    versions are fetched again only if it moved. Writers such as
+    ModelPromoter call `invalidate()` after changing a stage.
+    """
+
+    def __init__(self, model_name: str, ttl: float, cache_dir: str | None = None):
+        import mlflow
+
+        self.model_name = model_name
+        self.ttl = ttl
+        self.path = None
+        if cache_dir:
+            # Registries on different tracking servers must not share an entry
+            server = hashlib.sha256(mlflow.get_tracking_uri().encode()).hexdigest()[:12]
+            self.path = Path(cache_dir).expanduser() / "registry" / f"{model_name}-{server}.json"
+        self._lock = threading.Lock()
+        self._state: dict | None = None
+
+    def _read_disk(self) -> dict | None:
+        if self.path is None or not self.path.exists():
+            return None
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, state: dict):
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def _fetch(self, client, last_updated: int | None) -> dict:
+        versions = client.search_model_versions(f"name='{self.model_name}'")
+        return {
+            "checked_at": time.time(),
+            "last_updated": last_updated,
+            "versions": [{field: getattr(v, field) for field in VERSION_FIELDS} for v in versions],
+        }
+
+    def _refresh(self, force: bool) -> dict:
+        from mlflow.tracking import MlflowClient
+
+        now = time.time()
+        state = self._state
+        if state is None and not force:
+            state = self._read_disk()
+        if state is not None and not force and now - state["checked_at"] < self.ttl:
+            return state
+
+        client = MlflowClient()
+        last_updated = client.get_registered_model(self.model_name).last_updated_timestamp
+        if state is not None and state["last_updated"] == last_updated:
+            state = {**state, "checked_at": now}
+        else:
+            state = self._fetch(client, last_updated)
+            logger.info(f"Fetched {len(state['versions'])} versions of {self.model_name} from the registry")
+        self._write_disk(state)
+        return state
+
+    def versions(self, refresh: bool = False) -> list[dict]:
+        """All versions of the model as dicts of VERSION_FIELDS."""
+        with self._lock:
+            self._state = self._refresh(force=refresh)
+            return self._state["versions"]
+
+    def latest_versions(self, stages: list[str] | None = None, refresh: bool = False) -> list[dict]:
+        """Like MlflowClient.get_latest_versions: the newest version in each stage."""
+        latest = {}
+        for v in self.versions(refresh):
+            stage = v["current_stage"]
+            if (stages is None or stage in stages) and (stage not in latest or int(v["version"]) > int(latest[stage]["version"])):
+                latest[stage] = v
+        return sorted(latest.values(), key=lambda v: int(v["version"]))
+
+    def latest_version(self, stage: str, refresh: bool = False) -> dict | None:
+        versions = self.latest_versions([stage], refresh)
+        return versions[0] if versions else None
+
+    def get_version(self, version: str) -> dict:
+        for refresh in (False, True):
+            for v in self.versions(refresh):
+                if str(v["version"]) == str(version):
+                    return v
+        raise LookupError(f"{self.model_name} has no version {version}")
+
+    def invalidate(self):
+        with self._lock:
+            self._state = None
+            if self.path is not None:
+                self.path.unlink(missing_ok=True)
+
+
+class ArtifactCache:
+    """
+    Content-addressed local cache of model artifacts.
+
+    A downloaded model is stored under `{cache_dir}/sha256/{digest}`, where
+    the digest covers every file's path and sha256. `versions/{name}/{version}.json`
+    maps a model version to that digest, together with the version's
+    artifact source. Registered versions are immutable, so an entry stays
+    valid as long as the registry still reports the same source.
+
+    A download holds a per-version file lock, so concurrent loaders on one
+    host wait for the first download instead of repeating it. Downloads go
+    to a temporary directory and are renamed into place, so a reader never
+    sees a partial model. Identical content registered under several
+    versions is stored once.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.root = Path(cache_dir).expanduser()
+
+    def _index_path(self, model_name: str, version: str) -> Path:
+        return self.root / "versions" / model_name / f"{version}.json"
+
+    def lookup(self, model_name: str, version: str, source: str) -> Path | None:
+        index_path = self._index_path(model_name, version)
+        try:
+            with open(index_path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        path = self.root / "sha256" / entry["digest"]
+        if entry["source"] != source or not path.is_dir():
+            return None
+        return path
+
+    def fetch(self, model_name: str, version: dict) -> Path:
+        """Local path of the version's artifacts, downloading them on a miss."""
+        import mlflow
+
+        number, source = str(version["version"]), version["source"]
+        path = self.lookup(model_name, number, source)
+        if path is not None:
+            logger.info(f"Model {model_name} v{number} served from the local cache ({path.name[:12]})")
+            return path
+
+        with _file_lock(self.root / "locks" / f"{model_name}-{number}.lock"):
+            # Another process may have finished the download while we waited
+            path = self.lookup(model_name, number, source)
+            if path is not None:
+                return path
+
+            tmp_dir = self.root / "tmp" / uuid.uuid4().hex
+            tmp_dir.mkdir(parents=True)
+            try:
+                logger.info(f"Downloading {model_name} v{number} from {source}...")
+                local = Path(mlflow.artifacts.download_artifacts(artifact_uri=source, dst_path=str(tmp_dir)))
+                digest, files = _tree_digest(local)
+                path = self.root / "sha256" / digest
+                if not path.exists():
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    os.replace(local, path)
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+            index_path = self._index_path(model_name, number)
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(index_path.with_suffix(".tmp"), "w") as f:
+                json.dump({"digest": digest, "source": source, "run_id": version["run_id"], "files": files}, f, indent=2)
+            os.replace(index_path.with_suffix(".tmp"), index_path)
+            logger.info(f"Cached {model_name} v{number} as {digest[:12]} ({len(files)} files)")
+            return path
+
+
+_registry: RegistryCache | None = None
+_registry_lock = threading.Lock()
+
+
+def registry() -> RegistryCache:
+    """The process-wide registry cache for Settings.MODEL_NAME."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = RegistryCache(Settings.MODEL_NAME, Settings.REGISTRY_CACHE_TTL_SECONDS, Settings.MODEL_CACHE_DIR)
+        return _registry
+
+
+def model_path(version: str) -> str:
+    """
+    Local path (or, with MODEL_CACHE_DIR unset, the registry URI) of a
+    registered version's model artifacts.
+    """
+    if not Settings.MODEL_CACHE_DIR:
+        return f"models:/{Settings.MODEL_NAME}/{version}"
+    return str(ArtifactCache(Settings.MODEL_CACHE_DIR).fetch(Settings.MODEL_NAME, registry().get_version(version)))
+
+
+def load_sklearn_model(version: str):
+    import mlflow.sklearn
+
+    return mlflow.sklearn.load_model(model_path(version))
+
+
+def resolve_stage(stage: str = "Staging", refresh: bool = False) -> str:
+    """Version number currently in `stage`."""
+    version = registry().latest_version(stage, refresh)
+    if version is None:
+        raise LookupError(f"No version of {Settings.MODEL_NAME} is in '{stage}'")
+    return str(version["version"])
@@ -1,5 +1,6 @@
 from mlflow.tracking import MlflowClient
 from src.config.settings import Settings
+from src.registry.cache import registry
 
 class ModelPromoter:
     def __init__(self):
@@ -9,20 +10,18 @@ class ModelPromoter:
         if f1_score < Settings.F1_THRESHOLD:
             raise ValueError("Model does not meet quality threshold")
 
-        versions = self.client.get_latest_versions(
-            Settings.MODEL_NAME, stages=["None"]
-        )
+        latest = registry().latest_version("None", refresh=True)
 
-        if not versions:
+        if latest is None:
             print(f"No versions of {Settings.MODEL_NAME} found in stage 'None'.")
             return
 
-        latest = versions[0]
-        print(f"Promoting model version {latest.version} to Staging...")
+        print(f"Promoting model version {latest['version']} to Staging...")
 
         self.client.transition_model_version_stage(
             name=Settings.MODEL_NAME,
-            version=latest.version,
+            version=latest["version"],
             stage="Staging",
             archive_existing_versions=True
         )
+        registry().invalidate()
@@ -0,0 +1,21 @@
+import hashlib
+import subprocess
+
+
+def get_git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"],
+            stderr=subprocess.DEVNULL
+        ).decode("utf-8").strip()
+    except Exception:
+        return "unknown"
+
+
+def get_git_diff_hash() -> str | None:
+    """Hash of uncommitted changes to tracked files; None for a clean tree or outside git."""
+    try:
+        diff = subprocess.check_output(["git", "diff", "HEAD"], stderr=subprocess.DEVNULL)
+    except Exception:
+        return None
+    return hashlib.sha256(diff).hexdigest()[:16] if diff else None
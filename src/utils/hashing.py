@@ -0,0 +1,24 @@
+import hashlib
+import os
+
+import numpy as np
+
+
+def mix64(hashes: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer: spreads every input bit over the whole uint64 output."""
+    hashes = hashes ^ (hashes >> np.uint64(30))
+    hashes = hashes * np.uint64(0xBF58476D1CE4E5B9)
+    hashes = hashes ^ (hashes >> np.uint64(27))
+    hashes = hashes * np.uint64(0x94D049BB133111EB)
+    return hashes ^ (hashes >> np.uint64(31))
+
+
+def sha256_file(file, block_size: int = 8 << 20) -> str:
+    """Hex SHA-256 of a file, given its local path or an open binary file, read in blocks."""
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as f:
+            return sha256_file(f, block_size)
+    digest = hashlib.sha256()
+    while block := file.read(block_size):
+        digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,181 @@
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds; fine-grained at the low end, where per-request stages live
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 1800.0,
+)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096, 16384, 65536)
+
+
+class Histogram:
+    """Fixed-bucket histogram: a bisect and three additions per observation."""
+
+    def __init__(self, buckets: tuple):
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)  # last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimate by linear interpolation inside the bucket that holds the quantile."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.bounds[-1]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.bounds[-1]
+
+
+def _label_text(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+class MetricsRegistry:
+    """
+    In-process counters, histograms and info gauges.
+
+    Metrics are keyed by name plus a sorted label tuple. One lock guards all
+    updates, and an update holds it only for a few list operations, so
+    instrumenting a hot path costs on the order of a microsecond. `render`
+    produces the Prometheus text exposition format. `stage_timings` flattens
+    the pipeline stage histograms into MLflow-style metrics for batch jobs.
+
+    Each process has its own registry; with several API workers, every
+    worker reports its own series.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[tuple, float] = {}
+        self._histograms: dict[tuple, Histogram] = {}
+        self._info: dict[str, tuple] = {}
+        self._help: dict[str, str] = {}
+
+    def describe(self, name: str, help_text: str):
+        self._help[name] = help_text
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, buckets: tuple = LATENCY_BUCKETS, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def set_info(self, name: str, **labels):
+        """An info gauge: one series with value 1 whose labels carry the data (e.g. model version)."""
+        with self._lock:
+            self._info[name] = tuple(sorted(labels.items()))
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._info.clear()
+
+    def render(self) -> str:
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                (key, list(h.counts), h.bounds, h.count, h.sum) for key, h in self._histograms.items()
+            )
+            info = sorted(self._info.items())
+
+        lines = []
+        declared = set()
+
+        def declare(name: str, kind: str):
+            if name not in declared:
+                declared.add(name)
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for name, labels in info:
+            declare(name, "gauge")
+            lines.append(f"{name}{_label_text(labels)} 1")
+        for (name, labels), value in counters:
+            declare(name, "counter")
+            lines.append(f"{name}{_label_text(labels)} {value}")
+        for (name, labels), counts, bounds, count, total in histograms:
+            declare(name, "histogram")
+            cumulative = 0
+            for bound, bucket_count in zip(bounds + (math.inf,), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == math.inf else repr(float(bound))
+                lines.append(f"{name}_bucket{_label_text(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{_label_text(labels)} {total}")
+            lines.append(f"{name}_count{_label_text(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def stage_timings(self, name: str = "pipeline_stage_seconds") -> dict[str, float]:
+        """`{stage}_seconds` (total) and `{stage}_p95_seconds` for every stage of a stage histogram."""
+        with self._lock:
+            items = [(dict(labels), h) for (n, labels), h in self._histograms.items() if n == name]
+        timings = {}
+        for labels, histogram in items:
+            stage = labels.get("stage", "unknown")
+            timings[f"{stage}_seconds"] = histogram.sum
+            if histogram.count > 1:
+                timings[f"{stage}_p95_seconds"] = histogram.quantile(0.95)
+        return timings
+
+
+metrics = MetricsRegistry()
+metrics.describe("api_requests_total", "HTTP requests by endpoint and status code.")
+metrics.describe("api_request_seconds", "End-to-end request latency by endpoint.")
+metrics.describe("api_stage_seconds", "Latency of request stages: parse, vectorize, classify, serialize.")
+metrics.describe("model_batch_size", "Texts per model call (micro-batches and batch requests).")
+metrics.describe("model_info", "Active model version.")
+metrics.describe("campaign_lookups_total", "Campaign index lookups by result (hit skips the model).")
+metrics.describe("pipeline_stage_seconds", "Duration of batch pipeline stages.")
+
+
+@contextmanager
+def stage(name: str):
+    """Times a batch pipeline stage (extract, transform, load, hash, fit, predict, ...)."""
+    with metrics.timer("pipeline_stage_seconds", stage=name):
+        yield
+
+
+def timed_iter(iterable, name: str):
+    """Yields from `iterable`, timing each `next()` as one observation of stage `name`."""
+    iterator = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        metrics.observe("pipeline_stage_seconds", time.perf_counter() - start, stage=name)
+        yield item
@@ -0,0 +1,290 @@
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# MLflow's log_batch limits
+MAX_METRICS_PER_BATCH = 1000
+MAX_PARAMS_TAGS_PER_BATCH = 100
+
+
+class _RunBuffer:
+    """Entries waiting to be sent for one run. Params and tags are keyed, so a repeated key is sent once."""
+
+    def __init__(self):
+        self.params: dict[str, str] = {}
+        self.tags: dict[str, str] = {}
+        self.metrics: list[tuple[str, float, int, int]] = []  # (key, value, timestamp_ms, step)
+
+    def __len__(self) -> int:
+        return len(self.params) + len(self.tags) + len(self.metrics)
+
+    def extend(self, other: "_RunBuffer"):
+        self.params.update(other.params)
+        self.tags.update(other.tags)
+        self.metrics.extend(other.metrics)
+
+    def batches(self):
+        """Splits the buffer into `(params, tags, metrics)` chunks within MLflow's per-request limits."""
+        params, tags, metrics = list(self.params.items()), list(self.tags.items()), list(self.metrics)
+        while params or tags or metrics:
+            p, params = params[:MAX_PARAMS_TAGS_PER_BATCH], params[MAX_PARAMS_TAGS_PER_BATCH:]
+            t, tags = tags[:MAX_PARAMS_TAGS_PER_BATCH], tags[MAX_PARAMS_TAGS_PER_BATCH:]
+            n = MAX_METRICS_PER_BATCH - len(p) - len(t)
+            m, metrics = metrics[:n], metrics[n:]
+            yield p, t, m
+
+    def to_dict(self) -> dict:
+        return {"params": self.params, "tags": self.tags, "metrics": self.metrics}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "_RunBuffer":
+        buffer = cls()
+        buffer.params = state["params"]
+        buffer.tags = state["tags"]
+        buffer.metrics = [tuple(m) for m in state["metrics"]]
+        return buffer
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Server-side and connection errors are retried; rejected requests (4xx) are not."""
+    from mlflow.exceptions import MlflowException
+
+    if isinstance(error, MlflowException):
+        return error.get_http_status_code() >= 500
+    return True
+
+
+class BatchedRunLogger:
+    """
+    Buffers MLflow params, metrics and tags and sends them with `log_batch`.
+
+    Calls only append to an in-memory buffer, tagged with the run that was
+    active at call time, so nested runs keep their own entries. A daemon
+    thread flushes every `flush_interval` seconds, or sooner once
+    `max_pending` entries are waiting. It groups entries per run and splits
+    them into requests within MLflow's batch limits. Failed requests are
+    retried `retries` times with exponential backoff starting at `backoff`
+    seconds.
+
+    If the tracking server is still unreachable after that, the entries are
+    appended to `{spool_dir}/{run_id}.jsonl` and the pipeline carries on.
+    Spooled files are replayed by the next flush that reaches the server,
+    in this process or a later one. A request the server rejects (4xx) is
+    not retried. It is resent entry by entry, so only the offending entries
+    are dropped, with an error logged.
+
+    `flush()` blocks until everything logged so far has been sent or
+    spooled. MLflowManager.start_run calls it when a run exits, and
+    `close()` runs at interpreter exit. With `synchronous=True`, every call
+    flushes before returning. That keeps the retry and spool behavior while
+    making calls synchronous again.
+    """
+
+    def __init__(self, flush_interval: float = 2.0, max_pending: int = 1000, retries: int = 5,
+                 backoff: float = 0.5, spool_dir: str | None = None, synchronous: bool = False):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.retries = retries
+        self.backoff = backoff
+        self.spool_dir = Path(spool_dir) if spool_dir else None
+        self.synchronous = synchronous
+
+        self._lock = threading.Lock()  # guards _pending
+        self._flush_lock = threading.Lock()  # one flush at a time
+        self._pending: dict[str, _RunBuffer] = {}
+        self._pending_count = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._pid = None
+
+    @staticmethod
+    def _active_run_id() -> str:
+        import mlflow
+
+        run = mlflow.active_run()
+        # Like mlflow.log_*, start a run when none is active
+        return (run or mlflow.start_run()).info.run_id
+
+    def _add(self, run_id: str | None, params: dict | None = None, tags: dict | None = None,
+             metrics: dict | None = None, step: int | None = None):
+        run_id = run_id or self._active_run_id()
+        timestamp = int(time.time() * 1000)
+        with self._lock:
+            buffer = self._pending.setdefault(run_id, _RunBuffer())
+            before = len(buffer)
+            if params:
+                buffer.params.update({k: str(v) for k, v in params.items()})
+            if tags:
+                buffer.tags.update({k: str(v) for k, v in tags.items()})
+            if metrics:
+                buffer.metrics.extend((k, float(v), timestamp, step or 0) for k, v in metrics.items())
+            self._pending_count += len(buffer) - before
+            full = self._pending_count >= self.max_pending
+
+        if self.synchronous:
+            self.flush()
+            return
+        self._ensure_thread()
+        if full:
+            self._wake.set()
+
+    def log_params(self, params: dict, run_id: str | None = None):
+        self._add(run_id, params=params)
+
+    def log_param(self, key: str, value, run_id: str | None = None):
+        self._add(run_id, params={key: value})
+
+    def log_metrics(self, metrics: dict, step: int | None = None, run_id: str | None = None):
+        self._add(run_id, metrics=metrics, step=step)
+
+    def log_metric(self, key: str, value: float, step: int | None = None, run_id: str | None = None):
+        self._add(run_id, metrics={key: value}, step=step)
+
+    def set_tags(self, tags: dict, run_id: str | None = None):
+        self._add(run_id, tags=tags)
+
+    def set_tag(self, key: str, value, run_id: str | None = None):
+        self._add(run_id, tags={key: value})
+
+    def _ensure_thread(self):
+        # A forked child inherits the buffer object but not the thread
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._stop.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="mlflow-logger", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"MLflow background flush failed: {e}")
+
+    def close(self):
+        """Stops the background thread and flushes what is left."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join()
+        self._thread = None
+        self.flush()
+
+    def flush(self):
+        """Sends everything logged so far, spooling to disk what cannot be sent."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending, self._pending_count = self._pending, {}, 0
+
+            # Only a flush that reached the server is evidence it is back up
+            reachable = bool(pending)
+            for run_id, buffer in pending.items():
+                unsent = self._send(run_id, buffer)
+                if unsent is not None:
+                    reachable = False
+                    self._spool(run_id, unsent)
+            if reachable:
+                self._replay_spool()
+
+    def _send(self, run_id: str, buffer: _RunBuffer) -> _RunBuffer | None:
+        """Sends one run's entries. Returns those not sent when the server could not be reached."""
+        from mlflow.tracking import MlflowClient
+
+        client = MlflowClient()
+        batches = list(buffer.batches())
+        for i, (params, tags, metrics) in enumerate(batches):
+            try:
+                self._with_retries(client, run_id, params, tags, metrics)
+            except Exception as e:
+                if _is_retryable(e):
+                    logger.warning(f"MLflow unreachable after {self.retries} retries: {e}")
+                    unsent = _RunBuffer()
+                    for params, tags, metrics in batches[i:]:
+                        unsent.params.update(params)
+                        unsent.tags.update(tags)
+                        unsent.metrics.extend(metrics)
+                    return unsent
+                logger.error(f"MLflow rejected a batch for run {run_id}: {e}. Resending entries one by one.")
+                self._send_individually(client, run_id, params, tags, metrics)
+        return None
+
+    def _with_retries(self, client, run_id: str, params: list, tags: list, metrics: list):
+        from mlflow.entities import Metric, Param, RunTag
+
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            try:
+                client.log_batch(
+                    run_id,
+                    metrics=[Metric(k, v, ts, step) for k, v, ts, step in metrics],
+                    params=[Param(k, v) for k, v in params],
+                    tags=[RunTag(k, v) for k, v in tags],
+                    synchronous=True,
+                )
+                return
+            except Exception as e:
+                if attempt == self.retries or not _is_retryable(e):
+                    raise
+                logger.warning(f"MLflow log_batch failed ({e}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+                delay *= 2
+
+    @staticmethod
+    def _send_individually(client, run_id: str, params: list, tags: list, metrics: list):
+        from mlflow.entities import Metric, Param, RunTag
+
+        entries = [{"params": [Param(k, v)]} for k, v in params]
+        entries += [{"tags": [RunTag(k, v)]} for k, v in tags]
+        entries += [{"metrics": [Metric(k, v, ts, step)]} for k, v, ts, step in metrics]
+        for entry in entries:
+            try:
+                client.log_batch(run_id, synchronous=True, **entry)
+            except Exception as e:
+                logger.error(f"Dropped MLflow entry {entry} for run {run_id}: {e}")
+
+    def _spool(self, run_id: str, buffer: _RunBuffer):
+        if self.spool_dir is None:
+            logger.error(f"Dropped {len(buffer)} MLflow entries for run {run_id}: no spool directory configured")
+            return
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.spool_dir / f"{run_id}.jsonl", "a") as f:
+            f.write(json.dumps(buffer.to_dict()) + "\n")
+        logger.warning(f"Spooled {len(buffer)} MLflow entries for run {run_id} to {self.spool_dir}")
+
+    def _replay_spool(self):
+        if self.spool_dir is None or not self.spool_dir.is_dir():
+            return
+        for path in sorted(self.spool_dir.glob("*.jsonl")):
+            # Claim the file first, so concurrent processes never replay it twice
+            claimed = path.with_name(f"{path.stem}.{uuid.uuid4().hex}.replaying")
+            try:
+                path.rename(claimed)
+            except FileNotFoundError:
+                continue
+
+            run_id, buffer = path.stem, _RunBuffer()
+            with open(claimed) as f:
+                for line in f:
+                    buffer.extend(_RunBuffer.from_dict(json.loads(line)))
+            unsent = self._send(run_id, buffer)
+            if unsent is None:
+                logger.info(f"Replayed {len(buffer)} spooled MLflow entries for run {run_id}")
+            else:
+                self._spool(run_id, unsent)
+            claimed.unlink()
+            if unsent is not None:
+                return
@@ -1,18 +1,62 @@
+import atexit
+from contextlib import contextmanager
+
 import mlflow
 from src.config.settings import Settings
+from src.utils.mlflow_logger import BatchedRunLogger
+
+run_logger = BatchedRunLogger(
+    flush_interval=Settings.MLFLOW_LOG_FLUSH_INTERVAL_SECONDS,
+    retries=Settings.MLFLOW_LOG_RETRIES,
+    backoff=Settings.MLFLOW_LOG_BACKOFF_SECONDS,
+    spool_dir=Settings.MLFLOW_SPOOL_DIR,
+    synchronous=not Settings.MLFLOW_ASYNC_LOGGING,
+)
+atexit.register(run_logger.close)
 
 class MLflowManager:
     def __init__(self):
         mlflow.set_tracking_uri(Settings.MLFLOW_TRACKING_URI)
         mlflow.set_experiment(Settings.EXPERIMENT_NAME)
 
-    def start_run(self, run_name: str):
-        return mlflow.start_run(run_name=run_name)
+    @contextmanager
+    def start_run(self, run_name: str, nested: bool = False):
+        """Starts a run; everything logged through MLflowManager is flushed before the run ends."""
+        with mlflow.start_run(run_name=run_name, nested=nested) as run:
+            try:
+                yield run
+            finally:
+                run_logger.flush()
 
     @staticmethod
     def log_params(params: dict):
-        mlflow.log_params(params)
+        run_logger.log_params(params)
+
+    @staticmethod
+    def log_param(key: str, value):
+        run_logger.log_param(key, value)
 
     @staticmethod
-    def log_metrics(metrics: dict):
-        mlflow.log_metrics(metrics)
+    def log_metrics(metrics: dict, step: int | None = None):
+        run_logger.log_metrics(metrics, step=step)
+
+    @staticmethod
+    def log_metric(key: str, value: float, step: int | None = None):
+        run_logger.log_metric(key, value, step=step)
+
+    @staticmethod
+    def set_tag(key: str, value):
+        run_logger.set_tag(key, value)
+
+    @staticmethod
+    def flush():
+        run_logger.flush()
+
+    @staticmethod
+    def log_stage_timings():
+        """Logs the pipeline stage durations recorded in this process as `stage_*` metrics."""
+        from src.utils.metrics import metrics
+
+        timings = metrics.stage_timings()
+        if timings:
+            run_logger.log_metrics({f"stage_{k}": v for k, v in timings.items()})
@@ -0,0 +1,65 @@
+import random
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.features.store import FeatureStore, count_params
+
+WORDS = [f"w{i}" for i in range(60)] + ["free", "prize", "call", "lunch", "later", "home"]
+
+
+@pytest.fixture(scope="module")
+def texts():
+    rng = random.Random(0)
+    # Zipf-like, so min_df, max_df and max_features all prune something
+    weights = [1 / (i + 1) for i in range(len(WORDS))]
+    return [" ".join(rng.choices(WORDS, weights, k=rng.randint(1, 12))) for _ in range(300)]
+
+
+@pytest.mark.parametrize("params", [
+    {},
+    {"min_df": 3},
+    {"max_df": 0.3},
+    {"min_df": 0.02, "max_df": 0.5},
+    {"max_features": 25},
+    {"min_df": 2, "max_df": 0.8, "max_features": 10},
+    {"ngram_range": (1, 2), "min_df": 2},
+    {"binary": True, "sublinear_tf": True},
+    {"use_idf": False, "norm": None},
+    {"smooth_idf": False, "norm": "l1"},
+])
+@pytest.mark.parametrize("subset", [False, True])
+def test_fit_from_counts_matches_tfidf_vectorizer(tmp_path, texts, params, subset):
+    rows = np.arange(0, len(texts), 3) if subset else None
+    fit_texts = texts if rows is None else [texts[i] for i in rows]
+    expected = TfidfVectorizer(**params)
+    X_expected = expected.fit_transform(fit_texts)
+
+    store = FeatureStore()
+    vectorizer = TfidfVectorizer(**params)
+    counts = store.materialize(str(tmp_path / "data.parquet"), count_params(vectorizer), texts)
+    X, columns = counts.fit(vectorizer, rows=rows)
+
+    assert vectorizer.vocabulary_ == expected.vocabulary_
+    assert vectorizer.stop_words_ == expected.stop_words_
+    if vectorizer.use_idf:
+        np.testing.assert_allclose(vectorizer.idf_, expected.idf_)
+    np.testing.assert_allclose(X.toarray(), X_expected.toarray())
+
+    # Every row through the stored counts, and new texts through the fitted vectorizer
+    np.testing.assert_allclose(counts.transform(vectorizer, columns).toarray(), expected.transform(texts).toarray())
+    new_texts = ["free prize call now", "lunch later at home", "w1 w2 w3 unseen"]
+    np.testing.assert_allclose(vectorizer.transform(new_texts).toarray(), expected.transform(new_texts).toarray())
+
+
+def test_stored_counts_are_reloaded(tmp_path, texts):
+    store = FeatureStore()
+    data_path = str(tmp_path / "data.parquet")
+    params = count_params(TfidfVectorizer())
+    store.materialize(data_path, params, texts)
+
+    counts = store.load(data_path, params, rows=len(texts))
+    assert counts is not None and len(counts) == len(texts)
+    assert store.load(data_path, params, rows=len(texts) + 1) is None
+    assert store.load(data_path, count_params(TfidfVectorizer(ngram_range=(1, 2)))) is None
@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+
+from src.config.settings import Settings
+from src.pipelines.incremental_etl_pipeline import IncrementalETLPipeline
+
+
+@pytest.fixture
+def raw_path(tmp_path, monkeypatch):
+    path = tmp_path / "raw.csv"
+    monkeypatch.setattr(Settings, "RAW_DATA_PATH", str(path))
+    monkeypatch.setattr(Settings, "PROCESSED_DATA_BUCKET", str(tmp_path / "processed"))
+    return path
+
+
+def extract(sources: dict) -> list[str]:
+    chunks = list(IncrementalETLPipeline().extract_new_chunks(sources, chunk_size=2))
+    return pd.concat(chunks)["v2"].tolist() if chunks else []
+
+
+def append(path, data: bytes):
+    with open(path, "ab") as f:
+        f.write(data)
+
+
+def test_partial_last_line_waits_for_the_next_run(raw_path):
+    raw_path.write_bytes(b"v1,v2\nham,see you later\nspam,win a")
+    sources = {}
+
+    assert extract(sources) == ["see you later"]
+    assert sources[str(raw_path)]["offset"] == len(b"v1,v2\nham,see you later\n")
+
+    append(raw_path, b" prize now\n")
+    assert extract(sources) == ["win a prize now"]
+    assert sources[str(raw_path)]["offset"] == raw_path.stat().st_size
+    assert extract(sources) == []
+
+
+def test_quoted_newline_is_not_split(raw_path):
+    raw_path.write_bytes(b'v1,v2\nham,ok\nspam,"free entry\nreply ""WIN""\n')
+    sources = {}
+
+    assert extract(sources) == ["ok"]
+    assert sources[str(raw_path)]["offset"] == len(b"v1,v2\nham,ok\n")
+
+    append(raw_path, b'now"\nham,"lunch?\r\nsure"\r\n')
+    assert extract(sources) == ['free entry\nreply "WIN"\nnow', "lunch?\r\nsure"]
+    assert sources[str(raw_path)]["offset"] == raw_path.stat().st_size
+
+
+def test_rewritten_source_is_rejected(raw_path):
+    raw_path.write_bytes(b"v1,v2\nham,hello\n")
+    sources = {}
+    extract(sources)
+
+    raw_path.write_bytes(b"v1,v2\nham,HELLO\nham,again\n")
+    with pytest.raises(ValueError, match="rewritten"):
+        extract(sources)